@@ -2,6 +2,10 @@
 Configuration for Ollama integration
 """
 import os
+from dotenv import load_dotenv
+
+# Load .env before any setting below is read
+load_dotenv()
 
 # Ollama-specific settings
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "localhost")
@@ -9,14 +13,55 @@ OLLAMA_PORT = os.getenv("OLLAMA_PORT", "11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.2:latest")
 OLLAMA_URL = f"http://{OLLAMA_HOST}:{OLLAMA_PORT}"
 
+# Several Ollama hosts serving the same model, comma-separated (overrides OLLAMA_URL)
+OLLAMA_URLS = os.getenv("OLLAMA_URLS", "")
+# Load balancing across them: "least_outstanding" or "latency"
+OLLAMA_BALANCING = os.getenv("OLLAMA_BALANCING", "least_outstanding")
+# Seconds between /api/tags health probes and consecutive failures before a host is ejected
+OLLAMA_PROBE_INTERVAL = float(os.getenv("OLLAMA_PROBE_INTERVAL", "10"))
+OLLAMA_EJECT_AFTER = int(os.getenv("OLLAMA_EJECT_AFTER", "3"))
+
 # Request timeout in seconds
-OLLAMA_TIMEOUT = 300  # 5 minutes
+OLLAMA_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT", "300"))  # 5 minutes
+
+# How long Ollama keeps a model loaded after a request (Ollama duration string or seconds)
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+# Preload the Ollama models when the UI server starts
+OLLAMA_WARMUP = os.getenv("OLLAMA_WARMUP", "true").lower() in ("1", "true", "yes")
+# Interval in seconds at which the background keeper pings idle models (0 disables it)
+OLLAMA_KEEPER_INTERVAL = float(os.getenv("OLLAMA_KEEPER_INTERVAL", "240"))
+
+# End-to-end budget for one brainstorm run in seconds (0 disables the deadline)
+BRAINSTORM_DEADLINE_SECONDS = float(os.getenv("BRAINSTORM_DEADLINE_SECONDS", "600"))
+# LLM relation classification is optional; skip it when less budget than this is left
+LLM_RELATIONS_MIN_SECONDS = float(os.getenv("LLM_RELATIONS_MIN_SECONDS", "15"))
+
+# HTTP connection pooling (one pool per backend URL)
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+HTTP_KEEP_ALIVE = os.getenv("HTTP_KEEP_ALIVE", "true").lower() not in ("0", "false", "no")
 
 # Model parameters
 OLLAMA_TEMPERATURE = 0.7
 OLLAMA_TOP_P = 0.9
 OLLAMA_MAX_TOKENS = 4096
 
+# Continue each run's Ollama calls from the previous call's returned context tokens
+OLLAMA_CONTEXT_REUSE = os.getenv("OLLAMA_CONTEXT_REUSE", "false").lower() in ("1", "true", "yes")
+
+# Largest context window requested from Ollama; src/generation.py sizes it below that
+OLLAMA_MAX_CTX = int(os.getenv("OLLAMA_MAX_CTX", "16384"))
+
+# Generation limits per pipeline stage (see src/usage.py for the stage labels)
+GENERATION_PROFILES = {
+    # 5 thoughts with title, summary and 10 scores each
+    "initial_thoughts": {"max_tokens": 2048, "top_p": OLLAMA_TOP_P},
+    # 3 child variants of one parent thought, shaped like initial thoughts (3/5 of 2048 plus headroom)
+    "expansion": {"max_tokens": 1536, "top_p": OLLAMA_TOP_P},
+    # Relation batches are packed for about 1024 output tokens, plus headroom
+    "relations": {"max_tokens": 1536, "top_p": OLLAMA_TOP_P},
+    "other": {"max_tokens": OLLAMA_MAX_TOKENS, "top_p": OLLAMA_TOP_P},
+}
+
 # Available Ollama models for brainstorming
 OLLAMA_SUPPORTED_MODELS = [
     "llama3.2:latest",
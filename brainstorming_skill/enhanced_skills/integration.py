@@ -1,7 +1,7 @@
 """
 Integration der erweiterten Projektmanagement-Funktionen in den Brainstorming-Skill
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from .constraint_analyzer import ConstraintAnalyzer
 from .prioritizer import Prioritizer, RequirementsFormatter
 from .dod_generator import DefinitionOfDoneGenerator, DoDFormatter
@@ -13,13 +13,27 @@ from ..src.graph_of_thoughts import run_full_tot_then_got
 from ..src.visualization import render_mermaid, generate_thought_summary, generate_hybrid_summary
 from ..src.tree_of_thoughts import tree_of_thoughts_live
 from ..src.scoring import calculate_total_score, validate_criteria_scores, Thought
-from ..src.llm import llm
+from ..src.deadline import deadline_scope
+from ..src.usage import usage_scope
+from ..src.ollama_context import ollama_context_scope
+from ..config.ollama_config import BRAINSTORM_DEADLINE_SECONDS
 import json
 
-def execute_brainstorm_skill_with_enhancements(inputs: Dict[str, Any], use_mock: bool = False) -> Dict[str, Any]:
+def execute_brainstorm_skill_with_enhancements(inputs: Dict[str, Any], use_mock: bool = False,
+                                               deadline_seconds: Optional[float] = None) -> Dict[str, Any]:
     """
-    Erweiterte Version des Brainstorming-Skills mit Projektmanagement-Funktionen
+    Erweiterte Version des Brainstorming-Skills mit Projektmanagement-Funktionen.
+    Der gesamte Lauf hat ein Zeitbudget (deadline_seconds, Standard BRAINSTORM_DEADLINE_SECONDS),
+    aus dem alle LLM-Aufrufe ihre Timeouts ableiten.
+    Tokens, Latenzen und Kosten aller LLM-Aufrufe des Laufs stehen unter "llm_usage".
     """
+    budget = BRAINSTORM_DEADLINE_SECONDS if deadline_seconds is None else deadline_seconds
+    with usage_scope() as usage, deadline_scope(budget), ollama_context_scope():
+        result = _execute_brainstorm_skill_with_enhancements(inputs, use_mock)
+    result["llm_usage"] = usage.summary()
+    return result
+
+def _execute_brainstorm_skill_with_enhancements(inputs: Dict[str, Any], use_mock: bool) -> Dict[str, Any]:
     # Extrahiere die relevanten Informationen
     idea = inputs.get("idea", "")
     context = inputs.get("context", "")
@@ -232,11 +246,12 @@ def extract_features_from_idea(idea: str) -> List[str]:
     return features
 
 # Aktualisierte Version der Hauptfunktion, die alle Erweiterungen enthält
-def execute_brainstorm_skill(inputs: Dict[str, Any], use_mock: bool = False) -> Dict[str, Any]:
+def execute_brainstorm_skill(inputs: Dict[str, Any], use_mock: bool = False,
+                             deadline_seconds: Optional[float] = None) -> Dict[str, Any]:
     """
     Hauptfunktion des Brainstorming-Skills mit allen Erweiterungen
     """
-    return execute_brainstorm_skill_with_enhancements(inputs, use_mock)
+    return execute_brainstorm_skill_with_enhancements(inputs, use_mock, deadline_seconds=deadline_seconds)
 
 # Testfunktion
 def test_enhanced_skill():
@@ -1,20 +1,32 @@
-from .skill import execute_brainstorm_skill
-from .graph_of_thoughts import run_full_tot_then_got
-from .visualization import render_mermaid
-from .ollama_integration import OllamaClient
-from ..enhanced_skills.constraint_analyzer import ConstraintAnalyzer
-from ..enhanced_skills.prioritizer import Prioritizer
-from ..enhanced_skills.dod_generator import DefinitionOfDoneGenerator
-from ..enhanced_skills.project_planner import ProjectPlanner
+import importlib
 
 __version__ = "2.0.0"
-__all__ = [
-    "execute_brainstorm_skill",
-    "run_full_tot_then_got",
-    "render_mermaid",
-    "OllamaClient",
-    "ConstraintAnalyzer",
-    "Prioritizer",
-    "DefinitionOfDoneGenerator",
-    "ProjectPlanner"
-]
\ No newline at end of file
+
+# Public API, imported on first attribute access (PEP 562) so that importing the
+# package does not pull in networkx, requests or the provider SDKs up front
+_LAZY_ATTRIBUTES = {
+    "execute_brainstorm_skill": (".skill", "execute_brainstorm_skill"),
+    "run_full_tot_then_got": (".graph_of_thoughts", "run_full_tot_then_got"),
+    "render_mermaid": (".visualization", "render_mermaid"),
+    "OllamaClient": (".ollama_integration", "OllamaClient"),
+    "ConstraintAnalyzer": ("..enhanced_skills.constraint_analyzer", "ConstraintAnalyzer"),
+    "Prioritizer": ("..enhanced_skills.prioritizer", "Prioritizer"),
+    "DefinitionOfDoneGenerator": ("..enhanced_skills.dod_generator", "DefinitionOfDoneGenerator"),
+    "ProjectPlanner": ("..enhanced_skills.project_planner", "ProjectPlanner"),
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    try:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
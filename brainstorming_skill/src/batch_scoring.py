@@ -0,0 +1,101 @@
+"""
+Vectorized scoring of thought batches.
+
+The criteria scores of n thoughts are held as an (n, 10) float array in the fixed
+WEIGHTS order. Totals are one matrix-vector product, range checks are array
+masks, and re-ranking under another weight profile only needs a new weight
+vector. Missing criteria are NaN; like calculate_total_score they add nothing to
+the total, but the row is invalid.
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .scoring import CRITERIA, WEIGHTS, Thought
+
+_COLUMNS = {name: column for column, name in enumerate(CRITERIA)}
+
+
+def weight_vector(weights: Dict[str, float] = WEIGHTS) -> np.ndarray:
+    """
+    Weights in CRITERIA order; criteria missing from the profile weigh 0.
+    """
+    unknown = set(weights) - set(CRITERIA)
+    if unknown:
+        raise ValueError(f"Unknown criteria in weight profile: {sorted(unknown)}")
+    return np.array([weights.get(name, 0.0) for name in CRITERIA])
+
+
+DEFAULT_WEIGHTS = weight_vector()
+
+
+class ScoreBatch:
+    """
+    Criteria scores of many thoughts as one (n, len(CRITERIA)) array.
+    """
+    def __init__(self, score_dicts: Sequence[Dict[str, float]]):
+        self.scores = np.full((len(score_dicts), len(CRITERIA)), np.nan)
+        # Rows with unknown criteria or non-numeric scores
+        self.malformed = np.zeros(len(score_dicts), dtype=bool)
+        for row, scores in enumerate(score_dicts):
+            for name, value in scores.items():
+                column = _COLUMNS.get(name)
+                try:
+                    if column is None:
+                        raise ValueError(name)
+                    self.scores[row, column] = value
+                except (TypeError, ValueError):
+                    self.malformed[row] = True
+
+    @classmethod
+    def from_thoughts(cls, thoughts: Sequence[Thought]) -> "ScoreBatch":
+        if all(t.criteria_scores.complete for t in thoughts):
+            # Thoughts already store their scores as rows in CRITERIA order
+            batch = cls([])
+            batch.scores = np.array([t.criteria_scores.values for t in thoughts],
+                                    dtype=float).reshape(len(thoughts), len(CRITERIA))
+            batch.malformed = np.zeros(len(thoughts), dtype=bool)
+            return batch
+        return cls([t.criteria_scores for t in thoughts])
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def valid_mask(self) -> np.ndarray:
+        """
+        True for rows with every criterion present and within [1, 10].
+        """
+        in_range = (self.scores >= 1) & (self.scores <= 10)  # NaN compares False
+        return in_range.all(axis=1) & ~self.malformed
+
+    def totals(self, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        vector = DEFAULT_WEIGHTS if weights is None else weight_vector(weights)
+        return np.nan_to_num(self.scores) @ vector
+
+    def ranking(self, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """
+        Row indices, best total first; equal totals keep their order.
+        """
+        return np.argsort(-self.totals(weights), kind="stable")
+
+
+def score_thoughts(thoughts: List[Thought]) -> List[Thought]:
+    """
+    Set total_score of all thoughts with one matrix-vector product.
+    """
+    if thoughts:
+        for thought, total in zip(thoughts, ScoreBatch.from_thoughts(thoughts).totals()):
+            thought.total_score = float(total)
+    return thoughts
+
+
+def rerank(thoughts: List[Thought], weights: Dict[str, float],
+           top: Optional[int] = None) -> List[Thought]:
+    """
+    Thoughts ordered by their total under another weight profile, e.g. one that
+    favours Innovation. The stored total_score values are left unchanged.
+    """
+    if not thoughts:
+        return []
+    order = ScoreBatch.from_thoughts(thoughts).ranking(weights)
+    return [thoughts[i] for i in order[:top]]
@@ -0,0 +1,152 @@
+"""
+Beam search over thoughts with a heap-bounded beam.
+
+The beam keeps the `width` best thoughts seen so far in a min-heap, so the k-th
+best score is always at the root and a new thought is admitted or rejected in
+O(log k) instead of re-sorting every level. A parent whose optimistic child
+score (its own score plus `margin`) cannot beat that k-th best is not expanded
+at all, which with LLM expansion saves one call per pruned parent. The search
+stops early once a level no longer improves the best score.
+
+With a dedup threshold, near-duplicate thoughts (see near_duplicates) are
+collapsed to the better one before they enter the beam or the frontier, so no
+expansion and no GoT pair is spent on the same approach twice.
+"""
+import heapq
+import itertools
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .near_duplicates import NearDuplicateIndex, collapse_near_duplicates, minhash
+from .scoring import Thought
+
+Entry = Tuple[float, int, Thought]
+
+
+class Beam:
+    """
+    The `width` best thoughts by total_score. On equal scores the thought added
+    first wins, like a stable sort. With dedup_threshold, the beam holds at most
+    one thought per group of near-duplicates.
+    """
+    def __init__(self, width: int, dedup_threshold: Optional[float] = None):
+        self.width = width
+        self._heap: List[Entry] = []
+        self._counter = itertools.count()
+        self._entries: Dict[int, Entry] = {}
+        self._index = NearDuplicateIndex(dedup_threshold) if dedup_threshold is not None else None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, thought: Thought) -> bool:
+        """
+        Offer a thought to the beam; returns whether it was admitted. An admitted
+        thought replaces its near-duplicate, if the beam holds a worse one.
+        """
+        entry = (thought.total_score, -next(self._counter), thought)
+        if self._index is not None:
+            match = self._index.find(minhash(thought.summary))
+            if match is not None:
+                if self._entries[match][:2] >= entry[:2]:
+                    return False
+                self._heap.remove(self._entries[match])
+                heapq.heapify(self._heap)
+                self._forget(match)
+
+        if len(self._heap) < self.width:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] <= self._heap[0][:2]:
+            return False
+        else:
+            self._forget(heapq.heapreplace(self._heap, entry)[1])
+        self._remember(entry)
+        return True
+
+    def covers(self, thought: Thought) -> bool:
+        """
+        Whether the beam already holds a near-duplicate that is at least as good.
+        """
+        if self._index is None:
+            return False
+        match = self._index.find(minhash(thought.summary))
+        return match is not None and self._entries[match][0] >= thought.total_score
+
+    def _remember(self, entry: Entry):
+        self._entries[entry[1]] = entry
+        if self._index is not None:
+            self._index.add(entry[1], minhash(entry[2].summary))
+
+    def _forget(self, key: int):
+        del self._entries[key]
+        if self._index is not None:
+            self._index.remove(key)
+
+    def threshold(self) -> Optional[float]:
+        """
+        Score a thought must beat to enter the full beam, or None while it has room.
+        """
+        if len(self._heap) < self.width:
+            return None
+        return self._heap[0][0]
+
+    def best_score(self) -> Optional[float]:
+        return max(score for score, _, _ in self._heap) if self._heap else None
+
+    def best(self) -> List[Thought]:
+        return [thought for *_, thought in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+
+def _admit(beam: Beam, thoughts: Iterable[Thought], dedup_threshold: Optional[float]) -> List[Thought]:
+    """
+    Push thoughts into the beam as they arrive and return the distinct ones.
+    Thoughts the beam already covers with a near-duplicate are dropped.
+    """
+    distinct = []
+    for thought in thoughts:
+        if not beam.covers(thought):
+            beam.push(thought)
+            distinct.append(thought)
+    if dedup_threshold is not None:
+        distinct = collapse_near_duplicates(distinct, dedup_threshold)
+    return distinct
+
+
+def beam_search(initial: Iterable[Thought], expand: Callable[[List[Thought], int], List[Thought]],
+                depth: int, width: int, frontier_width: int, margin: float = 1.0,
+                min_improvement: float = 0.0, dedup_threshold: Optional[float] = None,
+                should_continue: Callable[[int], bool] = lambda level: True) -> List[Thought]:
+    """
+    Search `depth` levels starting from `initial` and return the beam, best first.
+    `initial` may be a stream (see stream_initial_thoughts); its thoughts are
+    scored into the beam while the rest is still being generated.
+
+    Each level expands the best `frontier_width` thoughts of the previous level
+    with expand(parents, level), skipping parents that cannot beat the beam's
+    threshold by more than `margin`. should_continue(level) is asked before each
+    level, e.g. to respect a time budget. With dedup_threshold, near-duplicate
+    thoughts are collapsed before they reach the beam or the frontier.
+    """
+    beam = Beam(width, dedup_threshold)
+    initial = _admit(beam, initial, dedup_threshold)
+    frontier = heapq.nlargest(frontier_width, initial, key=lambda t: t.total_score)
+
+    for level in range(1, depth):
+        if not frontier or not should_continue(level):
+            break
+
+        threshold = beam.threshold()
+        parents = [p for p in frontier if threshold is None or p.total_score + margin > threshold]
+        if len(parents) < len(frontier):
+            print(f"Beam-Suche: {len(frontier) - len(parents)} Knoten auf Ebene {level} verworfen")
+        if not parents:
+            break
+
+        best_before = beam.best_score()
+        children = _admit(beam, expand(parents, level), dedup_threshold)
+        frontier = heapq.nlargest(frontier_width, children, key=lambda t: t.total_score)
+
+        if best_before is not None and beam.best_score() <= best_before + min_improvement:
+            print(f"Beam-Suche: keine Verbesserung auf Ebene {level + 1} – stoppe früh")
+            break
+
+    return beam.best()
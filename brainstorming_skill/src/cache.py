@@ -0,0 +1,95 @@
+"""
+Persistent, content-addressed cache for LLM responses.
+
+Entries are keyed by a hash of provider, model, messages and temperature (plus
+the response schema and Ollama context, if any) and live in a local SQLite
+file, bounded by a maximum entry count (LRU) and a TTL.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "brainstorm_llm", "responses.sqlite3")
+
+
+def make_cache_key(provider: str, model: str, messages: List[Dict], temperature: float,
+                   schema: Optional[Dict] = None, context: Optional[List[int]] = None) -> str:
+    """
+    Build the content hash that identifies a completion request. A requested
+    response schema and a continued Ollama context are part of the request, so
+    they are part of the key.
+    """
+    request = {"provider": provider, "model": model, "messages": messages, "temperature": temperature}
+    if schema is not None:
+        request["schema"] = schema
+    if context is not None:
+        request["context"] = context
+    payload = json.dumps(request, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite-backed LRU cache with TTL. Safe to share between threads.
+    """
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = 1000, ttl: float = 86400):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON responses(accessed_at)")
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the cached response, or None if it is missing or expired.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response, created_at = row
+            if self.ttl and now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return response
+
+    def set(self, key: str, response: str):
+        """
+        Store a response and evict the least recently used entries beyond max_entries.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, response, now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
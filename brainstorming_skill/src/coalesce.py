@@ -0,0 +1,115 @@
+"""
+Single-flight coalescing of identical in-flight LLM requests.
+
+Concurrent callers with the same request key wait on one upstream call and share
+its result (or its exception) instead of each triggering their own generation.
+Followers wait at most until their own deadline. If the leader failed only
+because its own deadline ran out, a follower with budget left takes over as the
+new leader.
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .deadline import DeadlineExceeded, check_deadline, remaining
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _wait_timeout() -> Optional[float]:
+    left = remaining()
+    return None if left is None else max(0.0, left)
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls by key, for threads (do) and coroutines (ado).
+    on_shared(result) is called for followers that received the leader's result,
+    e.g. to account for the call in the follower's own usage scope.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._tasks: Dict[Tuple[int, str], asyncio.Future] = {}
+
+    def do(self, key: str, fn: Callable[[], Any], on_shared: Callable[[Any], None] = None) -> Any:
+        """
+        Run fn() unless an identical call is already in flight, then wait for that one.
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+            if leader:
+                break
+
+            if not call.done.wait(_wait_timeout()):
+                raise DeadlineExceeded("Deadline exceeded while waiting for a coalesced LLM call")
+            if isinstance(call.error, DeadlineExceeded):
+                # The leader ran out of its own budget; retry as leader if ours allows
+                check_deadline("coalesced LLM call")
+                continue
+            if call.error is not None:
+                raise call.error
+            if on_shared is not None:
+                on_shared(call.result)
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key: str, coro_fn: Callable[[], Awaitable[Any]],
+                  on_shared: Callable[[Any], None] = None) -> Any:
+        """
+        Async variant of do(); coalesces coroutines running on the same event loop.
+        """
+        task_key = (id(asyncio.get_running_loop()), key)
+        while True:
+            with self._lock:
+                task = self._tasks.get(task_key)
+                leader = task is None or task.done()
+                if leader:
+                    task = asyncio.ensure_future(coro_fn())
+                    self._tasks[task_key] = task
+                    task.add_done_callback(lambda done: self._forget_task(task_key, done))
+            # Shield so that one cancelled or timed-out waiter does not cancel the shared call
+            if leader:
+                return await asyncio.shield(task)
+
+            try:
+                result = await asyncio.wait_for(asyncio.shield(task), _wait_timeout())
+            except DeadlineExceeded:
+                # The leader ran out of its own budget; retry as leader if ours allows
+                check_deadline("coalesced LLM call")
+                continue
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded("Deadline exceeded while waiting for a coalesced LLM call") from None
+            if on_shared is not None:
+                on_shared(result)
+            return result
+
+    def _forget_task(self, task_key: Tuple[int, str], task: asyncio.Future):
+        with self._lock:
+            if self._tasks.get(task_key) is task:
+                del self._tasks[task_key]
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls) + len(self._tasks)
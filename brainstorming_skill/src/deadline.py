@@ -0,0 +1,71 @@
+"""
+End-to-end request deadlines carried through a context variable.
+
+A budget is set once at the entry point (execute_brainstorm_skill) and every LLM
+call and pipeline stage below it derives its timeout from the remaining time.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from ..config.ollama_config import OLLAMA_TIMEOUT
+
+_deadline: ContextVar[Optional[float]] = ContextVar("brainstorm_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the request budget is used up."""
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]):
+    """
+    Run the enclosed block with a budget of `seconds`. Nested scopes can only
+    shorten the deadline, never extend it. None or 0 leaves it unchanged.
+    """
+    current = _deadline.get()
+    deadline = current
+    if seconds:
+        deadline = time.monotonic() + seconds
+        if current is not None:
+            deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """
+    Seconds left until the deadline, or None if no deadline is set.
+    """
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def check_deadline(stage: str = "request"):
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before {stage}")
+
+
+def has_time_for(seconds: float) -> bool:
+    """
+    Whether an optional stage expected to take `seconds` still fits the budget.
+    """
+    left = remaining()
+    return left is None or left >= seconds
+
+
+def call_timeout(default: float = OLLAMA_TIMEOUT) -> float:
+    """
+    Timeout for a single LLM call: the per-call default capped by the remaining budget.
+    """
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded("Deadline exceeded before LLM call")
+    return min(default, left)
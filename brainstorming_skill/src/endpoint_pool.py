@@ -0,0 +1,181 @@
+"""
+Load balancing across several Ollama hosts serving the same model.
+
+Each request goes to the healthy endpoint with the fewest outstanding requests
+(or, with the "latency" strategy, the lowest expected wait). Endpoints that fail
+repeatedly are ejected; a background thread probes /api/tags, checks that the
+model is actually available and re-admits endpoints once they pass again.
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..config.ollama_config import OLLAMA_BALANCING, OLLAMA_EJECT_AFTER, OLLAMA_PROBE_INTERVAL
+
+STRATEGIES = ("least_outstanding", "latency")
+PROBE_TIMEOUT = 5
+# Weight of the newest sample in the latency moving average
+LATENCY_ALPHA = 0.3
+
+
+class Endpoint:
+    def __init__(self, url: str):
+        self.url = url
+        self.outstanding = 0
+        self.latency: Optional[float] = None  # exponentially weighted moving average, seconds
+        self.failures = 0
+        self.healthy = True
+
+    def record_latency(self, seconds: float):
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency = LATENCY_ALPHA * seconds + (1 - LATENCY_ALPHA) * self.latency
+
+
+def model_available(model: str, names: List[str]) -> bool:
+    """
+    Ollama lists models with their tag; an untagged model name means ":latest".
+    """
+    wanted = model if ":" in model else f"{model}:latest"
+    return any(name == model or name == wanted for name in names)
+
+
+class EndpointPool:
+    """
+    Thread-safe pool of Ollama base URLs for one model.
+    """
+    def __init__(self, urls: List[str], model: str, strategy: str = OLLAMA_BALANCING,
+                 eject_after: int = OLLAMA_EJECT_AFTER, probe_interval: float = OLLAMA_PROBE_INTERVAL):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown balancing strategy {strategy!r}, expected one of {STRATEGIES}")
+        self.model = model
+        self.strategy = strategy
+        self.eject_after = eject_after
+        self.probe_interval = probe_interval
+        self.endpoints = [Endpoint(url.rstrip("/")) for url in dict.fromkeys(urls)]
+        self._lock = threading.Lock()
+        self._prober: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    @property
+    def urls(self) -> List[str]:
+        return [e.url for e in self.endpoints]
+
+    def healthy_urls(self) -> List[str]:
+        with self._lock:
+            return [e.url for e in self.endpoints if e.healthy]
+
+    def _cost(self, endpoint: Endpoint) -> Tuple:
+        # The random last element spreads ties instead of always picking the first host
+        if self.strategy == "latency":
+            # Unmeasured endpoints cost nothing, so each one gets tried early
+            return ((endpoint.outstanding + 1) * (endpoint.latency or 0.0), random.random())
+        return (endpoint.outstanding, endpoint.latency or 0.0, random.random())
+
+    def _choose(self) -> Endpoint:
+        with self._lock:
+            # With every endpoint ejected, keep trying all rather than failing outright
+            candidates = [e for e in self.endpoints if e.healthy] or self.endpoints
+            endpoint = min(candidates, key=self._cost)
+            endpoint.outstanding += 1
+            return endpoint
+
+    def _release(self, endpoint: Endpoint, elapsed: Optional[float], error: Optional[BaseException]):
+        from .resilience import is_retryable
+
+        with self._lock:
+            endpoint.outstanding -= 1
+            if error is None:
+                endpoint.failures = 0
+                endpoint.record_latency(elapsed)
+            elif is_retryable(error):
+                # Only transport errors and 5xx say something about the host
+                endpoint.failures += 1
+                if endpoint.healthy and endpoint.failures >= self.eject_after and len(self.endpoints) > 1:
+                    endpoint.healthy = False
+                    print(f"⚠ Ollama endpoint {endpoint.url} ejected after {endpoint.failures} failures")
+
+    @contextmanager
+    def endpoint(self) -> Iterator[str]:
+        """
+        Reserve an endpoint for one request and yield its base URL. The outcome
+        of the block feeds the balancing and ejection decisions.
+        """
+        if len(self.endpoints) > 1:
+            self.start_probing()
+        endpoint = self._choose()
+        start = time.monotonic()
+        try:
+            yield endpoint.url
+        except BaseException as e:
+            self._release(endpoint, None, e)
+            raise
+        self._release(endpoint, time.monotonic() - start, None)
+
+    def probe(self, endpoint: Endpoint) -> bool:
+        """
+        Check that the endpoint answers /api/tags and serves the pool's model.
+        """
+        from .http_pool import get_session
+
+        try:
+            response = get_session(endpoint.url).get(f"{endpoint.url}/api/tags", timeout=PROBE_TIMEOUT)
+            response.raise_for_status()
+            names = [m.get("name", "") for m in response.json().get("models", [])]
+        except Exception:
+            return False
+        return model_available(self.model, names)
+
+    def probe_all(self):
+        for endpoint in self.endpoints:
+            ok = self.probe(endpoint)
+            with self._lock:
+                if ok and not endpoint.healthy:
+                    print(f"✓ Ollama endpoint {endpoint.url} re-admitted")
+                elif not ok and endpoint.healthy:
+                    print(f"⚠ Ollama endpoint {endpoint.url} failed its health check, ejected")
+                endpoint.healthy = ok
+                if ok:
+                    endpoint.failures = 0
+
+    def start_probing(self):
+        """
+        Start the background health checks once; an interval of 0 disables them.
+        """
+        if self.probe_interval <= 0 or (self._prober is not None and self._prober.is_alive()):
+            return
+        with self._lock:
+            if self._prober is None or not self._prober.is_alive():
+                self._prober = threading.Thread(target=self._probe_loop, name="ollama-health-probe", daemon=True)
+                self._prober.start()
+
+    def _probe_loop(self):
+        while not self._stop_event.wait(self.probe_interval):
+            self.probe_all()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_pools: Dict[Tuple[Tuple[str, ...], str], EndpointPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_endpoint_pool(urls: List[str], model: str) -> EndpointPool:
+    """
+    Return the shared pool for these URLs and model, so that all clients see the
+    same outstanding counts and health state.
+    """
+    key = (tuple(url.rstrip("/") for url in urls), model)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = EndpointPool(list(key[0]), model)
+    return pool
+
+
+def parse_urls(value: str) -> List[str]:
+    return [url.strip().rstrip("/") for url in value.split(",") if url.strip()]
@@ -0,0 +1,64 @@
+"""
+One long-lived event loop for async LLM calls made from blocking code.
+
+Async HTTP and SDK clients are bound to the loop they were created on. Running
+every async batch on this loop (instead of asyncio.run per call) lets those
+clients and their connections live for the whole process, and works even when
+the calling thread runs an event loop of its own. The clients are closed when
+the interpreter exits.
+"""
+import asyncio
+import atexit
+import threading
+from contextvars import copy_context
+from typing import Any, Awaitable, Callable, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+
+def background_loop() -> asyncio.AbstractEventLoop:
+    """
+    The shared event loop, started in a daemon thread on first use.
+    """
+    global _loop, _thread
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(target=_loop.run_forever, name="llm-event-loop", daemon=True)
+            _thread.start()
+            atexit.register(_close_clients)
+    return _loop
+
+
+def _close_clients(timeout: float = 5.0):
+    from .http_pool import aclose_async_clients
+    from .sdk_clients import aclose_async_sdk_clients
+
+    async def close():
+        await aclose_async_clients()
+        await aclose_async_sdk_clients()
+
+    try:
+        asyncio.run_coroutine_threadsafe(close(), _loop).result(timeout)
+    except Exception:
+        # Shutdown must not fail over connections that are going away anyway
+        pass
+
+
+def run_sync(coro_fn: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run coro_fn() on the shared loop and block until it is done. The coroutine
+    runs in a copy of the caller's context, so deadlines, stages and schemas
+    propagate to it and to the tasks it creates.
+    """
+    loop = background_loop()
+    if threading.current_thread() is _thread:
+        raise RuntimeError("run_sync() cannot block the shared event loop it would run on")
+    context = copy_context()
+
+    async def run():
+        return await context.run(asyncio.ensure_future, coro_fn())
+
+    return asyncio.run_coroutine_threadsafe(run(), loop).result()
@@ -0,0 +1,73 @@
+"""
+Per-stage generation profiles: bounded output and right-sized context windows.
+
+Every LLM call gets the max output tokens and top_p of its pipeline stage. For
+Ollama, num_ctx is sized for the largest planned prompt plus the largest stage
+answer instead of the model default, which saves KV-cache memory and prompt
+processing time. Ollama reloads the model whenever num_ctx changes, so it stays
+the same across stages; only num_predict follows the stage.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from ..config.ollama_config import GENERATION_PROFILES, OLLAMA_MAX_CTX
+from .relation_batcher import PROMPT_TOKEN_BUDGET
+from .tokens import estimate_message_tokens
+from .usage import current_stage
+
+# Sizes are rounded up to a few power-of-two buckets instead of following every prompt exactly
+MIN_CTX = 2048
+# chars/4 estimates undercount some languages and tokenizers
+PROMPT_SAFETY_FACTOR = 1.25
+
+
+@dataclass(frozen=True)
+class GenerationProfile:
+    max_tokens: int
+    top_p: float
+
+
+def profile_for(stage: Optional[str] = None) -> GenerationProfile:
+    """
+    Return the profile of the given stage (default: the current one).
+    Unknown stages use the "other" profile.
+    """
+    stage = current_stage() if stage is None else stage
+    return GenerationProfile(**GENERATION_PROFILES.get(stage, GENERATION_PROFILES["other"]))
+
+
+def context_size(prompt_tokens: int, max_tokens: int, max_ctx: int = OLLAMA_MAX_CTX) -> int:
+    """
+    Smallest power-of-two window (at least MIN_CTX, at most max_ctx) that holds
+    the prompt and the full answer.
+    """
+    needed = int(prompt_tokens * PROMPT_SAFETY_FACTOR) + max_tokens
+    size = MIN_CTX
+    while size < needed and size < max_ctx:
+        size *= 2
+    return min(size, max_ctx)
+
+
+def stable_context_size(prompt_tokens: int = 0, max_tokens: int = 0, max_ctx: int = OLLAMA_MAX_CTX) -> int:
+    """
+    num_ctx for every call to a model: the bucket that holds a relation batch
+    (the largest prompt the pipeline plans for) plus the largest stage answer.
+    Only a prompt that does not fit gets a larger window, at the cost of a reload.
+    """
+    largest_answer = max(profile["max_tokens"] for profile in GENERATION_PROFILES.values())
+    return max(context_size(PROMPT_TOKEN_BUDGET, largest_answer, max_ctx),
+               context_size(prompt_tokens, max_tokens, max_ctx))
+
+
+def ollama_options(messages: List[Dict], temperature: float,
+                   profile: Optional[GenerationProfile] = None) -> Dict:
+    """
+    Build the Ollama `options` object for a chat request.
+    """
+    profile = profile or profile_for()
+    return {
+        "temperature": temperature,
+        "top_p": profile.top_p,
+        "num_predict": profile.max_tokens,
+        "num_ctx": stable_context_size(estimate_message_tokens(messages), profile.max_tokens),
+    }
@@ -1,10 +1,14 @@
 import networkx as nx
 import json
-from typing import List, Dict, Any
+import os
+from typing import List, Dict, Any, Optional
 from .scoring import Thought, calculate_total_score
-from .llm import llm
+from .relation_batcher import RELATIONS, classify_relations_batched
+from .deadline import has_time_for
+from ..config.ollama_config import LLM_RELATIONS_MIN_SECONDS
 
-RELATIONS = ["ergänzt", "widerspricht", "abhängig_von", "kombinierbar", "besser_als"]
+# LLM-based relation classification is opt-in; the heuristics need no LLM calls
+USE_LLM_RELATIONS = os.getenv("GOT_LLM_RELATIONS", "false").lower() in ("1", "true", "yes")
 
 def classify_relation(t1: Thought, t2: Thought) -> str:
     """
@@ -34,9 +38,11 @@ def rate_strength(relation: str) -> int:
     }
     return strength_map.get(relation, 3)
 
-def run_graph_of_thoughts(thoughts: List[Thought]) -> dict:
+def run_graph_of_thoughts(thoughts: List[Thought], use_llm_relations: bool = False) -> dict:
     """
     Execute the Graph-of-Thoughts algorithm on a set of thoughts.
+    With use_llm_relations, edges come from batched LLM classification; pairs the
+    LLM did not answer fall back to the heuristics.
     """
     G = nx.DiGraph()
 
@@ -44,11 +50,22 @@ def run_graph_of_thoughts(thoughts: List[Thought]) -> dict:
     for t in thoughts:
         G.add_node(t.id, thought=t, score=t.total_score)
 
+    llm_relations = {}
+    if use_llm_relations and len(thoughts) > 1:
+        if has_time_for(LLM_RELATIONS_MIN_SECONDS):
+            llm_relations = {(r["from"], r["to"]): r for r in classify_relations_batched(thoughts)}
+        else:
+            print("Zeitbudget reicht nicht für LLM-Beziehungen – verwende Heuristiken")
+
     # Create edges between thoughts based on relationships
     for i in range(len(thoughts)):
         for j in range(i + 1, len(thoughts)):
-            rel = classify_relation(thoughts[i], thoughts[j])
-            weight = rate_strength(rel)
+            llm_relation = llm_relations.get((thoughts[i].id, thoughts[j].id))
+            if llm_relation:
+                rel, weight = llm_relation["relation"], llm_relation["strength"]
+            else:
+                rel = classify_relation(thoughts[i], thoughts[j])
+                weight = rate_strength(rel)
             G.add_edge(thoughts[i].id, thoughts[j].id, relation=rel, weight=weight)
             G.add_edge(thoughts[j].id, thoughts[i].id, relation="inverse_" + rel, weight=weight)
 
@@ -111,10 +128,13 @@ def run_graph_of_thoughts(thoughts: List[Thought]) -> dict:
         "bridge_thoughts": sorted(betweenness, key=betweenness.get, reverse=True)[:3]
     }
 
-def run_full_tot_then_got(task: str, use_mock: bool = False) -> dict:
+def run_full_tot_then_got(task: str, use_mock: bool = False, use_llm_relations: Optional[bool] = None) -> dict:
     """
     Run the complete pipeline: Tree-of-Thoughts followed by Graph-of-Thoughts.
+    use_llm_relations defaults to GOT_LLM_RELATIONS and is always off with mock data.
     """
+    if use_llm_relations is None:
+        use_llm_relations = USE_LLM_RELATIONS
     from .tree_of_thoughts import tree_of_thoughts_live
 
     # 1. Run Tree-of-Thoughts to generate initial thoughts
@@ -128,7 +148,7 @@ def run_full_tot_then_got(task: str, use_mock: bool = False) -> dict:
 
     # 2. Run Graph-of-Thoughts on the ToT results
     print("Phase 2b: Graph-of-Thoughts – analysiert Beziehungen...")
-    got_result = run_graph_of_thoughts(tot_thoughts)
+    got_result = run_graph_of_thoughts(tot_thoughts, use_llm_relations=use_llm_relations and not use_mock)
     print(f"GoT fertig – {got_result['clusters']} Cluster gefunden")
 
     return {
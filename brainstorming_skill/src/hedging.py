@@ -0,0 +1,154 @@
+"""
+Hedged requests against slow backends.
+
+A latency-critical call is first sent to one backend. If it has not answered
+(or, for streams, produced a first token) after the p95 of recently observed
+latencies, a duplicate goes to another backend; the first success wins and the
+other request is cancelled. Blocking callers run hedged async calls on the
+shared event loop (see run_hedged).
+"""
+import asyncio
+import os
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from .event_loop import run_sync
+
+# Recent samples kept per backend, stage and kind of latency
+WINDOW = 200
+
+LatencyKey = Tuple[str, str, str]
+
+
+class LatencyTracker:
+    """
+    Sliding windows of observed latencies, e.g. per (backend, stage, "complete").
+    """
+    def __init__(self, window: int = WINDOW):
+        self.window = window
+        self._samples: Dict[LatencyKey, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: LatencyKey, seconds: float):
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def count(self, key: LatencyKey) -> int:
+        with self._lock:
+            return len(self._samples.get(key, ()))
+
+    def quantile(self, key: LatencyKey, q: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+latencies = LatencyTracker()
+
+
+class HedgePolicy:
+    """
+    When to send the duplicate: at the `quantile` of recent latencies, clamped to
+    min_delay, or after default_delay while fewer than min_samples were observed.
+    """
+    def __init__(self, enabled: bool = False, quantile: float = 0.95, min_samples: int = 20,
+                 default_delay: float = 10.0, min_delay: float = 0.5):
+        self.enabled = enabled
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+
+    @classmethod
+    def from_env(cls) -> "HedgePolicy":
+        return cls(
+            enabled=os.getenv("LLM_HEDGE_ENABLED", "false").lower() in ("1", "true", "yes"),
+            quantile=float(os.getenv("LLM_HEDGE_QUANTILE", "0.95")),
+            min_samples=int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20")),
+            default_delay=float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "10")),
+            min_delay=float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.5")),
+        )
+
+    def delay(self, key: LatencyKey, tracker: LatencyTracker = latencies) -> float:
+        if tracker.count(key) < self.min_samples:
+            return self.default_delay
+        return max(self.min_delay, tracker.quantile(key, self.quantile))
+
+
+async def ahedged(primary: Callable[[], Awaitable[Any]], hedge: Callable[[], Awaitable[Any]],
+                  delay: float) -> Any:
+    """
+    Await primary(); if it is still running after `delay` seconds, also start
+    hedge() and return whichever succeeds first. The other task is cancelled.
+    """
+    first = asyncio.ensure_future(primary())
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done:
+        return first.result()
+
+    print(f"LLM-Antwort nach {delay:.1f}s noch offen, sende Hedge-Anfrage")
+    pending = {first, asyncio.ensure_future(hedge())}
+    error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+        # Let the loser unwind, so its breaker trial and endpoint slot are released
+        # before the winner's result is handed back
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+def run_hedged(primary: Callable[[], Awaitable[Any]], hedge: Callable[[], Awaitable[Any]],
+               delay: float) -> Any:
+    """
+    Blocking ahedged() for sync callers, run on the shared event loop.
+    """
+    return run_sync(lambda: ahedged(primary, hedge, delay))
+
+
+def hedged(primary: Callable[[], Any], hedge: Callable[[], Any], delay: float,
+           discard: Callable[[Any], None] = None) -> Any:
+    """
+    Thread-based variant for blocking calls. A running thread cannot be cancelled,
+    so the losing result is handed to discard() as soon as it arrives (e.g. to
+    close a stream after its first chunk).
+    """
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="llm-hedge")
+    # Each call runs in a copy of the caller's context so deadlines and stages propagate
+    futures = [executor.submit(copy_context().run, primary)]
+    try:
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            print(f"LLM-Antwort nach {delay:.1f}s noch offen, sende Hedge-Anfrage")
+            futures.append(executor.submit(copy_context().run, hedge))
+
+        pending = set(futures)
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    winner = future
+                    break
+                error = future.exception()
+            else:
+                continue
+            for future in futures:
+                if future is not winner and discard is not None:
+                    future.add_done_callback(lambda f: f.exception() is None and discard(f.result()))
+            return winner.result()
+        raise error
+    finally:
+        executor.shutdown(wait=False)
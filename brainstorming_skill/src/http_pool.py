@@ -0,0 +1,104 @@
+"""
+Shared, thread-safe HTTP connection pools for the LLM backends.
+
+Every backend URL gets exactly one ``requests.Session`` whose urllib3 pool keeps
+connections (and TLS sessions) alive between completions. Async callers get one
+``httpx.AsyncClient`` per backend URL and event loop.
+
+An async client cannot outlive its loop. The skill runs its async batches on the
+shared loop of event_loop.run_sync, whose clients live as long as the process.
+Code that drives its own short-lived loop (e.g. asyncio.run) must await
+aclose_async_clients() before that loop ends, or its connections leak.
+"""
+import asyncio
+import threading
+import weakref
+from typing import Dict, Optional
+
+from ..config.ollama_config import HTTP_POOL_SIZE, HTTP_KEEP_ALIVE, OLLAMA_TIMEOUT
+
+_sessions: Dict[str, "requests.Session"] = {}
+_async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def _create_session(pool_size: int, keep_alive: bool) -> "requests.Session":
+    # requests is imported on first use to keep package imports cheap
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def get_session(base_url: str, pool_size: Optional[int] = None,
+                keep_alive: Optional[bool] = None) -> "requests.Session":
+    """
+    Return the pooled session for a backend URL, creating it on first use.
+    pool_size and keep_alive only take effect when the session is created.
+    """
+    key = base_url.rstrip("/")
+    session = _sessions.get(key)
+    if session is not None:
+        return session
+
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _create_session(
+                pool_size or HTTP_POOL_SIZE,
+                HTTP_KEEP_ALIVE if keep_alive is None else keep_alive,
+            )
+            _sessions[key] = session
+    return session
+
+
+def close_sessions():
+    """
+    Close all pooled sessions, e.g. on worker shutdown.
+    """
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def get_async_client(base_url: str, pool_size: Optional[int] = None,
+                     keep_alive: Optional[bool] = None):
+    """
+    Return the pooled httpx.AsyncClient for a backend URL on the running event loop.
+    Clients are bound to the loop they were created on, so each loop gets its own.
+    """
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    key = base_url.rstrip("/")
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None or client.is_closed:
+            size = pool_size or HTTP_POOL_SIZE
+            keep = HTTP_KEEP_ALIVE if keep_alive is None else keep_alive
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=size,
+                                    max_keepalive_connections=size if keep else 0),
+                timeout=OLLAMA_TIMEOUT,
+            )
+            clients[key] = client
+    return client
+
+
+async def aclose_async_clients():
+    """
+    Close the async clients that belong to the running event loop; await it
+    before a loop of your own ends.
+    """
+    with _lock:
+        clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
@@ -1,67 +1,608 @@
 import os
 import json
-import requests
-from typing import List, Dict, Any
-from dotenv import load_dotenv
+import asyncio
+import time
+from typing import List, Dict, Callable, Iterator, Optional
+from .http_pool import get_session, get_async_client
+from .cache import ResponseCache, make_cache_key, DEFAULT_CACHE_PATH
+from .coalesce import SingleFlight
+from .rate_limit import get_limiter
+from .tokens import estimate_tokens, estimate_message_tokens
+from .resilience import RetryPolicy, get_breaker
+from .deadline import DeadlineExceeded, call_timeout
+from .sdk_clients import get_sdk_client, get_async_sdk_client
+from .warmup import mark_model_used
+from .endpoint_pool import EndpointPool, get_endpoint_pool, parse_urls
+from .hedging import HedgePolicy, hedged, latencies, run_hedged
+from .generation import ollama_options, profile_for
+from .ollama_context import current_chain, generate_payload, response_text
+from .structured import current_schema
+from .usage import (CallUsage, current_stage, record_usage, openai_usage, anthropic_usage,
+                    ollama_usage)
+from ..config.ollama_config import OLLAMA_KEEP_ALIVE, OLLAMA_MODEL
 
-load_dotenv()
+# .env is loaded by config.ollama_config, which http_pool imports above
+
+# Shared by all clients; the request key already includes provider and model
+_inflight = SingleFlight()
+
+# Models used for fallback backends that name a provider but no model
+DEFAULT_MODELS = {
+    "openai": "gpt-4o-2024-11-20",
+    "anthropic": "claude-3-5-sonnet-20241022",
+    "ollama": OLLAMA_MODEL,
+}
+
+def _api_key_for(provider: str):
+    specific = {"openai": "OPENAI_API_KEY", "anthropic": "ANTHROPIC_API_KEY"}.get(provider)
+    return (
+        (specific and os.getenv(specific)) or
+        os.getenv("OPENAI_API_KEY") or
+        os.getenv("ANTHROPIC_API_KEY") or
+        os.getenv("GROK_API_KEY")
+    )
+
+def _json_response_format(messages: List[Dict]):
+    requested = current_schema()
+    if requested is not None:
+        name, schema = requested
+        return {"type": "json_schema", "json_schema": {"name": name, "schema": schema, "strict": True}}
+    return {"type": "json_object"} if "json" in messages[-1].get("content", "") else None
+
+def _split_system(messages: List[Dict]):
+    system = next((m["content"] for m in messages if m["role"] == "system"), "")
+    user_msg = next(m["content"] for m in messages if m["role"] == "user")
+    requested = current_schema()
+    if requested is not None:
+        # No native schema mode in the Messages API we use; state the schema instead
+        system += ("\n\nAntworte ausschließlich mit JSON, das diesem Schema entspricht:\n"
+                   + json.dumps(requested[1], ensure_ascii=False))
+    return system, user_msg
 
 class LLMClient:
-    def __init__(self, provider: str = None):
+    def __init__(self, provider: str = None, model: str = None, ollama_url: str = None,
+                 fallback_chain: str = None, base_url: str = None):
         self.provider = provider or os.getenv("LLM_PROVIDER", "openai")
-        self.model = os.getenv("LLM_MODEL", "gpt-4o-2024-11-20")
-        self.api_key = (
-            os.getenv("OPENAI_API_KEY") or
-            os.getenv("ANTHROPIC_API_KEY") or
-            os.getenv("GROK_API_KEY")
+        self.model = model or os.getenv("LLM_MODEL") or DEFAULT_MODELS.get(self.provider, "gpt-4o-2024-11-20")
+        self.api_key = _api_key_for(self.provider)
+        # OpenAI-compatible local servers (llama.cpp, vLLM, LM Studio) via OPENAI_BASE_URL
+        self.base_url = base_url or (os.getenv("OPENAI_BASE_URL") if self.provider == "openai" else None)
+        if self.base_url and not self.api_key:
+            # The SDK insists on a key; local servers ignore it
+            self.api_key = "local"
+        # One or several comma-separated Ollama hosts; requests are balanced across them
+        self.ollama_urls = parse_urls(
+            ollama_url or os.getenv("OLLAMA_URLS") or os.getenv("OLLAMA_URL", "http://localhost:11434")
+        )
+        self.ollama_url = self.ollama_urls[0]
+        # Ordered backends tried after this one, e.g. "ollama@http://gpu2:11434,openai:gpt-4o-mini"
+        self.fallback_chain = os.getenv("LLM_FALLBACK_CHAIN", "") if fallback_chain is None else fallback_chain
+        self._backends = None
+        self.retry_policy = RetryPolicy.from_env()
+        self.hedge_policy = HedgePolicy.from_env()
+        self.cache_enabled = os.getenv("LLM_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+        # Sampled completions (temperature > 0) are only cached on request, since a
+        # cache hit would turn every rerun into the same brainstorm
+        self.cache_sampled = os.getenv("LLM_CACHE_SAMPLED", "false").lower() in ("1", "true", "yes")
+        self._cache = None
+        self.coalesce_enabled = os.getenv("LLM_COALESCE_ENABLED", "true").lower() not in ("0", "false", "no")
+
+    @property
+    def cache(self) -> ResponseCache:
+        if self._cache is None:
+            self._cache = ResponseCache(
+                path=os.path.expanduser(os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH)),
+                max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000")),
+                ttl=float(os.getenv("LLM_CACHE_TTL", "86400")),
+            )
+        return self._cache
+
+    @property
+    def backend_id(self) -> str:
+        backend = f"{self.provider}:{self.model}"
+        if self.provider == "ollama":
+            return f"{backend}@{','.join(self.ollama_urls)}"
+        return f"{backend}@{self.base_url}" if self.base_url else backend
+
+    @property
+    def ollama_pool(self) -> EndpointPool:
+        return get_endpoint_pool(self.ollama_urls, self.model)
+
+    @property
+    def backends(self) -> List["LLMClient"]:
+        """
+        This client followed by the clients of its fallback chain.
+        """
+        if self._backends is None:
+            self._backends = [self] + [
+                self._fallback_client(spec.strip())
+                for spec in self.fallback_chain.split(",") if spec.strip()
+            ]
+        return self._backends
+
+    def _fallback_client(self, spec: str) -> "LLMClient":
+        # Format: provider[:model][@url]; model names may contain ':' themselves.
+        # The URL is the Ollama host or, for openai, an OpenAI-compatible base URL
+        spec, _, url = spec.partition("@")
+        provider, _, model = spec.partition(":")
+        if not model:
+            model = self.model if provider == self.provider else DEFAULT_MODELS.get(provider)
+        return LLMClient(provider=provider, model=model,
+                         ollama_url=(url if provider == "ollama" else None) or ",".join(self.ollama_urls),
+                         base_url=url if provider == "openai" else None, fallback_chain="")
+
+    def _with_fallback(self, call):
+        backends = self.backends
+        for i, backend in enumerate(backends):
+            try:
+                return call(backend)
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                if i == len(backends) - 1:
+                    raise
+                print(f"LLM backend {backend.backend_id} failed ({e}), falling back to {backends[i + 1].backend_id}")
+
+    async def _awith_fallback(self, call):
+        backends = self.backends
+        for i, backend in enumerate(backends):
+            try:
+                return await call(backend)
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                if i == len(backends) - 1:
+                    raise
+                print(f"LLM backend {backend.backend_id} failed ({e}), falling back to {backends[i + 1].backend_id}")
+
+    def _cache_key(self, messages: List[Dict], temperature: float) -> str:
+        requested = current_schema()
+        # A chained Ollama call continues from the run's context, which changes its answer
+        chain = current_chain() if self.provider == "ollama" else None
+        return make_cache_key(self.provider, self.model, messages, temperature,
+                              schema=requested[1] if requested else None,
+                              context=chain.get(self.model) if chain is not None else None)
+
+    def _caches(self, use_cache: bool, temperature: float, cache_sampled: Optional[bool] = None) -> bool:
+        sampled = self.cache_sampled if cache_sampled is None else cache_sampled
+        return use_cache and self.cache_enabled and (temperature == 0 or sampled)
+
+    def _hedge_backend(self) -> Optional["LLMClient"]:
+        """
+        Where a hedged duplicate goes: another host of this client's Ollama pool
+        (the pool picks the idle one), else the first fallback backend.
+        """
+        if not self.hedge_policy.enabled:
+            return None
+        if self.provider == "ollama" and len(self.ollama_pool.healthy_urls()) > 1:
+            return self
+        return self.backends[1] if len(self.backends) > 1 else None
+
+    def complete(self, messages: List[Dict], temperature: float = 0.7, use_cache: bool = True,
+                 hedge: bool = False, cache_if: Callable[[str], bool] = None,
+                 cache_sampled: Optional[bool] = None) -> str:
+        """
+        Complete a chat. Responses are served from and stored in the response cache
+        unless use_cache is False or caching is disabled via LLM_CACHE_ENABLED;
+        sampled completions are only cached with cache_sampled (default
+        LLM_CACHE_SAMPLED). A response is only stored if cache_if(response) holds,
+        e.g. if it parses.
+        Identical concurrent requests share one upstream call (LLM_COALESCE_ENABLED).
+        With hedge=True a slow call is duplicated to another backend (LLM_HEDGE_ENABLED).
+        """
+        key = self._cache_key(messages, temperature)
+        use_cache = self._caches(use_cache, temperature, cache_sampled)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._record_cached(messages, cached)
+                return cached
+
+        run = self._hedged_complete if hedge else self._complete
+        if self.coalesce_enabled:
+            result = _inflight.do(key, lambda: run(messages, temperature),
+                                  on_shared=lambda shared: self._record_cached(messages, shared, coalesced=True))
+        else:
+            result = run(messages, temperature)
+        if use_cache and (cache_if is None or cache_if(result)):
+            self.cache.set(key, result)
+        return result
+
+    def _hedged_complete(self, messages: List[Dict], temperature: float) -> str:
+        target = self._hedge_backend()
+        if target is None:
+            return self._complete(messages, temperature)
+        delay = self.hedge_policy.delay((self.backend_id, current_stage(), "complete"))
+        # Async tasks can be cancelled, which closes the losing connection
+        return run_hedged(
+            lambda: self._acomplete(messages, temperature),
+            lambda: target.retry_policy.acall(
+                lambda: target._alimited_complete(messages, temperature), get_breaker(target.backend_id)
+            ),
+            delay,
         )
-        self.ollama_url = os.getenv("OLLAMA_URL", "http://localhost:11434")
 
-    def complete(self, messages: List[Dict], temperature: float = 0.7) -> str:
+    def _complete(self, messages: List[Dict], temperature: float) -> str:
+        return self._with_fallback(lambda backend: backend.retry_policy.call(
+            lambda: backend._limited_complete(messages, temperature),
+            get_breaker(backend.backend_id),
+        ))
+
+    def _limiter(self):
+        # Every host of the Ollama pool adds its own capacity
+        return get_limiter(self.provider, self.model, len(self.ollama_urls) if self.provider == "ollama" else 1)
+
+    def _limited_complete(self, messages: List[Dict], temperature: float) -> str:
+        limiter = self._limiter()
+        with limiter.limit(estimate_message_tokens(messages)):
+            result = self._dispatch(messages, temperature)
+        limiter.record_completion(estimate_tokens(result))
+        return result
+
+    def _dispatch(self, messages: List[Dict], temperature: float) -> str:
+        start = time.perf_counter()
+        if self.provider == "openai":
+            text, stats = self._openai(messages, temperature)
+        elif self.provider == "anthropic":
+            text, stats = self._anthropic(messages, temperature)
+        elif self.provider == "ollama":
+            text, stats = self._ollama(messages, temperature)
+        else:
+            raise ValueError(f"Unsupported provider: {self.provider}")
+        self._record_usage(messages, text, stats, time.perf_counter() - start)
+        return text
+
+    def _record_usage(self, messages: List[Dict], text: str, stats: Dict, wall_time: float,
+                      time_to_first_token: float = None):
+        # Providers report token counts; fall back to local estimates where they don't
+        stage = current_stage()
+        latencies.record((self.backend_id, stage, "complete"), wall_time)
+        if time_to_first_token is not None:
+            latencies.record((self.backend_id, stage, "first_token"), time_to_first_token)
+        prompt_tokens = stats.get("prompt_tokens")
+        completion_tokens = stats.get("completion_tokens")
+        estimated = prompt_tokens is None or completion_tokens is None
+        record_usage(CallUsage(
+            provider=self.provider,
+            model=self.model,
+            stage=stage,
+            prompt_tokens=prompt_tokens if prompt_tokens is not None else estimate_message_tokens(messages),
+            completion_tokens=completion_tokens if completion_tokens is not None else estimate_tokens(text),
+            wall_time=wall_time,
+            time_to_first_token=stats.get("time_to_first_token", time_to_first_token),
+            estimated=estimated,
+        ))
+
+    def _record_cached(self, messages: List[Dict], text: str, coalesced: bool = False):
+        # Served without an upstream call of our own: from the cache or a coalesced leader
+        record_usage(CallUsage(
+            provider=self.provider,
+            model=self.model,
+            stage=current_stage(),
+            prompt_tokens=estimate_message_tokens(messages),
+            completion_tokens=estimate_tokens(text),
+            wall_time=0.0,
+            cached=not coalesced,
+            coalesced=coalesced,
+            estimated=True,
+        ))
+
+    def stream(self, messages: List[Dict], temperature: float = 0.7, use_cache: bool = True,
+               hedge: bool = False, cache_if: Callable[[str], bool] = None,
+               cache_sampled: Optional[bool] = None) -> Iterator[str]:
+        """
+        Stream a completion as text chunks. A cache hit is yielded as a single chunk;
+        a fully consumed stream is stored in the cache like complete() would.
+        With hedge=True a stream without a first token in time is duplicated.
+        """
+        key = None
+        if self._caches(use_cache, temperature, cache_sampled):
+            key = self._cache_key(messages, temperature)
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._record_cached(messages, cached)
+                yield cached
+                return
+
+        def open_stream(backend):
+            # Pull the first chunk inside the retry so that connection errors
+            # are retried or fall back before anything has been yielded
+            chunks = backend._limited_stream(messages, temperature)
+            return next(chunks, None), chunks
+
+        def open_on(backend):
+            return backend.retry_policy.call(lambda: open_stream(backend), get_breaker(backend.backend_id))
+
+        target = self._hedge_backend() if hedge else None
+        if target is None:
+            first, chunks = self._with_fallback(open_on)
+        else:
+            delay = self.hedge_policy.delay((self.backend_id, current_stage(), "first_token"))
+            # The losing stream is closed right after its first chunk
+            first, chunks = hedged(lambda: self._with_fallback(open_on), lambda: open_on(target), delay,
+                                   discard=lambda opened: opened[1].close())
+        parts = []
+        if first is not None:
+            parts.append(first)
+            yield first
+        for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+        text = "".join(parts)
+        if key is not None and (cache_if is None or cache_if(text)):
+            self.cache.set(key, text)
+
+    def _limited_stream(self, messages: List[Dict], temperature: float) -> Iterator[str]:
         if self.provider == "openai":
-            return self._openai(messages, temperature)
+            chunks = self._openai_stream(messages, temperature)
         elif self.provider == "anthropic":
-            return self._anthropic(messages, temperature)
+            chunks = self._anthropic_stream(messages, temperature)
         elif self.provider == "ollama":
-            return self._ollama(messages, temperature)
+            chunks = self._ollama_stream(messages, temperature)
         else:
             raise ValueError(f"Unsupported provider: {self.provider}")
 
+        parts = []
+        stats = {}
+        first_token_at = None
+        start = time.perf_counter()
+        limiter = self._limiter()
+        with limiter.limit(estimate_message_tokens(messages)):
+            while True:
+                try:
+                    chunk = next(chunks)
+                except StopIteration as stop:
+                    # The provider streams return their usage numbers as generator value
+                    stats = stop.value or {}
+                    break
+                if first_token_at is None:
+                    first_token_at = time.perf_counter() - start
+                parts.append(chunk)
+                yield chunk
+        text = "".join(parts)
+        limiter.record_completion(estimate_tokens(text))
+        self._record_usage(messages, text, stats, time.perf_counter() - start, first_token_at)
+
+    async def acomplete(self, messages: List[Dict], temperature: float = 0.7, use_cache: bool = True,
+                        cache_if: Callable[[str], bool] = None, cache_sampled: Optional[bool] = None) -> str:
+        """
+        Async variant of complete() with the same message format and caching.
+        Many calls can be in flight on one event loop without a thread each.
+        """
+        key = self._cache_key(messages, temperature)
+        use_cache = self._caches(use_cache, temperature, cache_sampled)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._record_cached(messages, cached)
+                return cached
+
+        if self.coalesce_enabled:
+            result = await _inflight.ado(key, lambda: self._acomplete(messages, temperature),
+                                         on_shared=lambda shared: self._record_cached(messages, shared,
+                                                                                      coalesced=True))
+        else:
+            result = await self._acomplete(messages, temperature)
+        if use_cache and (cache_if is None or cache_if(result)):
+            self.cache.set(key, result)
+        return result
+
+    async def _acomplete(self, messages: List[Dict], temperature: float) -> str:
+        return await self._awith_fallback(lambda backend: backend.retry_policy.acall(
+            lambda: backend._alimited_complete(messages, temperature),
+            get_breaker(backend.backend_id),
+        ))
+
+    async def _alimited_complete(self, messages: List[Dict], temperature: float) -> str:
+        limiter = self._limiter()
+        async with limiter.alimit(estimate_message_tokens(messages)):
+            result = await self._adispatch(messages, temperature)
+        limiter.record_completion(estimate_tokens(result))
+        return result
+
+    async def _adispatch(self, messages: List[Dict], temperature: float) -> str:
+        start = time.perf_counter()
+        if self.provider == "openai":
+            text, stats = await self._aopenai(messages, temperature)
+        elif self.provider == "anthropic":
+            text, stats = await self._aanthropic(messages, temperature)
+        elif self.provider == "ollama":
+            text, stats = await self._aollama(messages, temperature)
+        else:
+            raise ValueError(f"Unsupported provider: {self.provider}")
+        self._record_usage(messages, text, stats, time.perf_counter() - start)
+        return text
+
+    async def acomplete_many(self, message_batches: List[List[Dict]], temperature: float = 0.7,
+                             max_concurrency: int = 8, return_exceptions: bool = False,
+                             cache_if: Callable[[str], bool] = None) -> List[str]:
+        """
+        Run several completions concurrently, at most max_concurrency at a time.
+        Results are returned in the order of message_batches; with return_exceptions
+        a failed call yields its exception instead of failing the whole batch.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(messages):
+            async with semaphore:
+                return await self.acomplete(messages, temperature, cache_if=cache_if)
+
+        return await asyncio.gather(*(run(messages) for messages in message_batches),
+                                    return_exceptions=return_exceptions)
+
     def _openai(self, messages, temp):
-        import openai
-        openai.api_key = self.api_key
-        resp = openai.chat.completions.create(
+        profile = profile_for()
+        resp = get_sdk_client("openai", self.api_key, self.base_url).chat.completions.create(
             model=self.model,
             messages=messages,
             temperature=temp,
-            response_format={"type": "json_object"} if "json" in messages[-1].get("content", "") else None
+            max_tokens=profile.max_tokens,
+            top_p=profile.top_p,
+            response_format=_json_response_format(messages),
+            timeout=call_timeout()
         )
-        return resp.choices[0].message.content.strip()
+        return resp.choices[0].message.content.strip(), openai_usage(resp.usage)
 
     def _anthropic(self, messages, temp):
-        import anthropic
-        client = anthropic.Anthropic(api_key=self.api_key)
-        system = next((m["content"] for m in messages if m["role"] == "system"), "")
-        user_msg = next(m["content"] for m in messages if m["role"] == "user")
+        client = get_sdk_client("anthropic", self.api_key)
+        system, user_msg = _split_system(messages)
         resp = client.messages.create(
             model=self.model,
-            max_tokens=4096,
+            max_tokens=profile_for().max_tokens,
             temperature=temp,
             system=system,
-            messages=[{"role": "user", "content": user_msg}]
+            messages=[{"role": "user", "content": user_msg}],
+            timeout=call_timeout()
+        )
+        return resp.content[0].text, anthropic_usage(resp.usage)
+
+    def _openai_stream(self, messages, temp):
+        profile = profile_for()
+        stream = get_sdk_client("openai", self.api_key, self.base_url).chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temp,
+            max_tokens=profile.max_tokens,
+            top_p=profile.top_p,
+            response_format=_json_response_format(messages),
+            stream=True,
+            stream_options={"include_usage": True},
+            timeout=call_timeout()
         )
-        return resp.content[0].text
+        usage = None
+        for event in stream:
+            if event.choices and event.choices[0].delta.content:
+                yield event.choices[0].delta.content
+            if getattr(event, "usage", None):
+                usage = event.usage
+        return openai_usage(usage)
+
+    def _anthropic_stream(self, messages, temp):
+        client = get_sdk_client("anthropic", self.api_key)
+        system, user_msg = _split_system(messages)
+        with client.messages.stream(
+            model=self.model,
+            max_tokens=profile_for().max_tokens,
+            temperature=temp,
+            system=system,
+            messages=[{"role": "user", "content": user_msg}],
+            timeout=call_timeout()
+        ) as stream:
+            for text in stream.text_stream:
+                yield text
+            return anthropic_usage(stream.get_final_message().usage)
+
+    def _ollama_stream(self, messages, temp):
+        path, payload = self._ollama_request(messages, temp, stream=True)
+        with self.ollama_pool.endpoint() as url:
+            mark_model_used(url, self.model)
+            with get_session(url).post(f"{url}{path}", json=payload, stream=True,
+                                       timeout=call_timeout()) as resp:
+                resp.raise_for_status()
+                for line in resp.iter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    content = response_text(data)
+                    if content:
+                        yield content
+                    if data.get("done"):
+                        # Only the final line carries the token counts (and the context)
+                        self._remember_context(data)
+                        stats = ollama_usage(data)
+                        stats.pop("time_to_first_token", None)
+                        return stats
+        return {}
 
     def _ollama(self, messages, temp):
+        path, payload = self._ollama_request(messages, temp)
+        with self.ollama_pool.endpoint() as url:
+            mark_model_used(url, self.model)
+            resp = get_session(url).post(f"{url}{path}", json=payload, timeout=call_timeout())
+            resp.raise_for_status()
+        data = resp.json()
+        self._remember_context(data)
+        return response_text(data), ollama_usage(data)
+
+    def _ollama_request(self, messages, temp, stream=False):
+        """
+        Endpoint path and payload of an Ollama call. Inside an ollama_context_scope
+        the call goes to /api/generate and continues the run's context.
+        """
+        payload = self._ollama_payload(messages, temp)
+        payload["stream"] = stream
+        chain = current_chain()
+        if chain is None:
+            return "/api/chat", payload
+        return "/api/generate", generate_payload(payload, messages, chain)
+
+    def _remember_context(self, data):
+        chain = current_chain()
+        if chain is not None:
+            chain.update(self.model, data.get("context"))
+
+    def _ollama_payload(self, messages, temp):
         payload = {
             "model": self.model,
             "messages": messages,
-            "temperature": temp,
-            "stream": False
+            "options": ollama_options(messages, temp),
+            "stream": False,
+            "keep_alive": OLLAMA_KEEP_ALIVE
         }
-        resp = requests.post(f"{self.ollama_url}/api/chat", json=payload)
-        resp.raise_for_status()
-        return resp.json()["message"]["content"]
+        requested = current_schema()
+        if requested is not None:
+            # Ollama constrains the generation to the JSON schema
+            payload["format"] = requested[1]
+        return payload
+
+    async def _aopenai(self, messages, temp):
+        profile = profile_for()
+        resp = await get_async_sdk_client("openai", self.api_key, self.base_url).chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temp,
+            max_tokens=profile.max_tokens,
+            top_p=profile.top_p,
+            response_format=_json_response_format(messages),
+            timeout=call_timeout()
+        )
+        return resp.choices[0].message.content.strip(), openai_usage(resp.usage)
+
+    async def _aanthropic(self, messages, temp):
+        system, user_msg = _split_system(messages)
+        resp = await get_async_sdk_client("anthropic", self.api_key).messages.create(
+            model=self.model,
+            max_tokens=profile_for().max_tokens,
+            temperature=temp,
+            system=system,
+            messages=[{"role": "user", "content": user_msg}],
+            timeout=call_timeout()
+        )
+        return resp.content[0].text, anthropic_usage(resp.usage)
+
+    async def _aollama(self, messages, temp):
+        path, payload = self._ollama_request(messages, temp)
+        with self.ollama_pool.endpoint() as url:
+            mark_model_used(url, self.model)
+            resp = await get_async_client(url).post(f"{url}{path}", json=payload, timeout=call_timeout())
+            resp.raise_for_status()
+        data = resp.json()
+        self._remember_context(data)
+        return response_text(data), ollama_usage(data)
+
+_default_client = None
+
+def get_llm() -> LLMClient:
+    """
+    Return the shared default LLM client, constructing it on first use.
+    """
+    global _default_client
+    if _default_client is None:
+        _default_client = LLMClient()
+    return _default_client
 
-# Global LLM client instance
-llm = LLMClient()
\ No newline at end of file
+def __getattr__(name):
+    # Backwards compatible `from .llm import llm`, constructed lazily (PEP 562)
+    if name == "llm":
+        return get_llm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
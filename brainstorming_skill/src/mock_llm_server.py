@@ -0,0 +1,345 @@
+"""
+Local stand-in for an LLM server, for load tests and benchmarks without GPU or network.
+
+Speaks Ollama's /api/chat, /api/generate (including `context`) and /api/tags
+and the OpenAI /v1/chat/completions shape (plain and streamed). Answers are
+schema-valid thoughts or, for relation prompts, one relation per requested
+pair. Latency, streaming speed, error rate and concurrency are configurable.
+
+    python -m brainstorming_skill.src.mock_llm_server --port 11435 --latency 0.8 --error-rate 0.05
+
+Point the skill at it with OLLAMA_URL=http://localhost:11435 (or OPENAI_BASE_URL
+for the OpenAI shape), or start it in-process with start_mock_server().
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from .scoring import WEIGHTS
+from .structured import RELATIONS
+from .tokens import estimate_tokens, estimate_message_tokens
+
+_PAIR_LINE = re.compile(r"^- \((\S+), (\S+)\)$", re.MULTILINE)
+# Context window Ollama loads a model with when a request sets no num_ctx
+DEFAULT_NUM_CTX = 2048
+
+# Summaries combine one word of each pool. The thoughts of one answer never share
+# a word, so they share no word bigram and survive near-duplicate collapsing.
+_MEDIA = ["Smartphone-App", "Sensor", "Chatbot", "Webportal", "Sprachassistent", "Abo-Box", "Werkstatt", "Plattform"]
+_ACTIONS = ["erinnert", "vermittelt", "analysiert", "belohnt", "vernetzt", "automatisiert", "visualisiert", "bündelt"]
+_TARGETS = ["Einsteiger", "Familien", "Vereine", "Schulen", "Senioren", "Händler", "Pendler", "Kommunen"]
+_MEANS = ["Push-Nachrichten", "Fotoerkennung", "Tauschbörsen", "Abrechnungsdaten", "Kalendern", "Spielmechaniken", "Kartenansichten", "Gutscheinen"]
+
+
+@dataclass
+class MockConfig:
+    model: str = "llama3.2:latest"
+    latency: float = 0.5             # median time until the answer (or first token), seconds
+    latency_sigma: float = 0.0       # lognormal spread of the latency; 0 = fixed
+    tokens_per_second: float = 0.0   # streaming speed; 0 = send everything at once
+    error_rate: float = 0.0          # share of requests answered with error_status
+    error_status: int = 503
+    max_concurrency: int = 4         # requests beyond this wait, like Ollama's queue
+    max_queue: int = 64              # waiting requests beyond this get a 503
+    seed: Optional[int] = None
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], config: MockConfig):
+        super().__init__(address, _Handler)
+        self.config = config
+        self.random = random.Random(config.seed)
+        self._slots = threading.BoundedSemaphore(config.max_concurrency)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "rejected": 0, "in_flight": 0, "peak_in_flight": 0, "queued": 0,
+                      "model_loads": 0}
+        self.loaded_ctx: Dict[str, int] = {}
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, name: str, delta: int = 1):
+        with self._lock:
+            self.stats[name] += delta
+            if name == "in_flight":
+                self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.stats["in_flight"])
+
+    def load_model(self, body: Dict):
+        """
+        Like Ollama, (re)load the model when a request asks for another num_ctx.
+        """
+        model = body.get("model") or self.config.model
+        num_ctx = (body.get("options") or {}).get("num_ctx", DEFAULT_NUM_CTX)
+        with self._lock:
+            if self.loaded_ctx.get(model) != num_ctx:
+                self.loaded_ctx[model] = num_ctx
+                self.stats["model_loads"] += 1
+
+    def admit(self) -> bool:
+        """
+        Wait for a free slot; False if the queue is already full.
+        """
+        with self._lock:
+            if self.stats["queued"] >= self.config.max_queue:
+                self.stats["rejected"] += 1
+                return False
+            self.stats["queued"] += 1
+        self._slots.acquire()
+        self._count("queued", -1)
+        self._count("in_flight")
+        return True
+
+    def release(self):
+        self._count("in_flight", -1)
+        self._slots.release()
+
+    def sample_latency(self) -> float:
+        with self._lock:
+            if self.config.latency_sigma <= 0:
+                return self.config.latency
+            return self.config.latency * self.random.lognormvariate(0, self.config.latency_sigma)
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self.random.random() < self.config.error_rate
+
+
+def _seeded(messages: List[Dict]) -> random.Random:
+    # The same prompt always gets the same answer, which keeps response caches meaningful
+    digest = hashlib.sha256(json.dumps(messages, sort_keys=True).encode("utf-8")).hexdigest()
+    return random.Random(int(digest[:16], 16))
+
+
+def mock_answer(messages: List[Dict]) -> str:
+    """
+    Build a valid JSON answer: relations for every requested pair, otherwise thoughts.
+    """
+    prompt = messages[-1].get("content", "") if messages else ""
+    rng = _seeded(messages)
+    pairs = _PAIR_LINE.findall(prompt)
+    if pairs:
+        return json.dumps({"relations": [
+            {"from": a, "to": b, "relation": rng.choice(RELATIONS), "strength": rng.randint(1, 5)}
+            for a, b in pairs
+        ]}, ensure_ascii=False)
+
+    thoughts = []
+    words = zip(*(rng.sample(pool, 5) for pool in (_MEDIA, _ACTIONS, _TARGETS, _MEANS)))
+    for i, (medium, action, target, means) in enumerate(words, 1):
+        thoughts.append({
+            "id": f"T{i}",
+            "title": f"{medium} für {target}",
+            "summary": f"{medium} {action} {target} mittels {means}",
+            "scores": {name: rng.randint(4, 10) for name in WEIGHTS},
+        })
+    return json.dumps({"thoughts": thoughts}, ensure_ascii=False)
+
+
+def _token_chunks(text: str) -> List[str]:
+    # About four characters per token, matching estimate_tokens
+    return [text[i:i + 4] for i in range(0, len(text), 4)]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: MockLLMServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/api/tags":
+            self._send_json(200, {"models": [{"name": self.server.config.model, "model": self.server.config.model}]})
+        elif self.path.rstrip("/") == "/v1/models":
+            self._send_json(200, {"object": "list", "data": [{"id": self.server.config.model, "object": "model"}]})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": "invalid JSON body"})
+            return
+
+        path = self.path.rstrip("/")
+        if path not in ("/api/chat", "/api/generate", "/v1/chat/completions"):
+            self._send_json(404, {"error": "not found"})
+            return
+        if path != "/v1/chat/completions":
+            self.server.load_model(body)
+        if path == "/api/generate" and not body.get("prompt"):
+            # Warm-up requests only load the model
+            self._send_json(200, {"model": body.get("model"), "response": "", "done": True})
+            return
+
+        self.server._count("requests")
+        if not self.server.admit():
+            self._send_json(503, {"error": "server overloaded"})
+            return
+        try:
+            if self.server.should_fail():
+                self.server._count("errors")
+                time.sleep(self.server.sample_latency() / 2)
+                self._send_json(self.server.config.error_status, {"error": "injected failure"})
+                return
+            messages = body.get("messages") or []
+            if path == "/api/generate":
+                messages = [{"role": "system", "content": body.get("system", "")},
+                            {"role": "user", "content": body["prompt"]}]
+            latency = self.server.sample_latency()
+            text = mock_answer(messages)
+            if path != "/v1/chat/completions":
+                self._ollama_chat(body, messages, text, latency, generate=path == "/api/generate")
+            else:
+                self._openai_chat(body, messages, text, latency)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up, e.g. a timed-out or cancelled hedge
+            pass
+        finally:
+            self.server.release()
+
+    def _ollama_chat(self, body: Dict, messages: List[Dict], text: str, latency: float, generate: bool = False):
+        model = body.get("model") or self.server.config.model
+        counts = {
+            "prompt_eval_count": estimate_message_tokens(messages),
+            "eval_count": estimate_tokens(text),
+            "load_duration": 0,
+            "prompt_eval_duration": int(latency * 1e9),
+        }
+        if generate:
+            # Stand-in token ids: the previous context plus one id per evaluated token
+            previous = body.get("context") or []
+            counts["context"] = previous + list(range(len(previous), len(previous) + counts["prompt_eval_count"]
+                                                      + counts["eval_count"]))
+
+        def line(content: str, done: bool) -> Dict:
+            if generate:
+                return {"model": model, "response": content, "done": done}
+            return {"model": model, "message": {"role": "assistant", "content": content}, "done": done}
+
+        time.sleep(latency)
+        if body.get("stream", True) is False:
+            self._send_json(200, {**line(text, True), **counts})
+            return
+
+        self._start_stream("application/x-ndjson")
+        for chunk in _token_chunks(text):
+            self._stream_delay()
+            self._send_chunk(json.dumps(line(chunk, False)) + "\n")
+        self._send_chunk(json.dumps({**line("", True), **counts}) + "\n")
+        self._end_stream()
+
+    def _openai_chat(self, body: Dict, messages: List[Dict], text: str, latency: float):
+        model = body.get("model") or self.server.config.model
+        usage = {"prompt_tokens": estimate_message_tokens(messages), "completion_tokens": estimate_tokens(text)}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        base = {"id": f"chatcmpl-mock-{time.monotonic_ns()}", "created": int(time.time()), "model": model}
+        time.sleep(latency)
+        if not body.get("stream"):
+            self._send_json(200, {**base, "object": "chat.completion", "usage": usage, "choices": [
+                {"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}
+            ]})
+            return
+
+        def event(delta, finish_reason=None, **extra):
+            choices = [{"index": 0, "delta": delta, "finish_reason": finish_reason}] if delta is not None else []
+            return "data: " + json.dumps({**base, "object": "chat.completion.chunk", "choices": choices,
+                                          **extra}) + "\n\n"
+
+        self._start_stream("text/event-stream")
+        self._send_chunk(event({"role": "assistant", "content": ""}))
+        for chunk in _token_chunks(text):
+            self._stream_delay()
+            self._send_chunk(event({"content": chunk}))
+        self._send_chunk(event({}, "stop"))
+        if (body.get("stream_options") or {}).get("include_usage"):
+            self._send_chunk(event(None, usage=usage))
+        self._send_chunk("data: [DONE]\n\n")
+        self._end_stream()
+
+    def _stream_delay(self):
+        if self.server.config.tokens_per_second > 0:
+            time.sleep(1 / self.server.config.tokens_per_second)
+
+    def _send_json(self, status: int, payload: Dict):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _start_stream(self, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _send_chunk(self, text: str):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _end_stream(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+def start_mock_server(config: Optional[MockConfig] = None, host: str = "127.0.0.1", port: int = 0) -> MockLLMServer:
+    """
+    Start the mock server on a background thread (port 0 picks a free port).
+    Stop it with server.shutdown() and server.server_close().
+    """
+    server = MockLLMServer((host, port), config or MockConfig())
+    threading.Thread(target=server.serve_forever, name="mock-llm-server", daemon=True).start()
+    return server
+
+
+def main(argv: Optional[List[str]] = None):
+    defaults = MockConfig()
+    parser = argparse.ArgumentParser(description="Local mock LLM server (Ollama and OpenAI API shapes)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--model", default=defaults.model)
+    parser.add_argument("--latency", type=float, default=defaults.latency, help="median latency in seconds")
+    parser.add_argument("--latency-sigma", type=float, default=defaults.latency_sigma,
+                        help="lognormal spread of the latency (0 = fixed)")
+    parser.add_argument("--tokens-per-second", type=float, default=defaults.tokens_per_second)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    parser.add_argument("--error-status", type=int, default=defaults.error_status)
+    parser.add_argument("--max-concurrency", type=int, default=defaults.max_concurrency)
+    parser.add_argument("--max-queue", type=int, default=defaults.max_queue)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    config = MockConfig(
+        model=args.model, latency=args.latency, latency_sigma=args.latency_sigma,
+        tokens_per_second=args.tokens_per_second, error_rate=args.error_rate, error_status=args.error_status,
+        max_concurrency=args.max_concurrency, max_queue=args.max_queue, seed=args.seed,
+    )
+    server = MockLLMServer((args.host, args.port), config)
+    print(f"Mock LLM server for {config.model} listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Stats: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Near-duplicate detection for thoughts via MinHash with LSH banding.
+
+LLM-generated and derived thoughts often restate the same approach with a
+slightly different wording. Each summary is reduced to a MinHash signature of
+its word bigrams; the fraction of equal signature slots estimates the Jaccard
+similarity of the two bigram sets. Signatures are split into bands, and only
+thoughts that share a whole band are compared, so a lookup does not scan the
+whole index.
+"""
+import hashlib
+import os
+import random
+import re
+from functools import lru_cache
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+from .scoring import Thought
+
+# Collapse thoughts whose summaries are at least this similar (estimated Jaccard).
+# Rewordings that change a word or two of a one-sentence summary score about 0.65-0.8,
+# different approaches to the same task share almost no bigrams and score near 0.
+DEDUP_ENABLED = os.getenv("THOUGHT_DEDUP_ENABLED", "true").lower() in ("1", "true", "yes")
+DEDUP_THRESHOLD = float(os.getenv("THOUGHT_DEDUP_THRESHOLD", "0.5"))
+
+NUM_PERM = 64
+# 16 bands of 4 rows: pairs with a similarity around (1/16) ** (1/4) = 0.5 and above
+# share a band with high probability and become candidates
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(1)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+Signature = Tuple[int, ...]
+
+
+def shingles(text: str) -> Set[str]:
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < 2:
+        return set(words)
+    return {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+@lru_cache(maxsize=4096)
+def minhash(text: str) -> Signature:
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big")
+              for s in shingles(text)] or [0]
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def similarity(a: Signature, b: Signature) -> float:
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+class NearDuplicateIndex:
+    """
+    MinHash signatures by key, with LSH buckets for candidate lookup.
+    """
+    def __init__(self, threshold: float = DEDUP_THRESHOLD):
+        self.threshold = threshold
+        self._signatures: Dict[Hashable, Signature] = {}
+        self._buckets: Dict[Tuple[int, Signature], Set[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    @staticmethod
+    def _bands(signature: Signature):
+        for band in range(BANDS):
+            yield band, signature[band * ROWS:(band + 1) * ROWS]
+
+    def add(self, key: Hashable, signature: Signature):
+        self._signatures[key] = signature
+        for band in self._bands(signature):
+            self._buckets.setdefault(band, set()).add(key)
+
+    def remove(self, key: Hashable):
+        signature = self._signatures.pop(key)
+        for band in self._bands(signature):
+            bucket = self._buckets[band]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[band]
+
+    def find(self, signature: Signature) -> Optional[Hashable]:
+        """
+        Key of the most similar indexed signature at or above the threshold, or None.
+        """
+        candidates = set()
+        for band in self._bands(signature):
+            candidates.update(self._buckets.get(band, ()))
+        best, best_similarity = None, self.threshold
+        for key in candidates:
+            s = similarity(signature, self._signatures[key])
+            if s >= best_similarity:
+                best, best_similarity = key, s
+        return best
+
+
+def collapse_near_duplicates(thoughts: List[Thought], threshold: float = DEDUP_THRESHOLD) -> List[Thought]:
+    """
+    Keep only the best-scoring thought of each group of near-duplicates (the first
+    one on equal scores), in the original order.
+    """
+    index = NearDuplicateIndex(threshold)
+    kept: Dict[int, Thought] = {}
+    for i, thought in enumerate(thoughts):
+        signature = minhash(thought.summary)
+        match = index.find(signature)
+        if match is not None:
+            if kept[match].total_score >= thought.total_score:
+                continue
+            index.remove(match)
+            del kept[match]
+        index.add(i, signature)
+        kept[i] = thought
+    return [kept[i] for i in sorted(kept)]
@@ -0,0 +1,99 @@
+"""
+Reuse of Ollama's returned `context` tokens across the calls of one run.
+
+/api/chat re-sends and re-evaluates the whole conversation on every call. The
+/api/generate endpoint instead returns the evaluated tokens as `context`; passing
+them to the next call continues from there, so the shared preamble is only sent
+once per run. The next call then also sees the earlier exchanges of the run,
+which is why this is opt-in (OLLAMA_CONTEXT_REUSE) and scoped to one run.
+"""
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from ..config.ollama_config import OLLAMA_CONTEXT_REUSE, OLLAMA_MAX_CTX
+from .generation import stable_context_size
+from .tokens import estimate_tokens
+
+
+class ContextChain:
+    """
+    Latest Ollama context per model within one run. Concurrent calls all continue
+    from the same context; the one that finishes last becomes the new head.
+    """
+    def __init__(self):
+        self._contexts: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model: str) -> Optional[List[int]]:
+        with self._lock:
+            return self._contexts.get(model)
+
+    def update(self, model: str, context: Optional[List[int]]):
+        if context:
+            with self._lock:
+                self._contexts[model] = context
+
+
+_chain: ContextVar[Optional[ContextChain]] = ContextVar("ollama_context_chain", default=None)
+
+
+@contextmanager
+def ollama_context_scope(enabled: bool = OLLAMA_CONTEXT_REUSE):
+    """
+    Chain the Ollama calls made inside the block through their returned context.
+    Yields the ContextChain, or None when context reuse is disabled.
+    """
+    if not enabled:
+        yield None
+        return
+    chain = ContextChain()
+    token = _chain.set(chain)
+    try:
+        yield chain
+    finally:
+        _chain.reset(token)
+
+
+def current_chain() -> Optional[ContextChain]:
+    return _chain.get()
+
+
+def generate_payload(chat_payload: Dict, messages: List[Dict], chain: ContextChain) -> Dict:
+    """
+    Turn a /api/chat payload into a /api/generate payload that continues the
+    chain's context. The system prompt is only sent when a new chain starts,
+    since a continued context already contains it.
+    """
+    model = chat_payload["model"]
+    system = "\n\n".join(m["content"] for m in messages if m["role"] == "system")
+    prompt = "\n\n".join(m["content"] for m in messages if m["role"] != "system")
+    options = dict(chat_payload["options"])
+
+    context = chain.get(model)
+    if context is not None:
+        num_ctx = stable_context_size(len(context) + estimate_tokens(prompt), options["num_predict"])
+        if len(context) + estimate_tokens(prompt) + options["num_predict"] > OLLAMA_MAX_CTX:
+            # The chain would no longer fit; start over with a fresh context
+            context = None
+        else:
+            options["num_ctx"] = num_ctx
+
+    payload = {key: value for key, value in chat_payload.items() if key != "messages"}
+    payload["prompt"] = prompt
+    payload["options"] = options
+    if context is None:
+        payload["system"] = system
+    else:
+        payload["context"] = context
+    return payload
+
+
+def response_text(data: Dict) -> str:
+    """
+    Text of an Ollama response (or stream line) from either /api/chat or /api/generate.
+    """
+    if "message" in data:
+        return data["message"].get("content", "")
+    return data.get("response", "")
@@ -1,15 +1,31 @@
 import json
+import time
 import requests
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 from .scoring import Thought
+from .http_pool import get_session
+from .resilience import RetryPolicy, get_breaker
+from .deadline import call_timeout, has_time_for
+from .relation_batcher import classify_relations_batched, threaded_complete_many
+from .warmup import mark_model_used, warm_up_model
+from .endpoint_pool import EndpointPool, get_endpoint_pool, parse_urls
+from .tokens import estimate_tokens, estimate_message_tokens
+from .usage import CallUsage, current_stage, record_usage, ollama_usage
+from .generation import ollama_options
+from .prompts import initial_thoughts_messages
+from .structured import current_schema, parse_json_items, response_schema, thoughts_schema
+from ..config.ollama_config import LLM_RELATIONS_MIN_SECONDS, OLLAMA_KEEP_ALIVE
 
 class OllamaClient:
     """
     A client specifically for interacting with Ollama models locally.
     """
     def __init__(self, base_url: str = "http://localhost:11434"):
-        self.base_url = base_url
+        # Several comma-separated hosts are load balanced
+        self.base_urls = parse_urls(base_url)
+        self.base_url = self.base_urls[0]
         self.model = "llama3.2:8b"  # Default model, can be changed
+        self.retry_policy = RetryPolicy.from_env()
         
     def set_model(self, model_name: str):
         """
@@ -17,6 +33,32 @@ class OllamaClient:
         """
         self.model = model_name
     
+    def warm_up(self) -> bool:
+        """
+        Load the current model into memory on every host so the first real request does not pay for it.
+        """
+        return all([warm_up_model(url, self.model) for url in self.base_urls])
+
+    @property
+    def pool(self) -> EndpointPool:
+        return get_endpoint_pool(self.base_urls, self.model)
+
+    def _breaker(self):
+        return get_breaker(f"ollama:{self.model}@{','.join(self.base_urls)}")
+
+    def _record_usage(self, messages: List[Dict], content: str, stats: Dict, wall_time: float,
+                      time_to_first_token: float = None):
+        record_usage(CallUsage(
+            provider="ollama",
+            model=self.model,
+            stage=current_stage(),
+            prompt_tokens=stats.get("prompt_tokens", estimate_message_tokens(messages)),
+            completion_tokens=stats.get("completion_tokens", estimate_tokens(content)),
+            wall_time=wall_time,
+            time_to_first_token=stats.get("time_to_first_token", time_to_first_token),
+            estimated="prompt_tokens" not in stats or "completion_tokens" not in stats,
+        ))
+
     def complete(self, messages: List[Dict], temperature: float = 0.7) -> str:
         """
         Send a completion request to the Ollama API.
@@ -24,15 +66,29 @@ class OllamaClient:
         payload = {
             "model": self.model,
             "messages": messages,
-            "temperature": temperature,
-            "stream": False
+            "options": ollama_options(messages, temperature),
+            "stream": False,
+            "keep_alive": OLLAMA_KEEP_ALIVE
         }
-        
+        requested = current_schema()
+        if requested is not None:
+            payload["format"] = requested[1]
+
+        def post():
+            with self.pool.endpoint() as url:
+                mark_model_used(url, self.model)
+                response = get_session(url).post(f"{url}/api/chat", json=payload, timeout=call_timeout())
+                response.raise_for_status()
+            return response
+
         try:
-            response = requests.post(f"{self.base_url}/api/chat", json=payload)
-            response.raise_for_status()
+            # Transient errors are retried; a dead server trips the breaker and fails fast
+            start = time.perf_counter()
+            response = self.retry_policy.call(post, self._breaker())
             result = response.json()
-            return result["message"]["content"]
+            content = result["message"]["content"]
+            self._record_usage(messages, content, ollama_usage(result), time.perf_counter() - start)
+            return content
         except requests.exceptions.RequestException as e:
             print(f"Error calling Ollama API: {e}")
             raise
@@ -41,72 +97,94 @@ class OllamaClient:
             print(f"Response: {response.json()}")
             raise
 
+    def stream(self, messages: List[Dict], temperature: float = 0.7) -> Iterator[str]:
+        """
+        Stream a completion from the Ollama API as text chunks. Opening the stream
+        is retried and guarded by the breaker like complete(); usage is recorded
+        from the final chunk.
+        """
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "options": ollama_options(messages, temperature),
+            "stream": True,
+            "keep_alive": OLLAMA_KEEP_ALIVE
+        }
+        requested = current_schema()
+        if requested is not None:
+            payload["format"] = requested[1]
+
+        final = {}
+
+        def lines():
+            with self.pool.endpoint() as url:
+                mark_model_used(url, self.model)
+                with get_session(url).post(f"{url}/api/chat", json=payload, stream=True,
+                                           timeout=call_timeout()) as response:
+                    response.raise_for_status()
+                    for line in response.iter_lines():
+                        if not line:
+                            continue
+                        data = json.loads(line)
+                        content = data.get("message", {}).get("content")
+                        if content:
+                            yield content
+                        if data.get("done"):
+                            final.update(data)
+                            break
+
+        def open_stream():
+            # Pull the first chunk inside the retry so that connection errors
+            # are retried before anything has been yielded
+            chunks = lines()
+            return next(chunks, None), chunks
+
+        parts = []
+        try:
+            start = time.perf_counter()
+            first, chunks = self.retry_policy.call(open_stream, self._breaker())
+            first_token_at = time.perf_counter() - start
+            if first is not None:
+                parts.append(first)
+                yield first
+            for chunk in chunks:
+                parts.append(chunk)
+                yield chunk
+        except requests.exceptions.RequestException as e:
+            print(f"Error calling Ollama API: {e}")
+            raise
+        self._record_usage(messages, "".join(parts), ollama_usage(final), time.perf_counter() - start,
+                           time_to_first_token=first_token_at)
+
     def generate_initial_thoughts(self, task: str) -> List[Thought]:
         """
         Generate initial thoughts using Ollama.
         """
         from .scoring import calculate_total_score, validate_criteria_scores
-        from .llm import WEIGHTS
         
-        criteria = "\n".join([f"- {k} (1–10)" for k in WEIGHTS.keys()])
-        prompt = f"""
-Du bist ein brillanter Produkt- und System-Architekt.
-Aufgabe: {task}
-
-Generiere EXAKT 5 unterschiedliche, aber hochwertige Lösungsansätze (Thoughts).
-Jeder Thought muss enthalten:
-- Kurzüberschrift (z.B. "React Native + externe API")
-- 2–3 Sätze Beschreibung
-- Bewertung der 10 Kriterien (1–10):
-
-{criteria}
-
-Antworte NUR im folgenden JSON-Format:
-{{
-  "thoughts": [
-    {{
-      "id": "T1",
-      "title": "...",
-      "summary": "...",
-      "scores": {{"Zielerreichung": 9, "Machbarkeit": 8, ...}}
-    }}
-  ]
-}}
-        """
-
-        messages = [
-            {"role": "system", "content": "Du bist ein extrem präziser und objektiver Architekt."},
-            {"role": "user", "content": prompt}
-        ]
+        # Same prefix-cache-friendly layout as the LLMClient pipeline
+        messages = initial_thoughts_messages(task)
 
-        raw_json = self.complete(messages, temperature=0.8)
+        # Ollama constrains the output to the thoughts schema
+        with response_schema("thoughts", thoughts_schema()):
+            raw_json = self.complete(messages, temperature=0.8)
 
-        try:
-            data = json.loads(raw_json)
-        except json.JSONDecodeError:
-            # Fallback: extract JSON from Markdown or text
-            import re
-            match = re.search(r"\{.*\}", raw_json, re.DOTALL)
-            if match:
-                try:
-                    data = json.loads(match.group(0))
-                except json.JSONDecodeError:
-                    print("Could not parse Ollama response as JSON")
-                    return []
-            else:
-                print("Could not find JSON in Ollama response")
-                return []
+        items = parse_json_items(raw_json, key="thoughts")
+        if not items:
+            print("Could not parse Ollama response as JSON")
+            return []
 
         thoughts = []
-        for item in data.get("thoughts", []):
+        for item in items:
             # Validate the scores before creating the Thought
-            if not validate_criteria_scores(item["scores"]):
-                print(f"Invalid scores for thought {item['id']}, skipping...")
+            scores = item.get("scores")
+            if "id" not in item or not isinstance(scores, dict) or not validate_criteria_scores(scores):
+                print(f"Invalid scores for thought {item.get('id')}, skipping...")
                 continue
                 
             thought = Thought(
                 id=item["id"],
-                summary=f"{item['title']}\n\n{item.get('summary', '')}",
+                summary=f"{item.get('title', '')}\n\n{item.get('summary', '')}",
                 criteria_scores=item["scores"],
                 total_score=0
             )
@@ -118,60 +196,11 @@ Antworte NUR im folgenden JSON-Format:
     def classify_relations(self, thoughts: List[Thought]) -> List[Dict]:
         """
         Classify relationships between thoughts using Ollama.
+        Returns an empty list if the request budget no longer allows the call.
         """
-        thoughts_info = []
-        for thought in thoughts:
-            thoughts_info.append({
-                "id": thought.id,
-                "summary": thought.summary[:200]  # Truncate for prompt efficiency
-            })
-        
-        relation_prompt = f"""
-Hier sind {len(thoughts_info)} Lösungsansätze:
-{json.dumps(thoughts_info, indent=2, ensure_ascii=False)}
-
-Für jedes Paar (i,j) mit i < j bestimme:
-- Die Beziehung: ergänzt | widerspricht | abhängig_von | kombinierbar | besser_als
-- Die Stärke: 1–5
-
-Antworte NUR als JSON-Array von Objekten mit diesen Feldern:
-- "from": ID des ersten Thoughts
-- "to": ID des zweiten Thoughts
-- "relation": die Beziehung
-- "strength": 1-5
-
-Format:
-[
-  {{
-    "from": "T1",
-    "to": "T2",
-    "relation": "kombinierbar",
-    "strength": 4
-  }}
-]
-        """
-
-        messages = [
-            {"role": "system", "content": "Du bist ein präziser Analyst für Lösungsansätze."},
-            {"role": "user", "content": relation_prompt}
-        ]
+        if not has_time_for(LLM_RELATIONS_MIN_SECONDS):
+            print("Not enough time left for relation classification, skipping...")
+            return []
 
-        raw_json = self.complete(messages, temperature=0.3)
-        
-        try:
-            relations = json.loads(raw_json)
-        except json.JSONDecodeError:
-            # Fallback: extract JSON from response
-            import re
-            match = re.search(r"\[.*\]", raw_json, re.DOTALL)
-            if match:
-                try:
-                    relations = json.loads(match.group(0))
-                except json.JSONDecodeError:
-                    print("Could not parse relation classification as JSON")
-                    return []
-            else:
-                print("Could not find relation classification in response")
-                return []
-        
-        return relations
\ No newline at end of file
+        # Pairs are packed into token-budgeted batches that run concurrently
+        return classify_relations_batched(thoughts, complete_many=threaded_complete_many(self.complete))
\ No newline at end of file
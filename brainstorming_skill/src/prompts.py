@@ -0,0 +1,98 @@
+"""
+Prompt layout shared by all pipeline stages.
+
+Backends reuse the evaluated prefix of a prompt (Ollama's KV cache, OpenAI and
+Anthropic prompt caching) only up to the first differing token. Every prompt
+therefore starts with the same system message (role and criteria block), then
+the static instructions of its stage, and only then the variable data such as
+the task or the thoughts to compare.
+"""
+from typing import Dict, List
+
+from .scoring import WEIGHTS
+
+CRITERIA_BLOCK = "Bewertungskriterien (jeweils 1–10):\n" + "\n".join(f"- {name}" for name in WEIGHTS)
+
+SYSTEM_PROMPT = f"""Du bist ein brillanter, extrem präziser und objektiver Produkt- und System-Architekt
+und analysierst Lösungsansätze.
+
+{CRITERIA_BLOCK}"""
+
+INITIAL_THOUGHTS_INSTRUCTIONS = """Generiere EXAKT 5 unterschiedliche, aber hochwertige Lösungsansätze (Thoughts) für die Aufgabe am Ende.
+Jeder Thought muss enthalten:
+- Kurzüberschrift (z.B. "React Native + externe API")
+- 2–3 Sätze Beschreibung
+- Bewertung aller 10 Bewertungskriterien (1–10)
+
+Antworte NUR im folgenden JSON-Format:
+{
+  "thoughts": [
+    {
+      "id": "T1",
+      "title": "...",
+      "summary": "...",
+      "scores": {"Zielerreichung": 9, "Machbarkeit": 8, ...}
+    }
+  ]
+}"""
+
+EXPANSION_INSTRUCTIONS = """Entwickle den unten genannten Ausgangsansatz für die Aufgabe weiter.
+Generiere EXAKT {count} unterschiedliche, konkret verbesserte Varianten davon. Jede Variante muss enthalten:
+- Kurzüberschrift
+- 2–3 Sätze Beschreibung, was gegenüber dem Ausgangsansatz anders oder besser ist
+- Ehrliche Bewertung aller 10 Bewertungskriterien (1–10)
+
+Antworte NUR im folgenden JSON-Format:
+{{
+  "thoughts": [
+    {{
+      "id": "V1",
+      "title": "...",
+      "summary": "...",
+      "scores": {{"Zielerreichung": 9, "Machbarkeit": 8, ...}}
+    }}
+  ]
+}}"""
+
+RELATION_INSTRUCTIONS = """Bestimme für jedes der unten genannten Paare (from, to) von Lösungsansätzen:
+- Die Beziehung: ergänzt | widerspricht | abhängig_von | kombinierbar | besser_als
+- Die Stärke: 1–5
+
+Antworte NUR als JSON mit genau einem Objekt pro Paar:
+{
+  "relations": [
+    {
+      "from": "T1",
+      "to": "T2",
+      "relation": "kombinierbar",
+      "strength": 4
+    }
+  ]
+}"""
+
+
+def system_message() -> Dict:
+    return {"role": "system", "content": SYSTEM_PROMPT}
+
+
+def initial_thoughts_messages(task: str) -> List[Dict]:
+    return [
+        system_message(),
+        {"role": "user", "content": f"{INITIAL_THOUGHTS_INSTRUCTIONS}\n\nAufgabe: {task}"},
+    ]
+
+
+def expansion_messages(task: str, parent_summary: str, count: int) -> List[Dict]:
+    return [
+        system_message(),
+        {"role": "user", "content": f"{EXPANSION_INSTRUCTIONS.format(count=count)}\n\nAufgabe: {task}\n\n"
+                                    f"Ausgangsansatz:\n{parent_summary}"},
+    ]
+
+
+def relation_messages(thoughts_json: str, count: int, pairs: str) -> List[Dict]:
+    return [
+        system_message(),
+        {"role": "user", "content": f"{RELATION_INSTRUCTIONS}\n\nHier sind {count} Lösungsansätze:\n"
+                                    f"{thoughts_json}\n\nPaare:\n{pairs}"},
+    ]
@@ -0,0 +1,249 @@
+"""
+Per-provider concurrency limits and request/token rate limits for LLM calls.
+
+Queued callers are served in FIFO order, whether they are threads or coroutines,
+so a burst degrades into a steady queue instead of a flood of 429s. Nobody waits
+past the request deadline: a caller whose wait would exceed its remaining budget
+gets DeadlineExceeded right away instead of sleeping first.
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Optional, Tuple
+
+from .deadline import DeadlineExceeded, remaining
+
+
+class _Waiter:
+    __slots__ = ("loop", "future", "event", "granted")
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.loop = loop
+        self.future = loop.create_future() if loop else None
+        self.event = None if loop else threading.Event()
+        self.granted = False
+
+    def wake(self):
+        if self.loop:
+            self.loop.call_soon_threadsafe(self._resolve)
+        else:
+            self.event.set()
+
+    def _resolve(self):
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class FairSemaphore:
+    """
+    Counting semaphore that hands free slots to waiters strictly in arrival order.
+    """
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._in_use = 0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    def _enter_or_enqueue(self, waiter: _Waiter) -> bool:
+        with self._lock:
+            if self._in_use < self.limit and not self._waiters:
+                self._in_use += 1
+                return True
+            self._waiters.append(waiter)
+            return False
+
+    def _abandon(self, waiter: _Waiter) -> bool:
+        """Withdraw a waiter; returns True if it was granted a slot in the meantime."""
+        with self._lock:
+            if waiter.granted:
+                return True
+            self._waiters.remove(waiter)
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        waiter = _Waiter()
+        if self._enter_or_enqueue(waiter):
+            return True
+        if waiter.event.wait(timeout):
+            return True
+        return self._abandon(waiter)
+
+    async def aacquire(self, timeout: Optional[float] = None) -> bool:
+        waiter = _Waiter(asyncio.get_running_loop())
+        if self._enter_or_enqueue(waiter):
+            return True
+        try:
+            await asyncio.wait_for(waiter.future, timeout)
+        except asyncio.TimeoutError:
+            return self._abandon(waiter)
+        except asyncio.CancelledError:
+            if self._abandon(waiter):
+                self.release()
+            raise
+        return True
+
+    def release(self):
+        with self._lock:
+            if self._waiters:
+                # Hand the slot over directly so nobody can overtake the queue
+                waiter = self._waiters.popleft()
+                waiter.granted = True
+                waiter.wake()
+            else:
+                self._in_use -= 1
+
+    @property
+    def queued(self) -> int:
+        with self._lock:
+            return len(self._waiters)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at rate_per_minute. Callers reserve tokens in arrival
+    order and the bucket may go into debt, so each caller waits exactly as long as
+    needed for the callers ahead of it to be paid off (FIFO without a queue).
+    """
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float, max_wait: Optional[float] = None) -> float:
+        """
+        Take amount tokens and return the number of seconds to wait before proceeding.
+        If that wait would exceed max_wait, nothing is taken and DeadlineExceeded is raised.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(0.0, (amount - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                raise DeadlineExceeded(f"Rate limit wait of {wait:.1f}s exceeds the remaining budget")
+            self._tokens -= amount
+            return wait
+
+    def refund(self, amount: float):
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def acquire(self, amount: float = 1, max_wait: Optional[float] = None):
+        wait = self.reserve(amount, max_wait)
+        if wait:
+            time.sleep(wait)
+
+    async def aacquire(self, amount: float = 1, max_wait: Optional[float] = None):
+        wait = self.reserve(amount, max_wait)
+        if wait:
+            await asyncio.sleep(wait)
+
+    def consume(self, amount: float):
+        """
+        Charge tokens after the fact (e.g. completion tokens) without waiting.
+        """
+        self.reserve(amount)
+
+
+def _budget() -> Optional[float]:
+    """
+    Seconds the caller may still wait, or None without a deadline.
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("Deadline exceeded before rate limiting")
+    return left
+
+
+class RateLimiter:
+    """
+    Combines a max-in-flight limit with request-per-minute and token-per-minute buckets.
+    Any limit set to None or 0 is disabled.
+    """
+    def __init__(self, max_in_flight: Optional[int] = None,
+                 requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None):
+        self.semaphore = FairSemaphore(max_in_flight) if max_in_flight else None
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    def _reserve(self, prompt_tokens: int) -> float:
+        """
+        Reserve from both buckets within the remaining budget; returns the wait.
+        """
+        left = _budget()
+        wait = self.request_bucket.reserve(1, left) if self.request_bucket else 0.0
+        if self.token_bucket:
+            try:
+                wait = max(wait, self.token_bucket.reserve(prompt_tokens, left))
+            except DeadlineExceeded:
+                if self.request_bucket:
+                    self.request_bucket.refund(1)
+                raise
+        return wait
+
+    @contextmanager
+    def limit(self, prompt_tokens: int = 0):
+        wait = self._reserve(prompt_tokens)
+        if wait:
+            time.sleep(wait)
+        if self.semaphore and not self.semaphore.acquire(timeout=_budget()):
+            raise DeadlineExceeded("Deadline exceeded while waiting for a free LLM slot")
+        try:
+            yield self
+        finally:
+            if self.semaphore:
+                self.semaphore.release()
+
+    @asynccontextmanager
+    async def alimit(self, prompt_tokens: int = 0):
+        wait = self._reserve(prompt_tokens)
+        if wait:
+            await asyncio.sleep(wait)
+        if self.semaphore and not await self.semaphore.aacquire(timeout=_budget()):
+            raise DeadlineExceeded("Deadline exceeded while waiting for a free LLM slot")
+        try:
+            yield self
+        finally:
+            if self.semaphore:
+                self.semaphore.release()
+
+    def record_completion(self, completion_tokens: int):
+        if self.token_bucket:
+            self.token_bucket.consume(completion_tokens)
+
+
+_limiters: Dict[Tuple[str, str, int], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _env_number(name: str, provider: str, default: Optional[float]) -> Optional[float]:
+    # Provider-specific settings (e.g. LLM_MAX_IN_FLIGHT_OLLAMA) win over global ones
+    value = os.getenv(f"{name}_{provider.upper()}", os.getenv(name))
+    return float(value) if value else default
+
+
+def get_limiter(provider: str, model: str, hosts: int = 1) -> RateLimiter:
+    """
+    Return the shared limiter for a provider/model pair served by `hosts` endpoints,
+    configured from the environment: LLM_MAX_IN_FLIGHT, LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE (optionally suffixed with _OPENAI, _ANTHROPIC or _OLLAMA).
+    """
+    key = (provider, model, hosts)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            # A single local Ollama instance serializes generations anyway, so the
+            # default allows 4 per host of the endpoint pool; the setting is a total
+            max_in_flight = _env_number("LLM_MAX_IN_FLIGHT", provider, 4 * hosts if provider == "ollama" else None)
+            limiter = _limiters[key] = RateLimiter(
+                max_in_flight=int(max_in_flight) if max_in_flight else None,
+                requests_per_minute=_env_number("LLM_REQUESTS_PER_MINUTE", provider, None),
+                tokens_per_minute=_env_number("LLM_TOKENS_PER_MINUTE", provider, None),
+            )
+    return limiter
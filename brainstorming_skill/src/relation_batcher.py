@@ -0,0 +1,170 @@
+"""
+Batched LLM classification of pairwise thought relations.
+
+Asking for all (i, j) pairs in one prompt makes the output grow quadratically and
+overflows the context; one call per pair is far too slow. Instead, pair jobs are
+packed into as few calls as fit a prompt and an output token budget, the batches
+run concurrently, and the validated results are merged back by pair.
+"""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .event_loop import run_sync
+from .scoring import Thought
+from .structured import RELATIONS, parse_json_items, relations_schema, response_schema
+from .tokens import estimate_tokens, estimate_message_tokens
+from .prompts import relation_messages
+from .usage import stage_scope
+
+# Token budgets per classification call
+PROMPT_TOKEN_BUDGET = 3000
+OUTPUT_TOKEN_BUDGET = 1024
+# Expected output tokens for one relation object
+TOKENS_PER_RELATION = 30
+# Summaries are truncated like in the single-prompt classification
+SUMMARY_CHARS = 200
+# Concurrent classification calls; raise it for servers with continuous batching
+MAX_CONCURRENCY = int(os.getenv("LLM_BATCH_CONCURRENCY", "4"))
+
+Pair = Tuple[str, str]
+
+
+class RelationBatch:
+    """
+    One classification call: the thoughts it needs to show and the pairs it asks for.
+    """
+    def __init__(self):
+        self.thoughts: List[Thought] = []
+        self.pairs: List[Pair] = []
+
+    def messages(self) -> List[Dict]:
+        thoughts_info = [{"id": t.id, "summary": t.summary[:SUMMARY_CHARS]} for t in self.thoughts]
+        return relation_messages(
+            thoughts_json=json.dumps(thoughts_info, indent=2, ensure_ascii=False),
+            count=len(thoughts_info),
+            pairs="\n".join(f"- ({a}, {b})" for a, b in self.pairs),
+        )
+
+
+def _thought_tokens(thought: Thought) -> int:
+    # id, summary and the JSON scaffolding around them
+    return estimate_tokens(thought.id) + estimate_tokens(thought.summary[:SUMMARY_CHARS]) + 12
+
+
+def pack_relation_batches(thoughts: List[Thought],
+                          prompt_token_budget: int = PROMPT_TOKEN_BUDGET,
+                          output_token_budget: int = OUTPUT_TOKEN_BUDGET,
+                          tokens_per_relation: int = TOKENS_PER_RELATION) -> List[RelationBatch]:
+    """
+    Greedily pack all i < j pairs into batches that respect both token budgets.
+    Pairs are visited row by row, so consecutive pairs share their first thought
+    and a batch only needs to show each thought once.
+    """
+    base_tokens = estimate_message_tokens(relation_messages("", 0, ""))
+    pair_line_tokens = 6
+    max_pairs = max(1, output_token_budget // tokens_per_relation)
+
+    batches: List[RelationBatch] = []
+    batch = RelationBatch()
+    shown = set()
+    prompt_tokens = base_tokens
+
+    for i in range(len(thoughts)):
+        for j in range(i + 1, len(thoughts)):
+            new = [t for t in (thoughts[i], thoughts[j]) if t.id not in shown]
+            cost = sum(_thought_tokens(t) for t in new) + pair_line_tokens
+            if batch.pairs and (prompt_tokens + cost > prompt_token_budget or len(batch.pairs) >= max_pairs):
+                batches.append(batch)
+                batch = RelationBatch()
+                shown = set()
+                prompt_tokens = base_tokens
+                new = [thoughts[i], thoughts[j]]
+                cost = sum(_thought_tokens(t) for t in new) + pair_line_tokens
+            for t in new:
+                batch.thoughts.append(t)
+                shown.add(t.id)
+            batch.pairs.append((thoughts[i].id, thoughts[j].id))
+            prompt_tokens += cost
+
+    if batch.pairs:
+        batches.append(batch)
+    return batches
+
+
+def parse_batch_relations(raw: str, batch: RelationBatch) -> Dict[Pair, Dict]:
+    """
+    Keep only well-formed relations for pairs that were actually requested.
+    """
+    requested = set(batch.pairs)
+    relations = {}
+    for item in parse_json_items(raw, key="relations"):
+        pair = (item.get("from"), item.get("to"))
+        if pair not in requested and pair[::-1] in requested:
+            pair = pair[::-1]
+        if pair not in requested or item.get("relation") not in RELATIONS:
+            continue
+        try:
+            strength = int(item.get("strength", 3))
+        except (TypeError, ValueError):
+            continue
+        relations[pair] = {
+            "from": pair[0],
+            "to": pair[1],
+            "relation": item["relation"],
+            "strength": max(1, min(5, strength)),
+        }
+    return relations
+
+
+def _default_complete_many(message_batches: List[List[Dict]], temperature: float) -> List[str]:
+    from .llm import get_llm
+
+    return run_sync(lambda: get_llm().acomplete_many(
+        message_batches, temperature=temperature, max_concurrency=MAX_CONCURRENCY, return_exceptions=True,
+        cache_if=lambda raw: bool(parse_json_items(raw, key="relations"))))
+
+
+def threaded_complete_many(complete: Callable[..., str],
+                           max_concurrency: int = MAX_CONCURRENCY) -> Callable[[List[List[Dict]], float], List[str]]:
+    """
+    Adapt a blocking complete(messages, temperature=...) function into a
+    complete_many that runs the batches in a bounded thread pool. Like the async
+    default, a failed batch yields its exception instead of a response.
+    """
+    def complete_many(message_batches: List[List[Dict]], temperature: float) -> List[str]:
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            # Each call runs in a copy of the caller's context so deadlines propagate
+            futures = [pool.submit(copy_context().run, complete, messages, temperature=temperature)
+                       for messages in message_batches]
+            return [f.exception() or f.result() for f in futures]
+    return complete_many
+
+
+def classify_relations_batched(thoughts: List[Thought],
+                               complete_many: Optional[Callable[[List[List[Dict]], float], List[str]]] = None,
+                               prompt_token_budget: int = PROMPT_TOKEN_BUDGET,
+                               output_token_budget: int = OUTPUT_TOKEN_BUDGET,
+                               temperature: float = 0.3) -> List[Dict]:
+    """
+    Classify all pairwise relations with as few, concurrently executed LLM calls
+    as the token budgets allow. Pairs the LLM did not answer, or whose batch
+    failed, are left out so the caller can fall back to heuristics for them.
+    """
+    batches = pack_relation_batches(thoughts, prompt_token_budget, output_token_budget)
+    if not batches:
+        return []
+
+    complete_many = complete_many or _default_complete_many
+    with stage_scope("relations"), response_schema("relations", relations_schema()):
+        responses = complete_many([batch.messages() for batch in batches], temperature)
+
+    merged: Dict[Pair, Dict] = {}
+    for batch, raw in zip(batches, responses):
+        if isinstance(raw, BaseException):
+            print(f"Relation batch with {len(batch.pairs)} pairs failed: {raw}")
+            continue
+        merged.update(parse_batch_relations(raw, batch))
+    return list(merged.values())
@@ -0,0 +1,220 @@
+"""
+Retries with jittered exponential backoff and per-backend circuit breakers.
+
+A backend that keeps failing is short-circuited for a while, so callers fail fast
+or move on to the next backend of the fallback chain instead of hanging on it.
+"""
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .deadline import DeadlineExceeded, remaining
+
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+RETRYABLE_ERROR_NAMES = {
+    "ConnectionError", "Timeout", "ConnectTimeout", "ReadTimeout", "ChunkedEncodingError",
+    "APIConnectionError", "APITimeoutError", "RateLimitError", "InternalServerError",
+    "ConnectError", "ReadError", "RemoteProtocolError", "TimeoutException", "PoolTimeout",
+}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a backend is short-circuited after repeated failures."""
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Transient failures (connection problems, timeouts, 429 and 5xx responses) are
+    worth retrying; client errors such as 400 or 401 are not.
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+
+
+class CircuitBreaker:
+    """
+    Classic closed → open → half-open breaker. After failure_threshold consecutive
+    failures the circuit opens for reset_timeout seconds; then a single trial call
+    is let through and either closes the circuit again or re-opens it.
+    """
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+    def release(self):
+        """
+        End an admitted call that says nothing about the backend's health (client
+        error, deadline, cancellation): frees a half-open trial slot, keeps the state.
+        """
+        with self._lock:
+            self._trial_running = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """
+    Return the shared breaker for a backend, configured via LLM_BREAKER_THRESHOLD
+    and LLM_BREAKER_RESET_SECONDS.
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(
+                name,
+                failure_threshold=int(os.getenv("LLM_BREAKER_THRESHOLD", "5")),
+                reset_timeout=float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30")),
+            )
+    return breaker
+
+
+class RetryPolicy:
+    """
+    Retries transient failures with full-jitter exponential backoff.
+    """
+    def __init__(self, max_retries: int = 2, base_delay: float = 0.5, max_delay: float = 8.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        return cls(
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", "2")),
+            base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5")),
+            max_delay=float(os.getenv("LLM_RETRY_MAX_DELAY", "8")),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _fits_deadline(self, delay: float) -> bool:
+        left = remaining()
+        return left is None or left > delay
+
+    def _admit(self, breaker: Optional[CircuitBreaker]):
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(f"Circuit for {breaker.name} is open")
+
+    @staticmethod
+    def _settle(breaker: Optional[CircuitBreaker], error: Optional[BaseException] = None):
+        """
+        Report how an admitted call ended. Every outcome ends a half-open trial.
+        """
+        if breaker is None:
+            return
+        if error is None:
+            breaker.record_success()
+        elif is_retryable(error) and not isinstance(error, DeadlineExceeded):
+            breaker.record_failure()
+        else:
+            # Client errors, deadlines and cancelled calls (e.g. a losing hedge)
+            # say nothing about the backend's health
+            breaker.release()
+
+    def _should_retry(self, error: BaseException, attempt: int) -> bool:
+        if isinstance(error, DeadlineExceeded):
+            return False
+        return is_retryable(error) and attempt < self.max_retries
+
+    def call(self, fn: Callable[[], Any], breaker: Optional[CircuitBreaker] = None) -> Any:
+        attempt = 0
+        while True:
+            self._admit(breaker)
+            try:
+                result = fn()
+            except BaseException as e:
+                self._settle(breaker, e)
+                if not isinstance(e, Exception):
+                    raise
+                delay = self.backoff(attempt)
+                retry = self._should_retry(e, attempt)
+                if not self._fits_deadline(delay if retry else 0):
+                    raise DeadlineExceeded("Deadline exceeded while calling LLM backend") from e
+                if not retry:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self._settle(breaker)
+            return result
+
+    async def acall(self, coro_fn: Callable[[], Awaitable[Any]],
+                    breaker: Optional[CircuitBreaker] = None) -> Any:
+        attempt = 0
+        while True:
+            self._admit(breaker)
+            try:
+                result = await coro_fn()
+            except BaseException as e:
+                # Includes CancelledError, so a cancelled trial call frees the breaker
+                self._settle(breaker, e)
+                if not isinstance(e, Exception):
+                    raise
+                delay = self.backoff(attempt)
+                retry = self._should_retry(e, attempt)
+                if not self._fits_deadline(delay if retry else 0):
+                    raise DeadlineExceeded("Deadline exceeded while calling LLM backend") from e
+                if not retry:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self._settle(breaker)
+            return result
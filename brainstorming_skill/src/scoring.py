@@ -1,12 +1,7 @@
-from dataclasses import dataclass
-from typing import Dict
-
-@dataclass
-class Thought:
-    id: str
-    summary: str
-    criteria_scores: Dict[str, float]  # 10 Kriterien
-    total_score: float
+import math
+from array import array
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, Mapping, Optional, Tuple
 
 # Weight distribution based on the original Brainstorm_LLM project
 WEIGHTS = {
@@ -22,6 +17,115 @@ WEIGHTS = {
     "UX": 0.06,                   # User Experience
 }
 
+# Shared criteria schema: every thought stores its scores in this order
+CRITERIA: Tuple[str, ...] = tuple(WEIGHTS)
+_CRITERION_INDEX = {name: i for i, name in enumerate(CRITERIA)}
+
+
+class CriteriaScores(MutableMapping):
+    """
+    Criteria scores of one thought as a fixed-order array('d') over CRITERIA,
+    with dict-style access. Unset criteria are NaN; criteria outside the schema
+    (only seen in invalid LLM output) go to a small side dict.
+    """
+    __slots__ = ("values", "_extra")
+
+    def __init__(self, scores: Mapping[str, float] = ()):
+        self.values = array("d", [math.nan]) * len(CRITERIA)
+        self._extra: Optional[Dict[str, float]] = None
+        self.update(scores)
+
+    def __getitem__(self, name: str) -> float:
+        index = _CRITERION_INDEX.get(name)
+        if index is None:
+            if self._extra is None:
+                raise KeyError(name)
+            return self._extra[name]
+        value = self.values[index]
+        if math.isnan(value):
+            raise KeyError(name)
+        return value
+
+    def __setitem__(self, name: str, value: float):
+        index = _CRITERION_INDEX.get(name)
+        if index is not None:
+            self.values[index] = value
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[name] = value
+
+    def __delitem__(self, name: str):
+        if name not in self:
+            raise KeyError(name)
+        index = _CRITERION_INDEX.get(name)
+        if index is not None:
+            self.values[index] = math.nan
+        else:
+            del self._extra[name]
+
+    def __iter__(self) -> Iterator[str]:
+        for name, value in zip(CRITERIA, self.values):
+            if not math.isnan(value):
+                yield name
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(not math.isnan(v) for v in self.values) + len(self._extra or ())
+
+    @property
+    def complete(self) -> bool:
+        """
+        All schema criteria set and nothing else, so `values` is the full score row.
+        """
+        return not self._extra and not any(math.isnan(v) for v in self.values)
+
+    def copy(self) -> "CriteriaScores":
+        scores = CriteriaScores()
+        scores.values = array("d", self.values)
+        scores._extra = dict(self._extra) if self._extra else None
+        return scores
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class Thought:
+    """
+    One scored solution approach. Slotted and without per-instance dict; the ten
+    criteria scores live in a CriteriaScores array over the shared CRITERIA.
+    """
+    __slots__ = ("id", "summary", "_criteria_scores", "total_score")
+
+    def __init__(self, id: str, summary: str, criteria_scores: Mapping[str, float], total_score: float):
+        self.id = id
+        self.summary = summary
+        self.criteria_scores = criteria_scores
+        self.total_score = total_score
+
+    @property
+    def criteria_scores(self) -> CriteriaScores:
+        return self._criteria_scores
+
+    @criteria_scores.setter
+    def criteria_scores(self, scores: Mapping[str, float]):
+        self._criteria_scores = scores if isinstance(scores, CriteriaScores) else CriteriaScores(scores)
+
+    def _fields(self) -> tuple:
+        return self.id, self.summary, self.criteria_scores, self.total_score
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"Thought(id={self.id!r}, summary={self.summary!r}, "
+                f"criteria_scores={self.criteria_scores!r}, total_score={self.total_score!r})")
+
 def calculate_total_score(thought: Thought) -> float:
     """
     Calculate the total score for a thought based on weighted criteria.
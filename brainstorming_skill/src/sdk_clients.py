@@ -0,0 +1,78 @@
+"""
+Lazily created, shared provider SDK clients.
+
+One client per provider, credential and base URL is built on first use and then
+reused, so calls neither pay the construction cost again nor mutate module-level
+SDK state such as ``openai.api_key``. Each client keeps its own connection pool.
+
+Async clients are bound to their event loop, like the pooled httpx clients (see
+http_pool): on the shared loop of event_loop.run_sync each is built once per
+process; a loop of your own must await aclose_async_sdk_clients() before it ends.
+"""
+import asyncio
+import hashlib
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+_clients: Dict[Tuple[str, str, Optional[str]], Any] = {}
+_async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def _client_key(provider: str, api_key: Optional[str], base_url: Optional[str]):
+    # Keep only a fingerprint of the credential in the registry
+    fingerprint = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+    return provider, fingerprint, base_url
+
+
+def _build_client(provider: str, api_key: Optional[str], base_url: Optional[str], use_async: bool):
+    # Retries are handled by resilience.RetryPolicy, so the SDKs must not retry on their own
+    if provider == "openai":
+        import openai
+        cls = openai.AsyncOpenAI if use_async else openai.OpenAI
+        return cls(api_key=api_key, base_url=base_url, max_retries=0)
+    if provider == "anthropic":
+        import anthropic
+        cls = anthropic.AsyncAnthropic if use_async else anthropic.Anthropic
+        return cls(api_key=api_key, base_url=base_url, max_retries=0)
+    raise ValueError(f"No SDK client for provider: {provider}")
+
+
+def get_sdk_client(provider: str, api_key: Optional[str], base_url: Optional[str] = None):
+    """
+    Return the shared synchronous SDK client for a provider and credential.
+    """
+    key = _client_key(provider, api_key, base_url)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _clients[key] = _build_client(provider, api_key, base_url, use_async=False)
+    return client
+
+
+def get_async_sdk_client(provider: str, api_key: Optional[str], base_url: Optional[str] = None):
+    """
+    Return the shared async SDK client for a provider and credential on the running
+    event loop. Async clients are bound to the loop they were created on.
+    """
+    loop = asyncio.get_running_loop()
+    key = _client_key(provider, api_key, base_url)
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            client = clients[key] = _build_client(provider, api_key, base_url, use_async=True)
+    return client
+
+
+async def aclose_async_sdk_clients():
+    """
+    Close the async SDK clients that belong to the running event loop.
+    """
+    with _lock:
+        clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.close()
@@ -1,14 +1,16 @@
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
-def execute_brainstorm_skill(inputs: Dict[str, Any], use_mock: bool = False) -> Dict[str, Any]:
+def execute_brainstorm_skill(inputs: Dict[str, Any], use_mock: bool = False,
+                             deadline_seconds: Optional[float] = None) -> Dict[str, Any]:
     """
     Execute the brainstorming skill with the given inputs.
     This function now uses the enhanced version with project management features.
+    deadline_seconds is the end-to-end budget for the run (default BRAINSTORM_DEADLINE_SECONDS).
     """
     # Import and use the enhanced version
     from ..enhanced_skills.integration import execute_brainstorm_skill_with_enhancements
-    return execute_brainstorm_skill_with_enhancements(inputs, use_mock)
+    return execute_brainstorm_skill_with_enhancements(inputs, use_mock, deadline_seconds=deadline_seconds)
 
 def generate_problem_statement(idea: str, context: str) -> str:
     """Generate the problem statement based on the idea and context."""
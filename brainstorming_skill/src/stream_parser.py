@@ -0,0 +1,106 @@
+"""
+Incremental JSON parsing for streamed LLM output.
+
+The parser is fed text chunks as they arrive and emits every object of the result
+array as soon as it closes, e.g. each entry of {"thoughts": [...]} or each
+element of a bare [...] relation list.
+"""
+import json
+from typing import Dict, Iterable, Iterator, List
+
+
+class JSONArrayStreamParser:
+    """
+    Emits the objects that are direct elements of the first array in the stream,
+    where that array is either the root value or a value of the root object
+    (restricted to the root object's `key` entry if given).
+    Anything before the first '{' or '[' (e.g. a Markdown fence) is ignored.
+    """
+    def __init__(self, key: str = None):
+        self.key = key
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._object_start = None
+        self._current_key = None
+        self._expect_key = False  # the next string of the root object is a key
+        self._string_start = None
+        self._target_depth = None
+        self._text = ""
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """
+        Consume a chunk of text and return the objects completed by it.
+        """
+        completed = []
+        base = len(self._text)
+        self._text += chunk
+        for offset, char in enumerate(chunk):
+            pos = base + offset
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._expect_key and self._stack == ["{"]:
+                        self._current_key = self._text[self._string_start + 1:pos]
+                        self._expect_key = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif char == "," and self._stack == ["{"]:
+                self._expect_key = True
+            elif char in "{[":
+                if not self._stack and self._target_depth is None and char == "[":
+                    self._target_depth = 1
+                elif (char == "[" and self._target_depth is None and len(self._stack) == 1
+                      and self._stack[0] == "{" and self.key in (None, self._current_key)):
+                    self._target_depth = 2
+                self._stack.append(char)
+                if self._stack == ["{"]:
+                    self._expect_key = True
+                if char == "{" and len(self._stack) == (self._target_depth or -1) + 1:
+                    self._object_start = pos
+            elif char in "}]":
+                if char == "}" and self._object_start is not None and len(self._stack) == self._target_depth + 1:
+                    item = self._decode(self._text[self._object_start:pos + 1])
+                    if item is not None:
+                        completed.append(item)
+                    self._object_start = None
+                if self._stack:
+                    self._stack.pop()
+                if char == "]" and self._target_depth is not None and len(self._stack) < self._target_depth:
+                    # The result array is closed; ignore anything that follows
+                    self._target_depth = 0
+
+        # Drop text that can no longer be part of a pending object
+        if self._object_start is None and not self._in_string:
+            self._text = ""
+        elif self._object_start is not None and self._object_start > 0:
+            if self._in_string:
+                self._string_start -= self._object_start
+            self._text = self._text[self._object_start:]
+            self._object_start = 0
+        return completed
+
+    @staticmethod
+    def _decode(text: str):
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        return item if isinstance(item, dict) else None
+
+
+def iter_stream_objects(chunks: Iterable[str], key: str = None) -> Iterator[Dict]:
+    """
+    Yield each array element object from a stream of text chunks as soon as it closes.
+    """
+    parser = JSONArrayStreamParser(key=key)
+    for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
@@ -0,0 +1,111 @@
+"""
+Structured JSON output: response schemas and a tolerant parser for LLM answers.
+
+Prompts that expect JSON run inside response_schema(), which makes the LLM
+clients request native structured output (Ollama `format`, OpenAI `json_schema`).
+parse_json_items() still repairs what slips through, e.g. Markdown fences,
+trailing commas or a generation that was cut off mid-array, and salvages every
+complete element instead of discarding the whole answer.
+"""
+import json
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from .scoring import WEIGHTS
+from .stream_parser import iter_stream_objects
+
+RELATIONS = ["ergänzt", "widerspricht", "abhängig_von", "kombinierbar", "besser_als"]
+
+_FENCE = re.compile(r"^```[a-zA-Z]*\s*|\s*```$")
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+_schema: ContextVar[Optional[Tuple[str, Dict]]] = ContextVar("llm_response_schema", default=None)
+
+
+def _object(properties: Dict[str, Dict]) -> Dict:
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def thoughts_schema() -> Dict:
+    """
+    Schema of the {"thoughts": [...]} answer, with one score per criterion in WEIGHTS.
+    """
+    scores = _object({name: {"type": "integer", "minimum": 1, "maximum": 10} for name in WEIGHTS})
+    thought = _object({
+        "id": {"type": "string"},
+        "title": {"type": "string"},
+        "summary": {"type": "string"},
+        "scores": scores,
+    })
+    return _object({"thoughts": {"type": "array", "items": thought}})
+
+
+def relations_schema() -> Dict:
+    """
+    Schema of the {"relations": [...]} answer of the relation classification.
+    """
+    relation = _object({
+        "from": {"type": "string"},
+        "to": {"type": "string"},
+        "relation": {"type": "string", "enum": RELATIONS},
+        "strength": {"type": "integer", "minimum": 1, "maximum": 5},
+    })
+    return _object({"relations": {"type": "array", "items": relation}})
+
+
+@contextmanager
+def response_schema(name: str, schema: Dict):
+    """
+    Request structured output matching `schema` for the LLM calls made inside the block.
+    """
+    token = _schema.set((name, schema))
+    try:
+        yield
+    finally:
+        _schema.reset(token)
+
+
+def current_schema() -> Optional[Tuple[str, Dict]]:
+    """
+    Return the (name, schema) requested for the current call, if any.
+    """
+    return _schema.get()
+
+
+def _items(data, key: Optional[str]) -> List[Dict]:
+    if isinstance(data, dict):
+        if key is not None:
+            data = data.get(key)
+        else:
+            data = next((value for value in data.values() if isinstance(value, list)), None)
+    if not isinstance(data, list):
+        return []
+    return [item for item in data if isinstance(item, dict)]
+
+
+def parse_json_items(raw: str, key: Optional[str] = None) -> List[Dict]:
+    """
+    Return the objects of the result array in an LLM answer, either a bare array
+    or the `key` entry of the root object. Broken JSON is repaired where possible;
+    otherwise every complete array element is salvaged.
+    """
+    text = _FENCE.sub("", raw.strip())
+    repaired = _TRAILING_COMMA.sub(r"\1", text)
+    for candidate in (text, repaired):
+        try:
+            return _items(json.loads(candidate), key)
+        except json.JSONDecodeError:
+            continue
+
+    # Truncated or surrounded by prose: keep every element that closed properly
+    salvaged = list(iter_stream_objects([repaired], key=key))
+    if salvaged:
+        print(f"JSON-Antwort war unvollständig, {len(salvaged)} Objekte gerettet")
+    return salvaged
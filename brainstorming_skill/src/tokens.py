@@ -0,0 +1,23 @@
+"""
+Cheap local token estimates for budgeting, without a tokenizer dependency.
+"""
+from typing import Dict, List
+
+# Rough average for mixed German/English prose and JSON
+CHARS_PER_TOKEN = 4
+# Per-message overhead for role markers and separators
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a piece of text.
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def estimate_message_tokens(messages: List[Dict]) -> int:
+    """
+    Estimate the prompt tokens of a chat message list.
+    """
+    return sum(estimate_tokens(m.get("content", "")) + MESSAGE_OVERHEAD_TOKENS for m in messages)
@@ -1,41 +1,99 @@
-import json
-import re
-from typing import List, Dict
-from .scoring import Thought, calculate_total_score, validate_criteria_scores
-from .llm import llm
+import os
+from typing import List, Dict, Iterator, Optional
+from .scoring import Thought
+from .batch_scoring import ScoreBatch, score_thoughts
+from .llm import get_llm
+from .stream_parser import iter_stream_objects
+from .deadline import has_time_for
+from .event_loop import run_sync
+from .usage import stage_scope
+from .structured import parse_json_items, response_schema, thoughts_schema
+from .prompts import initial_thoughts_messages, expansion_messages
+from .beam_search import beam_search
+from .near_duplicates import DEDUP_ENABLED, DEDUP_THRESHOLD
 
 MAX_DEPTH = 3
 BRANCHING_FACTOR = 4
+CHILDREN_PER_THOUGHT = 3
+
+# Expand parents with the LLM instead of synthetic score variations (TOT_LLM_EXPANSION)
+USE_LLM_EXPANSION = os.getenv("TOT_LLM_EXPANSION", "false").lower() in ("1", "true", "yes")
+# Parents of one level are expanded concurrently, at most this many at a time
+EXPANSION_CONCURRENCY = int(os.getenv("TOT_EXPANSION_CONCURRENCY", str(BRANCHING_FACTOR)))
+# Stream the initial thoughts into the beam search instead of waiting for the full answer
+STREAM_INITIAL = os.getenv("TOT_STREAM_INITIAL", "false").lower() in ("1", "true", "yes")
+# Serve a re-run of the same task its cached initial thoughts, although they are sampled
+CACHE_INITIAL = os.getenv("TOT_CACHE_INITIAL_THOUGHTS", "true").lower() in ("1", "true", "yes")
+
+# Number of best thoughts kept across all levels
+BEAM_WIDTH = int(os.getenv("TOT_BEAM_WIDTH", "6"))
+# Largest score gain a child is assumed to make over its parent; parents that cannot
+# beat the beam even with this gain are not expanded
+PRUNE_MARGIN = float(os.getenv("TOT_PRUNE_MARGIN", "1.0"))
+# Stop once a level raises the best score by no more than this
+MIN_IMPROVEMENT = float(os.getenv("TOT_MIN_IMPROVEMENT", "0.0"))
+
+def _initial_messages(task: str) -> List[Dict]:
+    # Shared system prompt and static instructions first, the task last (prefix caching)
+    return initial_thoughts_messages(task)
+
+
+def _has_thoughts(raw_json: str) -> bool:
+    # Only responses that parse are worth caching
+    return bool(parse_json_items(raw_json, key="thoughts"))
+
+
+def _repair_scores(scores) -> Optional[Dict]:
+    if not isinstance(scores, dict):
+        return None
+    # Repair scores that were emitted as numeric strings
+    try:
+        return {k: float(v) if isinstance(v, str) else v for k, v in scores.items()}
+    except ValueError:
+        return None
+
+
+def _build_thoughts(items: List[Dict]) -> List[Thought]:
+    """
+    Turn parsed thought objects into scored Thoughts, skipping invalid ones. All
+    items are validated and scored together as one score array.
+    """
+    candidates = []
+    for item in items:
+        scores = _repair_scores(item.get("scores"))
+        if scores is None or "id" not in item:
+            print(f"Invalid scores for thought {item.get('id')}, skipping...")
+        else:
+            candidates.append((item, scores))
+
+    batch = ScoreBatch([scores for _, scores in candidates])
+    thoughts = []
+    for (item, scores), valid, total in zip(candidates, batch.valid_mask(), batch.totals()):
+        if not valid:
+            print(f"Invalid scores for thought {item.get('id')}, skipping...")
+            continue
+        thoughts.append(Thought(
+            id=item["id"],
+            summary=f"{item.get('title', '')}\n\n{item.get('summary', '')}",
+            criteria_scores=scores,
+            total_score=float(total)
+        ))
+    return thoughts
+
+
+def _build_thought(item: Dict) -> Optional[Thought]:
+    """
+    Turn one parsed thought object into a scored Thought, or None if it is invalid.
+    """
+    thoughts = _build_thoughts([item])
+    return thoughts[0] if thoughts else None
 
-TOT_PROMPT = """
-Du bist ein brillanter Produkt- und System-Architekt.
-Aufgabe: {task}
-
-Generiere EXAKT 5 unterschiedliche, aber hochwertige Lösungsansätze (Thoughts).
-Jeder Thought muss enthalten:
-- Kurzüberschrift (z.B. "React Native + externe API")
-- 2–3 Sätze Beschreibung
-- Bewertung der 10 Kriterien (1–10):
-
-{criteria_list}
-
-Antworte NUR im folgenden JSON-Format:
-{{
-  "thoughts": [
-    {{
-      "id": "T1",
-      "title": "...",
-      "summary": "...",
-      "scores": {{"Zielerreichung": 9, "Machbarkeit": 8, ...}}
-    }}
-  ]
-}}
-"""
 
 def generate_initial_thoughts(task: str, use_mock: bool = False) -> List[Thought]:
     """
     Generate initial thoughts for a given task using the LLM.
     If use_mock is True, use dummy thoughts for testing without LLM calls.
+    See stream_initial_thoughts for the incremental variant.
     """
     if use_mock:
         # Return dummy thoughts for testing without LLM
@@ -127,111 +185,136 @@ def generate_initial_thoughts(task: str, use_mock: bool = False) -> List[Thought
             }
         ]
 
-        thoughts = []
-        for item in dummy_thoughts_data:
-            # Validate the scores before creating the Thought
-            if not validate_criteria_scores(item["scores"]):
-                print(f"Invalid scores for thought {item['id']}, skipping...")
-                continue
-
-            thought = Thought(
-                id=item["id"],
-                summary=f"{item['title']}\n\n{item.get('summary', '')}",
-                criteria_scores=item["scores"],
-                total_score=0
-            )
-            thought.total_score = calculate_total_score(thought)
-            thoughts.append(thought)
-
+        thoughts = _build_thoughts(dummy_thoughts_data)
         return sorted(thoughts, key=lambda x: x.total_score, reverse=True)[:6]
 
-    # Original implementation using LLM
-    criteria = "\n".join([f"- {k} (1–10)" for k in {"Zielerreichung": 0.15, "Machbarkeit": 0.12, "Aufwand": 0.12,
-                                                     "Wartbarkeit": 0.11, "Risiko": 0.11, "ROI": 0.10,
-                                                     "Innovation": 0.08, "Sicherheit": 0.08, "Team-Fit": 0.07, "UX": 0.06}.keys()])
-    prompt = TOT_PROMPT.format(task=task, criteria_list=criteria)
+    # Original implementation using LLM, constrained to the thoughts schema. The UI waits
+    # on this first call, so a slow backend gets a hedged duplicate (LLM_HEDGE_ENABLED)
+    with stage_scope("initial_thoughts"), response_schema("thoughts", thoughts_schema()):
+        raw_json = get_llm().complete(_initial_messages(task), temperature=0.8, hedge=True,
+                                      cache_if=_has_thoughts, cache_sampled=CACHE_INITIAL or None)
 
-    messages = [
-        {"role": "system", "content": "Du bist ein extrem präziser und objektiver Architekt."},
-        {"role": "user", "content": prompt}
-    ]
+    items = parse_json_items(raw_json, key="thoughts")
+    if not items:
+        print("Could not parse LLM response as JSON")
+        return []
 
-    raw_json = llm.complete(messages, temperature=0.8)
+    thoughts = _build_thoughts(items)
+    return sorted(thoughts, key=lambda x: x.total_score, reverse=True)[:6]
 
-    try:
-        data = json.loads(raw_json)
-    except json.JSONDecodeError:
-        # Fallback: extract JSON from Markdown
-        match = re.search(r"\{.*\}", raw_json, re.DOTALL)
-        if match:
-            try:
-                data = json.loads(match.group(0))
-            except json.JSONDecodeError:
-                print("Could not parse LLM response as JSON")
-                return []
-        else:
-            print("Could not find JSON in LLM response")
-            return []
 
-    thoughts = []
-    for item in data.get("thoughts", []):
-        # Validate the scores before creating the Thought
-        if not validate_criteria_scores(item["scores"]):
-            print(f"Invalid scores for thought {item['id']}, skipping...")
-            continue
+def stream_initial_thoughts(task: str) -> Iterator[Thought]:
+    """
+    Stream the initial LLM generation and yield each scored Thought as soon as
+    its object closes in the {"thoughts": [...]} array.
+    """
+    # The stream is consumed lazily, so stage and schema have to stay set while iterating
+    with stage_scope("initial_thoughts"), response_schema("thoughts", thoughts_schema()):
+        chunks = get_llm().stream(_initial_messages(task), temperature=0.8, hedge=True,
+                                  cache_if=_has_thoughts, cache_sampled=CACHE_INITIAL or None)
+        for item in iter_stream_objects(chunks, key="thoughts"):
+            thought = _build_thought(item)
+            if thought:
+                yield thought
 
-        thought = Thought(
-            id=item["id"],
-            summary=f"{item['title']}\n\n{item.get('summary', '')}",
-            criteria_scores=item["scores"],
+
+def _synthetic_children(parent: Thought, level: int) -> List[Thought]:
+    """
+    Derive child thoughts from a parent without an LLM call. The children are not
+    scored yet; expand_level scores the whole level at once.
+    """
+    children = []
+    for i in range(1, CHILDREN_PER_THOUGHT + 1):
+        child_summary = f"Weiterentwicklung von {parent.id}: Variante {i}\n\n{parent.summary}"
+
+        # Create a new thought based on the parent but with modifications
+        child_scores = parent.criteria_scores.copy()
+
+        # Make small variations to the scores to represent evolution
+        for criterion in child_scores:
+            # Slightly modify each score (±0.5 to ±1.5)
+            variation = (i - 2) * 0.5  # -1, 0, +1 for i=1,2,3
+            child_scores[criterion] = max(1, min(10, child_scores[criterion] + variation))
+
+        child = Thought(
+            id=f"{parent.id}-L{level+1}-{i}",
+            summary=child_summary,
+            criteria_scores=child_scores,
             total_score=0
         )
-        thought.total_score = calculate_total_score(thought)
-        thoughts.append(thought)
+        children.append(child)
+    return children
 
-    return sorted(thoughts, key=lambda x: x.total_score, reverse=True)[:6]
+
+def _llm_children(parent: Thought, level: int, raw_json: str) -> List[Thought]:
+    items = parse_json_items(raw_json, key="thoughts")[:CHILDREN_PER_THOUGHT]
+    children = _build_thoughts([dict(item, id=parent.id) for item in items])
+    for n, child in enumerate(children, 1):
+        # Child ids follow the tree position, whatever ids the LLM chose
+        child.id = f"{parent.id}-L{level+1}-{n}"
+    return children
 
 
-def tree_of_thoughts(task: str, depth: int = MAX_DEPTH, use_mock: bool = False) -> List[Thought]:
+def expand_level(task: str, parents: List[Thought], level: int, use_llm: bool = False) -> List[Thought]:
+    """
+    Expand every parent into child thoughts. With use_llm, all parents of the level
+    are expanded by concurrent LLM calls, so a level costs about one round trip;
+    a parent whose call fails or yields no valid child falls back to synthetic children.
+    """
+    if not use_llm:
+        return score_thoughts([child for parent in parents for child in _synthetic_children(parent, level)])
+
+    messages = [expansion_messages(task, parent.summary, CHILDREN_PER_THOUGHT) for parent in parents]
+    with stage_scope("expansion"), response_schema("thoughts", thoughts_schema()):
+        # The shared loop keeps its clients across levels; its tasks see the stage and schema
+        responses = run_sync(lambda: get_llm().acomplete_many(messages, temperature=0.7,
+                                                              max_concurrency=EXPANSION_CONCURRENCY,
+                                                              return_exceptions=True, cache_if=_has_thoughts))
+
+    children = []
+    for parent, raw in zip(parents, responses):
+        expanded = [] if isinstance(raw, BaseException) else _llm_children(parent, level, raw)
+        if not expanded:
+            reason = raw if isinstance(raw, BaseException) else "keine gültigen Varianten"
+            print(f"LLM-Erweiterung von {parent.id} fehlgeschlagen ({reason}) – verwende synthetische Varianten")
+            expanded = _synthetic_children(parent, level)
+        children.extend(expanded)
+    # Synthetic fallbacks are still unscored; score the level in one pass
+    return score_thoughts(children)
+
+
+def tree_of_thoughts(task: str, depth: int = MAX_DEPTH, use_mock: bool = False,
+                     llm_expansion: Optional[bool] = None, stream: Optional[bool] = None) -> List[Thought]:
     """
     Execute the Tree-of-Thoughts algorithm to generate and refine thoughts.
+    llm_expansion defaults to TOT_LLM_EXPANSION and is always off with mock data.
+    With stream (default TOT_STREAM_INITIAL), each initial thought is scored and
+    admitted to the beam as soon as its object closes in the LLM output.
     """
-    # Generate initial thoughts
-    thoughts = generate_initial_thoughts(task, use_mock=use_mock)
-    current_level = thoughts[:]
-
-    # Expand thoughts in a tree structure
-    for level in range(1, depth):
-        next_level = []
-        for parent in current_level[:BRANCHING_FACTOR]:
-            # Generate child thoughts based on the parent
-            for i in range(1, 4):
-                child_summary = f"Weiterentwicklung von {parent.id}: Variante {i}\n\n{parent.summary}"
-
-                # Create a new thought based on the parent but with modifications
-                child_scores = parent.criteria_scores.copy()
-
-                # Make small variations to the scores to represent evolution
-                for criterion in child_scores:
-                    # Slightly modify each score (±0.5 to ±1.5)
-                    variation = (i - 2) * 0.5  # -1, 0, +1 for i=1,2,3
-                    child_scores[criterion] = max(1, min(10, child_scores[criterion] + variation))
-
-                child = Thought(
-                    id=f"{parent.id}-L{level+1}-{i}",
-                    summary=child_summary,
-                    criteria_scores=child_scores,
-                    total_score=0
-                )
-                child.total_score = calculate_total_score(child)
-                next_level.append(child)
-
-        # Keep the best thoughts for the next level
-        current_level = sorted(next_level, key=lambda x: x.total_score, reverse=True)[:6]
-
-    # Return the best thoughts across all levels
-    all_thoughts = thoughts + current_level
-    return sorted(all_thoughts, key=lambda x: x.total_score, reverse=True)[:6]
+    if llm_expansion is None:
+        llm_expansion = USE_LLM_EXPANSION
+    if stream is None:
+        stream = STREAM_INITIAL
+
+    def should_continue(level: int) -> bool:
+        # Deeper levels are optional; stop refining once the request budget is used up
+        if not has_time_for(0):
+            print(f"Zeitbudget erschöpft – ToT stoppt nach Ebene {level}")
+            return False
+        return True
+
+    def expand(parents: List[Thought], level: int) -> List[Thought]:
+        return expand_level(task, parents, level, use_llm=llm_expansion and not use_mock)
+
+    # Generate initial thoughts, then refine the most promising ones level by level
+    if stream and not use_mock:
+        thoughts = stream_initial_thoughts(task)
+    else:
+        thoughts = generate_initial_thoughts(task, use_mock=use_mock)
+    return beam_search(thoughts, expand, depth=depth, width=BEAM_WIDTH, frontier_width=BRANCHING_FACTOR,
+                       margin=PRUNE_MARGIN, min_improvement=MIN_IMPROVEMENT,
+                       dedup_threshold=DEDUP_THRESHOLD if DEDUP_ENABLED else None,
+                       should_continue=should_continue)
 
 
 def tree_of_thoughts_live(task: str, use_mock: bool = False) -> List[Thought]:
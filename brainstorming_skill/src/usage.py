@@ -0,0 +1,147 @@
+"""
+Token, latency and cost accounting for LLM calls.
+
+Every completion records a CallUsage into the tracker of the current run (a
+context variable, so it follows threads started with copy_context and asyncio
+tasks). execute_brainstorm_skill attaches the aggregated summary to its result.
+"""
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+
+# USD per 1M tokens (input, output); local models cost nothing
+MODEL_PRICES = {
+    "gpt-4o-2024-11-20": (2.50, 10.00),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "claude-3-5-sonnet-20241022": (3.00, 15.00),
+}
+
+
+@dataclass
+class CallUsage:
+    provider: str
+    model: str
+    stage: str
+    prompt_tokens: int
+    completion_tokens: int
+    wall_time: float
+    time_to_first_token: Optional[float] = None
+    cached: bool = False
+    coalesced: bool = False  # shared the result of an identical in-flight call
+    estimated: bool = False  # token counts are local estimates, not provider numbers
+
+    @property
+    def cost(self) -> float:
+        if self.cached or self.coalesced or self.provider == "ollama":
+            return 0.0
+        price_in, price_out = MODEL_PRICES.get(self.model, (0.0, 0.0))
+        return (self.prompt_tokens * price_in + self.completion_tokens * price_out) / 1_000_000
+
+
+class UsageTracker:
+    """
+    Collects the calls of one run. Safe to share between threads.
+    """
+    def __init__(self):
+        self.calls: List[CallUsage] = []
+        self._lock = threading.Lock()
+
+    def record(self, usage: CallUsage):
+        with self._lock:
+            self.calls.append(usage)
+
+    def summary(self) -> Dict:
+        with self._lock:
+            calls = list(self.calls)
+
+        def aggregate(group: List[CallUsage]) -> Dict:
+            ttfts = [c.time_to_first_token for c in group if c.time_to_first_token is not None]
+            return {
+                "calls": len(group),
+                "cached_calls": sum(c.cached for c in group),
+                "coalesced_calls": sum(c.coalesced for c in group),
+                "prompt_tokens": sum(c.prompt_tokens for c in group),
+                "completion_tokens": sum(c.completion_tokens for c in group),
+                "wall_time": round(sum(c.wall_time for c in group), 3),
+                "max_time_to_first_token": round(max(ttfts), 3) if ttfts else None,
+                "cost_usd": round(sum(c.cost for c in group), 6),
+            }
+
+        by_stage: Dict[str, List[CallUsage]] = {}
+        by_model: Dict[str, List[CallUsage]] = {}
+        for call in calls:
+            by_stage.setdefault(call.stage, []).append(call)
+            by_model.setdefault(f"{call.provider}:{call.model}", []).append(call)
+
+        return {
+            "total": aggregate(calls),
+            "by_stage": {stage: aggregate(group) for stage, group in by_stage.items()},
+            "by_model": {model: aggregate(group) for model, group in by_model.items()},
+            "calls": [asdict(c) for c in calls],
+        }
+
+
+_tracker: ContextVar[Optional[UsageTracker]] = ContextVar("llm_usage_tracker", default=None)
+_stage: ContextVar[str] = ContextVar("llm_usage_stage", default="other")
+
+
+@contextmanager
+def usage_scope():
+    """
+    Track all LLM calls made inside the block; yields the UsageTracker.
+    """
+    tracker = UsageTracker()
+    token = _tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _tracker.reset(token)
+
+
+@contextmanager
+def stage_scope(stage: str):
+    """
+    Label the LLM calls made inside the block with a pipeline stage.
+    """
+    token = _stage.set(stage)
+    try:
+        yield
+    finally:
+        _stage.reset(token)
+
+
+def current_stage() -> str:
+    return _stage.get()
+
+
+def record_usage(usage: CallUsage):
+    tracker = _tracker.get()
+    if tracker is not None:
+        tracker.record(usage)
+
+
+def openai_usage(usage) -> Dict[str, Any]:
+    if usage is None:
+        return {}
+    return {"prompt_tokens": usage.prompt_tokens, "completion_tokens": usage.completion_tokens}
+
+
+def anthropic_usage(usage) -> Dict[str, Any]:
+    if usage is None:
+        return {}
+    return {"prompt_tokens": usage.input_tokens, "completion_tokens": usage.output_tokens}
+
+
+def ollama_usage(data: Dict) -> Dict[str, Any]:
+    stats = {
+        "prompt_tokens": data.get("prompt_eval_count"),
+        "completion_tokens": data.get("eval_count"),
+    }
+    # Durations are reported in nanoseconds; loading plus prompt evaluation is
+    # what the caller waits for before the first generated token
+    if "prompt_eval_duration" in data:
+        stats["time_to_first_token"] = (data.get("load_duration", 0) + data["prompt_eval_duration"]) / 1e9
+    return {k: v for k, v in stats.items() if v is not None}
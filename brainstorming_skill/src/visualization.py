@@ -51,7 +51,7 @@ def generate_thought_summary(thoughts):
         summary += f"{thought.summary}\n\n"
         summary += "Bewertung nach Kriterien:\n"
         for criterion, score in thought.criteria_scores.items():
-            summary += f"- {criterion}: {score}/10\n"
+            summary += f"- {criterion}: {score:g}/10\n"
         summary += "\n"
     return summary
 
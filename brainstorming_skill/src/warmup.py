@@ -0,0 +1,111 @@
+"""
+Ollama model warm-up and a background keeper for idle models.
+
+A cold local model pays its full load time on the first request. Models are
+therefore preloaded at app or worker start, and a daemon thread re-pings models
+that have been idle for a while so Ollama does not unload them.
+"""
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from ..config.ollama_config import OLLAMA_KEEP_ALIVE, OLLAMA_KEEPER_INTERVAL
+
+# Preloading has to load the weights, which can take much longer than a ping
+WARMUP_TIMEOUT = 120
+
+_last_used: Dict[Tuple[str, str], float] = {}
+_lock = threading.Lock()
+_keeper: Optional["ModelKeeper"] = None
+
+
+def mark_model_used(base_url: str, model: str):
+    """
+    Record that a model just served (or is about to serve) a request.
+    """
+    with _lock:
+        _last_used[(base_url.rstrip("/"), model)] = time.monotonic()
+
+
+def warm_up_model(base_url: str, model: str, keep_alive: str = OLLAMA_KEEP_ALIVE) -> bool:
+    """
+    Load a model into memory. Ollama loads the model for a /api/generate request
+    without a prompt and keeps it for keep_alive. The request asks for the same
+    num_ctx as real calls, otherwise the first real call would reload the model.
+    """
+    from .generation import stable_context_size
+    from .http_pool import get_session
+
+    base_url = base_url.rstrip("/")
+    try:
+        response = get_session(base_url).post(
+            f"{base_url}/api/generate",
+            json={"model": model, "keep_alive": keep_alive, "options": {"num_ctx": stable_context_size()}},
+            timeout=WARMUP_TIMEOUT,
+        )
+        response.raise_for_status()
+    except Exception as e:
+        print(f"⚠ Could not warm up {model} at {base_url}: {e}")
+        return False
+    mark_model_used(base_url, model)
+    return True
+
+
+class ModelKeeper(threading.Thread):
+    """
+    Daemon thread that pings every known model that has been idle for `interval` seconds.
+    """
+    def __init__(self, interval: float = OLLAMA_KEEPER_INTERVAL):
+        super().__init__(name="ollama-model-keeper", daemon=True)
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            now = time.monotonic()
+            with _lock:
+                idle = [key for key, used in _last_used.items() if now - used >= self.interval]
+            for base_url, model in idle:
+                warm_up_model(base_url, model)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+def start_model_keeper(interval: float = OLLAMA_KEEPER_INTERVAL) -> Optional[ModelKeeper]:
+    """
+    Start the process-wide keeper once; an interval of 0 disables it.
+    """
+    global _keeper
+    if interval <= 0:
+        return None
+    with _lock:
+        if _keeper is None or not _keeper.is_alive():
+            _keeper = ModelKeeper(interval)
+            _keeper.start()
+    return _keeper
+
+
+def warm_up_ollama(models: Optional[Iterable[Tuple[str, str]]] = None, background: bool = True):
+    """
+    Preload the Ollama models of the default LLM client (on every host of its endpoint
+    pool and of its fallback chain) or the given (base_url, model) pairs, then start the keeper.
+    With background=True startup is not blocked while the weights load.
+    """
+    if models is None:
+        from .llm import get_llm
+        models = [(url, b.model) for b in get_llm().backends if b.provider == "ollama" for url in b.ollama_urls]
+    models = list(dict.fromkeys(models))
+    if not models:
+        return
+
+    def run():
+        for base_url, model in models:
+            if warm_up_model(base_url, model):
+                print(f"✓ Ollama model {model} at {base_url} is loaded")
+        start_model_keeper()
+
+    if background:
+        threading.Thread(target=run, name="ollama-warmup", daemon=True).start()
+    else:
+        run()
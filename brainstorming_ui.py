@@ -6,6 +6,9 @@ from dotenv import load_dotenv
 
 # Importiere den Skill
 from brainstorming_skill.src.skill import execute_brainstorm_skill
+from brainstorming_skill.src.deadline import DeadlineExceeded
+from brainstorming_skill.src.warmup import warm_up_ollama
+from brainstorming_skill.config.ollama_config import OLLAMA_WARMUP
 
 app = Flask(__name__)
 app.secret_key = 'dein-geheimer-schluessel-hier'  # Sollte in einer echten Anwendung aus einer Umgebungsvariable geladen werden
@@ -135,12 +138,19 @@ def brainstorm_api():
         result = execute_brainstorm_skill(inputs, use_mock=False)
         
         return jsonify(result)
+    except DeadlineExceeded as e:
+        return jsonify({'error': str(e)}), 504
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
     # Stelle sicher, dass das Upload-Verzeichnis existiert
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+
+    # Lade das Ollama-Modell schon beim Start, damit die erste Anfrage nicht wartet.
+    # Unter einem WSGI-Server warm_up_ollama() im Worker-Start-Hook aufrufen (z.B. post_fork)
+    if OLLAMA_WARMUP:
+        warm_up_ollama()
     
     # Starte den Server
     print("Starte den Brainstorming UI Server...")
@@ -0,0 +1,32 @@
+"""
+Shared pytest fixtures.
+"""
+import sys
+import os
+
+import pytest
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.src.mock_llm_server import MockConfig, start_mock_server
+
+
+@pytest.fixture
+def mock_server():
+    """
+    Factory for mock LLM servers: mock_server(**config) starts one with a
+    MockConfig built from the keyword arguments. All servers started by a test
+    are shut down after it.
+    """
+    servers = []
+
+    def start(**config):
+        server = start_mock_server(MockConfig(**config))
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized NumPy scoring of thought batches.
+"""
+import sys
+import os
+
+import pytest
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.src.batch_scoring import ScoreBatch, rerank, score_thoughts
+from brainstorming_skill.src.scoring import WEIGHTS, calculate_total_score, validate_criteria_scores
+from brainstorming_skill.src.tree_of_thoughts import generate_initial_thoughts
+
+FULL = {name: 5 for name in WEIGHTS}
+
+
+def test_totals_match_scalar_scoring():
+    thoughts = generate_initial_thoughts("Eine App", use_mock=True)
+    expected = [calculate_total_score(t) for t in thoughts]
+    assert [t.total_score for t in score_thoughts(thoughts)] == pytest.approx(expected)
+
+
+def test_valid_mask_matches_scalar_validation():
+    cases = [
+        FULL,
+        dict(FULL, UX=11),
+        dict(FULL, Risiko=0.5),
+        {name: 5 for name in list(WEIGHTS)[:9]},
+        dict(FULL, Extra=5),
+        dict(FULL, UX=None),
+    ]
+    mask = ScoreBatch(cases).valid_mask()
+    assert mask.tolist() == [True, False, False, False, False, False]
+    assert mask[:5].tolist() == [validate_criteria_scores(c) for c in cases[:5]]
+
+
+def test_rerank_under_alternative_weights_keeps_stored_totals():
+    thoughts = generate_initial_thoughts("Eine App", use_mock=True)
+    totals = [t.total_score for t in thoughts]
+    innovative = rerank(thoughts, {"Innovation": 1.0}, top=2)
+    assert [t.criteria_scores["Innovation"] for t in innovative] == [10, 7]
+    assert [t.total_score for t in thoughts] == totals
+
+    with pytest.raises(ValueError):
+        rerank(thoughts, {"Unbekannt": 1.0})
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for the heap-bounded beam search behind Tree-of-Thoughts.
+"""
+import sys
+import os
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.src.beam_search import Beam, beam_search
+from brainstorming_skill.src.scoring import Thought
+from brainstorming_skill.src.tree_of_thoughts import BEAM_WIDTH, tree_of_thoughts
+
+
+def _thought(id, score):
+    return Thought(id=id, summary=id, criteria_scores={}, total_score=score)
+
+
+def test_beam_keeps_best_and_prefers_earlier_on_ties():
+    beam = Beam(2)
+    assert beam.push(_thought("a", 5))
+    assert beam.push(_thought("b", 7))
+    assert not beam.push(_thought("c", 5))
+    assert beam.push(_thought("d", 6))
+    assert beam.threshold() == 6
+    assert [t.id for t in beam.best()] == ["b", "d"]
+
+
+def test_hopeless_parents_are_not_expanded():
+    expanded = []
+
+    def expand(parents, level):
+        expanded.extend(p.id for p in parents)
+        return [_thought(f"{p.id}-{level}", p.total_score + 0.5) for p in parents]
+
+    initial = [_thought("T1", 9), _thought("T2", 8.8), _thought("T3", 5)]
+    best = beam_search(initial, expand, depth=3, width=2, frontier_width=3, margin=1.0)
+    assert "T3" not in expanded
+    assert [t.id for t in best] == ["T1-1-2", "T2-1-2"]
+
+
+def test_search_stops_when_a_level_brings_no_improvement():
+    levels = []
+
+    def expand(parents, level):
+        levels.append(level)
+        return [_thought(f"{p.id}-{level}", p.total_score - 1) for p in parents]
+
+    beam_search([_thought("T1", 9)], expand, depth=5, width=3, frontier_width=1, margin=2.0)
+    assert levels == [1]
+
+
+def test_tree_of_thoughts_returns_beam_best_first():
+    result = tree_of_thoughts("Eine App für Pflanzenpflege", use_mock=True)
+    scores = [t.total_score for t in result]
+    assert 0 < len(result) <= BEAM_WIDTH
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_streamed_thoughts_are_admitted_while_they_arrive(monkeypatch):
+    events = []
+    push = Beam.push
+    monkeypatch.setattr(Beam, "push", lambda self, t: events.append(f"push {t.id}") or push(self, t))
+
+    def stream():
+        for thought in (_thought("T1", 7), _thought("T2", 8)):
+            events.append(f"yield {thought.id}")
+            yield thought
+
+    best = beam_search(stream(), lambda parents, level: [], depth=1, width=2, frontier_width=2)
+    assert events == ["yield T1", "push T1", "yield T2", "push T2"]
+    assert [t.id for t in best] == ["T2", "T1"]
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for single-flight coalescing of identical LLM requests.
+"""
+import sys
+import os
+import asyncio
+import threading
+import time
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+import pytest
+
+from brainstorming_skill.src.coalesce import SingleFlight
+from brainstorming_skill.src.deadline import DeadlineExceeded, deadline_scope
+
+
+def test_concurrent_identical_calls_share_one_upstream_call():
+    flight = SingleFlight()
+    calls = []
+
+    def upstream():
+        calls.append(1)
+        time.sleep(0.1)
+        return "thoughts"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("key", upstream))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == ["thoughts"] * 8
+    assert flight.in_flight() == 0
+
+
+def test_errors_are_shared_and_not_cached():
+    flight = SingleFlight()
+
+    def failing():
+        raise RuntimeError("ollama down")
+
+    try:
+        flight.do("key", failing)
+        assert False, "expected RuntimeError"
+    except RuntimeError:
+        pass
+    assert flight.do("key", lambda: "ok") == "ok"
+
+
+def test_async_calls_are_coalesced():
+    flight = SingleFlight()
+    calls = []
+
+    async def upstream():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "thoughts"
+
+    async def run():
+        return await asyncio.gather(*(flight.ado("key", upstream) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["thoughts"] * 5
+    assert len(calls) == 1
+
+
+def test_follower_waits_only_until_its_own_deadline():
+    flight = SingleFlight()
+    leader = threading.Thread(target=lambda: flight.do("key", lambda: time.sleep(0.5) or "spät"))
+    leader.start()
+    time.sleep(0.05)
+    start = time.monotonic()
+    with deadline_scope(0.1), pytest.raises(DeadlineExceeded):
+        flight.do("key", lambda: "nie")
+    assert time.monotonic() - start < 0.3
+    leader.join()
+
+
+def test_follower_takes_over_when_the_leader_ran_out_of_budget():
+    flight = SingleFlight()
+    shared = []
+
+    def leader_call():
+        time.sleep(0.1)
+        raise DeadlineExceeded("Leader-Budget erschöpft")
+
+    def lead():
+        with pytest.raises(DeadlineExceeded):
+            flight.do("key", leader_call)
+
+    leader = threading.Thread(target=lead)
+    leader.start()
+    time.sleep(0.02)
+    assert flight.do("key", lambda: "eigene Antwort", on_shared=shared.append) == "eigene Antwort"
+    assert shared == []
+    leader.join()
+
+
+def test_async_follower_is_bounded_and_reports_shared_results():
+    flight = SingleFlight()
+    shared = []
+
+    async def upstream():
+        await asyncio.sleep(0.3)
+        return "thoughts"
+
+    async def follow_with_budget():
+        with deadline_scope(0.05):
+            return await flight.ado("key", upstream)
+
+    async def run():
+        leader = asyncio.ensure_future(flight.ado("key", upstream))
+        await asyncio.sleep(0)
+        with pytest.raises(DeadlineExceeded):
+            await follow_with_budget()
+        result = await flight.ado("key", upstream, on_shared=shared.append)
+        return result, await leader
+
+    assert asyncio.run(run()) == ("thoughts", "thoughts")
+    assert shared == ["thoughts"]
+    assert flight.in_flight() == 0
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for the slotted, array-backed Thought representation.
+"""
+import sys
+import os
+import pickle
+
+import pytest
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.src.batch_scoring import ScoreBatch
+from brainstorming_skill.src.scoring import CRITERIA, CriteriaScores, Thought, calculate_total_score
+
+SCORES = {name: i + 1 for i, name in enumerate(reversed(CRITERIA))}
+
+
+def test_thought_keeps_dict_style_criteria_access():
+    thought = Thought(id="T1", summary="Ansatz", criteria_scores=SCORES, total_score=0)
+    assert not hasattr(thought, "__dict__")
+    assert dict(thought.criteria_scores) == SCORES
+    assert list(thought.criteria_scores) == list(CRITERIA)
+    assert thought.criteria_scores["UX"] == 1
+
+    child_scores = thought.criteria_scores.copy()
+    child_scores["UX"] = 7.5
+    assert thought.criteria_scores["UX"] == 1
+    assert Thought(id="T1-L2-1", summary="", criteria_scores=child_scores, total_score=0).criteria_scores["UX"] == 7.5
+
+    thought.total_score = calculate_total_score(thought)
+    assert pickle.loads(pickle.dumps(thought)) == thought
+
+
+def test_partial_and_unknown_criteria():
+    scores = CriteriaScores({"UX": 5, "Extra": 3})
+    assert len(scores) == 2 and "Extra" in scores and "ROI" not in scores
+    with pytest.raises(KeyError):
+        scores["ROI"]
+    del scores["Extra"]
+    assert dict(scores) == {"UX": 5}
+    assert not scores.complete
+
+
+def test_batch_reads_score_rows_directly():
+    thoughts = [Thought(id=f"T{i}", summary="", criteria_scores={n: i for n in CRITERIA}, total_score=0)
+                for i in range(1, 4)]
+    batch = ScoreBatch.from_thoughts(thoughts)
+    assert batch.scores.shape == (3, len(CRITERIA))
+    assert batch.totals().tolist() == pytest.approx([calculate_total_score(t) for t in thoughts])
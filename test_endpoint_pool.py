@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for load balancing across several Ollama hosts.
+"""
+import sys
+import os
+import asyncio
+
+import pytest
+import requests
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.src.endpoint_pool import EndpointPool, model_available
+from brainstorming_skill.src.event_loop import run_sync
+from brainstorming_skill.src.llm import LLMClient
+
+MESSAGES = [{"role": "user", "content": "Eine App für Pflanzenpflege"}]
+
+
+@pytest.fixture
+def servers(mock_server):
+    return [mock_server(latency=0.05, seed=i) for i in range(2)]
+
+
+def test_least_outstanding_picks_idle_endpoint():
+    pool = EndpointPool(["http://a", "http://b"], "m", probe_interval=0)
+    with pool.endpoint() as first:
+        with pool.endpoint() as second:
+            assert {first, second} == {"http://a", "http://b"}
+
+
+def test_model_availability_accepts_implicit_latest_tag():
+    assert model_available("llama3.2", ["llama3.2:latest"])
+    assert not model_available("llama3.2:8b", ["llama3.2:latest"])
+
+
+def test_concurrent_requests_use_every_host(servers, monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    monkeypatch.setenv("LLM_COALESCE_ENABLED", "false")
+    client = LLMClient(provider="ollama", ollama_url=",".join(s.url for s in servers))
+    asyncio.run(client.acomplete_many([MESSAGES] * 8, max_concurrency=4))
+    assert all(s.stats["requests"] >= 2 for s in servers)
+
+
+def test_default_in_flight_cap_scales_with_the_pool(mock_server, monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    monkeypatch.setenv("LLM_COALESCE_ENABLED", "false")
+    monkeypatch.delenv("LLM_MAX_IN_FLIGHT", raising=False)
+    monkeypatch.delenv("LLM_MAX_IN_FLIGHT_OLLAMA", raising=False)
+    hosts = [mock_server(latency=0.3, seed=i) for i in range(3)]
+    client = LLMClient(provider="ollama", ollama_url=",".join(s.url for s in hosts), fallback_chain="")
+    run_sync(lambda: client.acomplete_many([MESSAGES] * 12, max_concurrency=12))
+    assert [s.stats["peak_in_flight"] for s in hosts] == [4, 4, 4]
+
+
+def test_failing_host_is_ejected_and_readmitted_by_probe(servers):
+    broken, good = servers
+    broken.config.error_rate = 1.0
+    pool = EndpointPool([broken.url, good.url], broken.config.model, eject_after=2, probe_interval=0)
+    for _ in range(6):
+        try:
+            with pool.endpoint() as url:
+                requests.post(f"{url}/api/chat", json={"messages": MESSAGES, "stream": False}).raise_for_status()
+        except requests.HTTPError:
+            pass
+    assert pool.healthy_urls() == [good.url]
+
+    broken.config.error_rate = 0.0
+    pool.probe_all()
+    assert pool.healthy_urls() == [broken.url, good.url]
+
+    pool.model = "nicht-vorhanden:1b"
+    pool.probe_all()
+    assert pool.healthy_urls() == []
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Tests for per-stage generation profiles and Ollama context sizing.
+"""
+import sys
+import os
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.config.ollama_config import GENERATION_PROFILES
+from brainstorming_skill.src.generation import context_size, ollama_options, profile_for
+from brainstorming_skill.src.llm import LLMClient
+from brainstorming_skill.src.usage import stage_scope
+
+
+def test_context_size_uses_power_of_two_buckets():
+    assert context_size(100, 1024) == 2048
+    assert context_size(2000, 1536) == 4096
+    assert context_size(50000, 2048, max_ctx=16384) == 16384
+
+
+def test_ollama_payload_carries_stage_options():
+    client = LLMClient(provider="ollama")
+    messages = [{"role": "user", "content": "x" * 12000}]
+    with stage_scope("relations"):
+        options = client._ollama_payload(messages, 0.3)["options"]
+    assert options == {"temperature": 0.3, "top_p": 0.9, "num_predict": profile_for("relations").max_tokens,
+                       "num_ctx": 8192}
+    assert "temperature" not in client._ollama_payload(messages, 0.3)
+    assert profile_for("unbekannt") == profile_for("other")
+
+
+def test_num_ctx_stays_the_same_across_stages():
+    # A changed num_ctx makes Ollama reload the model; only num_predict follows the stage
+    messages = [{"role": "user", "content": "x" * 2000}]
+    options = []
+    for stage in GENERATION_PROFILES:
+        with stage_scope(stage):
+            options.append(ollama_options(messages, 0.7))
+    assert len({o["num_ctx"] for o in options}) == 1
+    assert len({o["num_predict"] for o in options}) > 1
+    oversized = [{"role": "user", "content": "x" * 40000}]
+    assert ollama_options(oversized, 0.7)["num_ctx"] > options[0]["num_ctx"]
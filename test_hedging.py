@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for hedged LLM requests against a slow replica.
+"""
+import sys
+import os
+import asyncio
+import time
+
+import pytest
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.src import http_pool
+from brainstorming_skill.src.event_loop import background_loop
+from brainstorming_skill.src.hedging import HedgePolicy, LatencyTracker
+from brainstorming_skill.src.llm import LLMClient
+
+MESSAGES = [{"role": "user", "content": "Eine App für Pflanzenpflege"}]
+
+
+@pytest.fixture
+def client(mock_server, monkeypatch):
+    slow = mock_server(latency=3.0)
+    fast = mock_server(latency=0.05)
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    client = LLMClient(provider="ollama", ollama_url=f"{slow.url},{fast.url}")
+    client.hedge_policy = HedgePolicy(enabled=True, default_delay=0.3)
+    return client
+
+
+def test_delay_follows_observed_quantile():
+    tracker = LatencyTracker()
+    policy = HedgePolicy(enabled=True, min_samples=10, default_delay=7.0, min_delay=0.5)
+    key = ("ollama:m@u", "initial_thoughts", "complete")
+    assert policy.delay(key, tracker) == 7.0
+    for i in range(1, 101):
+        tracker.record(key, i / 10)
+    assert policy.delay(key, tracker) == 9.6
+
+
+def test_hedged_complete_and_stream_avoid_the_slow_replica(client):
+    for _ in range(3):
+        start = time.monotonic()
+        assert client.complete(MESSAGES, hedge=True)
+        assert time.monotonic() - start < 2.0
+
+        start = time.monotonic()
+        assert "".join(client.stream(MESSAGES, hedge=True))
+        assert time.monotonic() - start < 2.0
+
+
+def test_hedged_complete_inside_a_running_loop_releases_the_loser(client):
+    async def call_from_async_code():
+        # A blocking call from a coroutine, e.g. a sync helper used by an async handler
+        return client.complete(MESSAGES, hedge=True)
+
+    for _ in range(4):
+        assert asyncio.run(call_from_async_code())
+        # The cancelled request has given its endpoint slot back before complete() returns
+        assert [e.outstanding for e in client.ollama_pool.endpoints] == [0, 0]
+    # The shared event loop keeps its pooled HTTP clients between calls
+    clients = dict(http_pool._async_clients[background_loop()])
+    assert set(client.ollama_pool.urls) <= set(clients)
+    assert client.complete(MESSAGES, hedge=True)
+    assert http_pool._async_clients[background_loop()] == clients
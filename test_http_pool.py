@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the pooled HTTP sessions and async clients and the shared event loop.
+"""
+import sys
+import os
+import asyncio
+from contextvars import ContextVar
+
+import pytest
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.src.event_loop import run_sync
+from brainstorming_skill.src.http_pool import aclose_async_clients, get_async_client, get_session
+from brainstorming_skill.src.llm import LLMClient
+
+URL = "http://127.0.0.1:9"
+stage = ContextVar("stage", default=None)
+
+
+def test_session_is_shared_per_backend_url():
+    session = get_session("http://127.0.0.1:8/", pool_size=3, keep_alive=False)
+    assert get_session("http://127.0.0.1:8") is session
+    assert session.get_adapter("http://127.0.0.1:8")._pool_maxsize == 3
+    assert session.headers["Connection"] == "close"
+
+
+def test_completions_reuse_one_kept_alive_connection(mock_server, monkeypatch):
+    server = mock_server(latency=0.01)
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    client = LLMClient(provider="ollama", ollama_url=server.url, fallback_chain="")
+    for i in range(3):
+        assert client.complete([{"role": "user", "content": f"Aufgabe {i}"}])
+    pools = get_session(server.url).get_adapter(server.url).poolmanager.pools
+    assert [pool.num_connections for pool in pools._container.values()] == [1]
+
+
+def test_shared_loop_reuses_its_client_and_sees_the_callers_context():
+    pytest.importorskip("httpx")
+
+    async def lookup():
+        return get_async_client(URL), stage.get()
+
+    token = stage.set("expansion")
+    try:
+        first, seen = run_sync(lookup)
+        second, _ = run_sync(lookup)
+    finally:
+        stage.reset(token)
+    assert first is second and not first.is_closed
+    assert seen == "expansion"
+
+
+def test_own_loop_closes_its_clients_before_it_ends():
+    pytest.importorskip("httpx")
+
+    async def own_loop():
+        client = get_async_client(URL)
+        await aclose_async_clients()
+        return client
+
+    assert asyncio.run(own_loop()).is_closed
+
+
+def test_run_sync_refuses_to_block_its_own_loop():
+    async def nested():
+        return run_sync(lambda: asyncio.sleep(0))
+
+    with pytest.raises(RuntimeError):
+        run_sync(nested)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Import-time budget checks, measured with `python -X importtime`.
+"""
+import sys
+import os
+import subprocess
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time budgets in microseconds
+PACKAGE_IMPORT_BUDGET_US = 50_000
+LLM_IMPORT_BUDGET_US = 150_000
+
+HEAVY_MODULES = ("networkx", "requests", "openai", "anthropic", "httpx")
+
+
+def measure_import(module: str):
+    """
+    Import a module in a fresh interpreter and return (cumulative_us, imported module names).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, cumulative_us, name = [part.strip() for part in line.replace("import time:", "|").split("|")]
+        imported.add(name)
+        if name == module:
+            cumulative = int(cumulative_us)
+    return cumulative, imported
+
+
+def test_package_import_is_lazy():
+    cumulative, imported = measure_import("brainstorming_skill.src")
+    assert cumulative is not None
+    assert cumulative < PACKAGE_IMPORT_BUDGET_US, f"import took {cumulative} us"
+    assert not [m for m in imported if m.split(".")[0] in HEAVY_MODULES]
+
+
+def test_llm_module_defers_clients_and_http_stack():
+    cumulative, imported = measure_import("brainstorming_skill.src.llm")
+    assert cumulative < LLM_IMPORT_BUDGET_US, f"import took {cumulative} us"
+    assert not [m for m in imported if m.split(".")[0] in HEAVY_MODULES]
+
+
+def test_lazy_attributes_resolve():
+    sys.path.insert(0, PROJECT_ROOT)
+    import brainstorming_skill.src as package
+    from brainstorming_skill.src import OllamaClient, execute_brainstorm_skill
+
+    assert callable(execute_brainstorm_skill)
+    assert OllamaClient.__name__ == "OllamaClient"
+    assert set(package.__all__) <= set(dir(package))
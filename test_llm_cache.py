@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent LLM response cache.
+"""
+import sys
+import os
+import time
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.src import llm as llm_module
+from brainstorming_skill.src.cache import ResponseCache, make_cache_key
+from brainstorming_skill.src.ollama_context import ollama_context_scope
+from brainstorming_skill.src.llm import LLMClient
+from brainstorming_skill.src.tree_of_thoughts import generate_initial_thoughts
+
+MESSAGES = [{"role": "user", "content": "Eine App für Pflanzenpflege"}]
+
+
+def test_cache_key_is_content_addressed():
+    key = make_cache_key("ollama", "llama3.2:latest", MESSAGES, 0.8)
+    assert key == make_cache_key("ollama", "llama3.2:latest", [dict(MESSAGES[0])], 0.8)
+    assert key != make_cache_key("ollama", "llama3.2:latest", MESSAGES, 0.3)
+    assert key != make_cache_key("openai", "llama3.2:latest", MESSAGES, 0.8)
+
+
+def test_cache_lru_eviction(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    time.sleep(0.01)
+    assert cache.get("a") == "A"  # "a" is now more recently used than "b"
+    cache.set("c", "C")
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+
+
+def test_cache_ttl_expiry(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite3"), ttl=0.5)
+    cache.set("a", "A")
+    assert cache.get("a") == "A"
+    time.sleep(0.6)
+    assert cache.get("a") is None
+
+
+def test_client_serves_hits_and_honours_bypass(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setenv("LLM_CACHE_SAMPLED", "true")
+    client = LLMClient(provider="ollama")
+    calls = []
+
+    def fake_complete(messages, temperature):
+        calls.append(messages)
+        return f"antwort {len(calls)}"
+
+    client._complete = fake_complete
+    assert client.complete(MESSAGES, temperature=0.8) == "antwort 1"
+    assert client.complete(MESSAGES, temperature=0.8) == "antwort 1"
+    assert client.complete(MESSAGES, temperature=0.8, use_cache=False) == "antwort 2"
+    assert len(calls) == 2
+
+
+def test_sampled_unparsable_and_chained_responses_are_not_reused(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("LLM_CACHE_PATH", "~/cache.sqlite3")
+    client = LLMClient(provider="ollama")
+    answers = iter(["kaputt", "ok 1", "ok 2", "ok 3", "ok 4"])
+    client._complete = lambda messages, temperature: next(answers)
+
+    assert client.cache.path == str(tmp_path / "cache.sqlite3")
+    # Sampled completions bypass the cache unless LLM_CACHE_SAMPLED is set
+    assert client.complete(MESSAGES, temperature=0.8) == "kaputt"
+    assert client.complete(MESSAGES, temperature=0.8) == "ok 1"
+    # Deterministic ones are only stored once the caller accepts them
+    assert client.complete(MESSAGES, temperature=0, cache_if=lambda raw: raw.startswith("ok")) == "ok 2"
+    assert client.complete(MESSAGES, temperature=0) == "ok 2"
+
+    with ollama_context_scope(enabled=True) as chain:
+        chain.update(client.model, [1, 2, 3])
+        assert client.complete(MESSAGES, temperature=0) == "ok 3"
+
+
+def test_rerun_of_a_task_serves_initial_thoughts_from_the_cache(tmp_path, mock_server, monkeypatch):
+    server = mock_server(latency=0.3)
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.delenv("LLM_CACHE_ENABLED", raising=False)
+    monkeypatch.delenv("LLM_CACHE_SAMPLED", raising=False)
+    monkeypatch.setattr(llm_module, "_default_client", LLMClient(provider="ollama", ollama_url=server.url,
+                                                                 fallback_chain=""))
+    first = generate_initial_thoughts("Eine App für Pflanzenpflege")
+    start = time.monotonic()
+    again = generate_initial_thoughts("Eine App für Pflanzenpflege")
+    assert time.monotonic() - start < 0.2
+    assert [t.summary for t in again] == [t.summary for t in first]
+    assert server.stats["requests"] == 1
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for the local mock LLM server, driven through the real HTTP client paths.
+"""
+import sys
+import os
+import asyncio
+import json
+
+import pytest
+import requests
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.src.llm import LLMClient
+from brainstorming_skill.src.relation_batcher import RelationBatch
+from brainstorming_skill.src.scoring import Thought
+from brainstorming_skill.src.tree_of_thoughts import _initial_messages, _build_thought
+from brainstorming_skill.src.structured import parse_json_items
+
+
+@pytest.fixture
+def server(mock_server):
+    return mock_server(latency=0.01, seed=1)
+
+
+@pytest.fixture
+def client(server, monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    return LLMClient(provider="ollama", ollama_url=server.url)
+
+
+def test_ollama_chat_returns_valid_thoughts(client):
+    raw = client.complete(_initial_messages("Eine App für Pflanzenpflege"))
+    thoughts = [_build_thought(item) for item in parse_json_items(raw, key="thoughts")]
+    assert len(thoughts) == 5 and all(thoughts)
+
+
+def test_streaming_and_async_paths_answer_relation_prompts(client):
+    batch = RelationBatch()
+    batch.thoughts = [Thought(id=f"T{i}", summary="x", criteria_scores={}, total_score=0) for i in (1, 2, 3)]
+    batch.pairs = [("T1", "T2"), ("T1", "T3")]
+
+    streamed = "".join(client.stream(batch.messages(), temperature=0.3))
+    assert [(r["from"], r["to"]) for r in json.loads(streamed)["relations"]] == batch.pairs
+    answers = asyncio.run(client.acomplete_many([batch.messages()] * 3, temperature=0.3))
+    assert all(json.loads(a)["relations"] for a in answers)
+
+
+def test_tags_openai_shape_and_injected_errors(server):
+    assert requests.get(f"{server.url}/api/tags").json()["models"][0]["name"] == server.config.model
+
+    body = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "json"}]}
+    resp = requests.post(f"{server.url}/v1/chat/completions", json=body).json()
+    assert "thoughts" in json.loads(resp["choices"][0]["message"]["content"])
+    assert resp["usage"]["completion_tokens"] > 0
+
+    server.config.error_rate = 1.0
+    assert requests.post(f"{server.url}/api/chat", json=body).status_code == 503
+    assert server.stats["errors"] == 1
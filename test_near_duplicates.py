@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for MinHash near-duplicate detection of thoughts.
+"""
+import sys
+import os
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.src.beam_search import Beam
+from brainstorming_skill.src.near_duplicates import (
+    DEDUP_THRESHOLD, NearDuplicateIndex, collapse_near_duplicates, minhash, similarity
+)
+from brainstorming_skill.src.scoring import Thought
+from brainstorming_skill.src.tree_of_thoughts import expand_level, generate_initial_thoughts, tree_of_thoughts
+
+BASE = "Mobile Anwendung mit React Native, die externe Plant.id API für die Pflanzenkennung nutzt"
+
+
+def _thought(id, summary, score):
+    return Thought(id=id, summary=summary, criteria_scores={}, total_score=score)
+
+
+def test_index_finds_rewordings_but_not_other_approaches():
+    index = NearDuplicateIndex(threshold=0.5)
+    index.add("T1", minhash(BASE))
+    index.add("T2", minhash("Chat-basierter Ansatz, Benutzer senden Fotos über WhatsApp/Telegram"))
+    assert index.find(minhash(BASE + ", mit Offline-First Ansatz")) == "T1"
+    assert index.find(minhash("Progressive Web App mit TensorFlow.js direkt im Browser")) is None
+    index.remove("T1")
+    assert index.find(minhash(BASE)) is None
+    assert similarity(minhash(BASE), minhash(BASE)) == 1.0
+
+
+def test_distinct_ideas_survive_the_default_threshold():
+    ideas = [
+        "Eine App erinnert Nutzer per Push-Nachricht an das Gießen ihrer Zimmerpflanzen",
+        "Ein Bodensensor misst die Feuchtigkeit und meldet sich, wenn die Pflanze Wasser braucht",
+        "Eine Community-Plattform, auf der Hobbygärtner Ableger tauschen und Pflegetipps teilen",
+        "Ein Abo-Service liefert monatlich passenden Dünger und Erde für die eigenen Pflanzen",
+        "Eine Bilderkennung diagnostiziert Schädlinge und Krankheiten anhand eines Handyfotos",
+    ]
+    thoughts = [_thought(f"T{i}", idea, 5) for i, idea in enumerate(ideas, 1)]
+    assert collapse_near_duplicates(thoughts, DEDUP_THRESHOLD) == thoughts
+    reworded = _thought("T6", ideas[0].replace("Zimmerpflanzen", "Pflanzen im Haus"), 4)
+    assert collapse_near_duplicates(thoughts + [reworded], DEDUP_THRESHOLD) == thoughts
+
+
+def test_synthetic_children_collapse_to_the_best_variant():
+    thoughts = generate_initial_thoughts("Eine App", use_mock=True)
+    children = expand_level("Eine App", thoughts, 1)
+    collapsed = collapse_near_duplicates(thoughts + children)
+    assert len(collapsed) == len(thoughts)
+    assert all(t.id.endswith("-L2-3") for t in collapsed)
+
+
+def test_beam_replaces_worse_near_duplicate():
+    beam = Beam(3, dedup_threshold=0.5)
+    assert beam.push(_thought("T1", BASE, 7))
+    assert not beam.push(_thought("T1-a", BASE + " und Offline-Modus", 6))
+    assert beam.push(_thought("T1-b", BASE + " und Offline-Modus", 8))
+    assert [t.id for t in beam.best()] == ["T1-b"]
+
+
+def test_tree_of_thoughts_result_has_no_near_duplicates():
+    result = tree_of_thoughts("Eine App für Pflanzenpflege", use_mock=True)
+    assert collapse_near_duplicates(result) == result
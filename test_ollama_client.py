@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Tests for OllamaClient against the local mock server.
+"""
+import sys
+import os
+
+import pytest
+import requests
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.src.ollama_integration import OllamaClient
+from brainstorming_skill.src.resilience import RetryPolicy
+from brainstorming_skill.src.tree_of_thoughts import _initial_messages
+from brainstorming_skill.src.usage import usage_scope
+
+
+@pytest.fixture
+def server(mock_server):
+    return mock_server(latency=0.01)
+
+
+@pytest.fixture
+def client(server):
+    client = OllamaClient(server.url)
+    client.set_model(server.config.model)
+    client.retry_policy = RetryPolicy(max_retries=2, base_delay=0.01)
+    return client
+
+
+def test_stream_records_usage_like_complete(client):
+    with usage_scope() as usage:
+        streamed = "".join(client.stream(_initial_messages("Pflanzen")))
+        completed = client.complete(_initial_messages("Pflanzen"))
+    assert streamed == completed
+    streamed_call, completed_call = usage.summary()["calls"]
+    assert streamed_call["completion_tokens"] == completed_call["completion_tokens"]
+    assert not streamed_call["estimated"]
+
+
+def test_stream_is_retried_before_the_first_chunk(client, server):
+    server.config.error_rate = 1.0
+    with pytest.raises(requests.HTTPError):
+        "".join(client.stream(_initial_messages("Pflanzen")))
+    assert server.stats["requests"] == 3
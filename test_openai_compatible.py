@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Tests for OpenAI-compatible local servers behind LLMClient.
+"""
+import sys
+import os
+import asyncio
+import json
+
+import pytest
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.src.llm import LLMClient
+from brainstorming_skill.src.tree_of_thoughts import _initial_messages
+from brainstorming_skill.src.usage import usage_scope
+
+pytest.importorskip("openai")
+
+
+@pytest.fixture
+def server(mock_server):
+    return mock_server(latency=0.2, max_concurrency=8)
+
+
+def test_local_server_serves_sync_stream_and_concurrent_async_calls(server, monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    client = LLMClient(provider="openai", model="qwen2.5-7b-instruct", base_url=f"{server.url}/v1",
+                       fallback_chain="")
+    assert client.backend_id == f"openai:qwen2.5-7b-instruct@{server.url}/v1"
+
+    with usage_scope() as usage:
+        assert "thoughts" in json.loads(client.complete(_initial_messages("Pflanzen")))
+        assert "thoughts" in json.loads("".join(client.stream(_initial_messages("Garten"))))
+    assert usage.summary()["total"]["cost_usd"] == 0.0
+    assert not any(call["estimated"] for call in usage.summary()["calls"])
+
+    tasks = [_initial_messages(f"Aufgabe {i}") for i in range(6)]
+    asyncio.run(client.acomplete_many(tasks, max_concurrency=6))
+    assert server.stats["peak_in_flight"] >= 4
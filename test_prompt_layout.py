@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for the prefix-cache-friendly prompt layout and Ollama context reuse.
+"""
+import sys
+import os
+
+import pytest
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.src.llm import LLMClient
+from brainstorming_skill.src.ollama_context import ollama_context_scope
+from brainstorming_skill.src.relation_batcher import RelationBatch
+from brainstorming_skill.src.scoring import Thought
+from brainstorming_skill.src.tree_of_thoughts import _initial_messages
+
+
+def relation_batch():
+    batch = RelationBatch()
+    batch.thoughts = [Thought(id=f"T{i}", summary="x", criteria_scores={}, total_score=0) for i in (1, 2)]
+    batch.pairs = [("T1", "T2")]
+    return batch
+
+
+def test_stages_share_the_system_prompt_and_end_with_variable_data():
+    first, second = _initial_messages("Aufgabe A"), _initial_messages("Aufgabe B")
+    relations = relation_batch().messages()
+    assert first[0] == second[0] == relations[0]
+    assert "ROI" in first[0]["content"]
+    assert first[1]["content"].endswith("Aufgabe: Aufgabe A")
+    shared = os.path.commonprefix([first[1]["content"], second[1]["content"]])
+    assert len(shared) > len(first[1]["content"]) - 20
+    assert relations[1]["content"].endswith("- (T1, T2)")
+
+
+@pytest.fixture
+def server(mock_server):
+    return mock_server(latency=0.01)
+
+
+def test_context_is_continued_across_calls_of_a_run(server, monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    client = LLMClient(provider="ollama", ollama_url=server.url)
+    with ollama_context_scope(enabled=True) as chain:
+        path, payload = client._ollama_request(_initial_messages("Pflanzen"), 0.8)
+        assert path == "/api/generate" and "system" in payload and "context" not in payload
+
+        assert client.complete(_initial_messages("Pflanzen"))
+        context = chain.get(client.model)
+        assert context
+
+        path, payload = client._ollama_request(relation_batch().messages(), 0.3)
+        assert payload["context"] == context and "system" not in payload
+        assert "relations" in client.complete(relation_batch().messages())
+        assert len(chain.get(client.model)) > len(context)
+
+    assert client._ollama_request(relation_batch().messages(), 0.3)[0] == "/api/chat"
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-provider concurrency and rate limiters.
+"""
+import sys
+import os
+import asyncio
+import threading
+import time
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+import pytest
+
+from brainstorming_skill.src.deadline import DeadlineExceeded, deadline_scope
+from brainstorming_skill.src.rate_limit import FairSemaphore, TokenBucket, RateLimiter
+
+
+def test_semaphore_serves_waiters_in_fifo_order():
+    semaphore = FairSemaphore(1)
+    semaphore.acquire()
+    order = []
+
+    def worker(n):
+        semaphore.acquire()
+        order.append(n)
+        semaphore.release()
+
+    threads = []
+    for n in range(5):
+        t = threading.Thread(target=worker, args=(n,))
+        t.start()
+        threads.append(t)
+        while semaphore.queued < n + 1:
+            time.sleep(0.001)
+
+    semaphore.release()
+    for t in threads:
+        t.join()
+    assert order == [0, 1, 2, 3, 4]
+
+
+def test_semaphore_timeout_leaves_queue():
+    semaphore = FairSemaphore(1)
+    semaphore.acquire()
+    assert semaphore.acquire(timeout=0.01) is False
+    assert semaphore.queued == 0
+
+
+def test_max_in_flight_is_enforced_for_coroutines():
+    limiter = RateLimiter(max_in_flight=2)
+    active = []
+    peak = []
+
+    async def call():
+        async with limiter.alimit():
+            active.append(1)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.pop()
+
+    async def run():
+        await asyncio.gather(*(call() for _ in range(10)))
+
+    asyncio.run(run())
+    assert max(peak) == 2
+
+
+def test_token_bucket_paces_requests():
+    bucket = TokenBucket(rate_per_minute=600, capacity=1)  # 10 per second
+    assert bucket.reserve(1) == 0
+    wait = bucket.reserve(1)
+    assert 0.05 < wait <= 0.1
+
+
+def test_waits_longer_than_the_deadline_fail_fast():
+    limiter = RateLimiter(requests_per_minute=1)
+    with limiter.limit():
+        start = time.monotonic()
+        # The next request token is a minute away, the budget only 0.2s
+        with deadline_scope(0.2), pytest.raises(DeadlineExceeded):
+            with limiter.limit():
+                pass
+        assert time.monotonic() - start < 0.05
+
+    limiter = RateLimiter(max_in_flight=1)
+
+    async def run():
+        async with limiter.alimit():
+            with deadline_scope(0.1), pytest.raises(DeadlineExceeded):
+                async with limiter.alimit():
+                    pass
+        assert limiter.semaphore.queued == 0
+
+    asyncio.run(run())
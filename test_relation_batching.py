@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for token-budgeted, batched relation classification.
+"""
+import sys
+import os
+import asyncio
+import json
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.src import llm as llm_module
+from brainstorming_skill.src.llm import LLMClient
+from brainstorming_skill.src.scoring import Thought
+from brainstorming_skill.src.tokens import estimate_message_tokens
+from brainstorming_skill.src import relation_batcher
+from brainstorming_skill.src.relation_batcher import (
+    classify_relations_batched, pack_relation_batches, PROMPT_TOKEN_BUDGET
+)
+from brainstorming_skill.src.graph_of_thoughts import run_graph_of_thoughts
+
+
+def make_thoughts(n):
+    return [
+        Thought(id=f"T{i}", summary=f"Ansatz {i}: " + "Beschreibung " * 20, criteria_scores={}, total_score=5 + i % 3)
+        for i in range(1, n + 1)
+    ]
+
+
+def test_packing_covers_every_pair_once_within_budget():
+    thoughts = make_thoughts(30)
+    batches = pack_relation_batches(thoughts, output_token_budget=600, tokens_per_relation=30)
+    pairs = [pair for batch in batches for pair in batch.pairs]
+
+    assert len(pairs) == 30 * 29 // 2
+    assert len(set(pairs)) == len(pairs)
+    assert len(batches) < len(pairs) // 10
+    for batch in batches:
+        assert len(batch.pairs) <= 20
+        assert estimate_message_tokens(batch.messages()) <= PROMPT_TOKEN_BUDGET
+        shown = {t.id for t in batch.thoughts}
+        assert all(a in shown and b in shown for a, b in batch.pairs)
+
+
+def answer_all(message_batches, temperature):
+    responses = []
+    for messages in message_batches:
+        prompt = messages[-1]["content"]
+        pairs = [line[3:-1].split(", ") for line in prompt.splitlines() if line.startswith("- (T")]
+        responses.append("```json\n" + json.dumps(
+            [{"from": a, "to": b, "relation": "kombinierbar", "strength": 9} for a, b in pairs]
+        ) + "\n```")
+    return responses
+
+
+def test_batched_results_are_validated_and_merged():
+    thoughts = make_thoughts(12)
+    relations = classify_relations_batched(thoughts, complete_many=answer_all, output_token_budget=300)
+    assert len(relations) == 12 * 11 // 2
+    assert all(r["strength"] == 5 for r in relations)
+
+
+def test_graph_uses_llm_relations_and_falls_back_per_pair(monkeypatch):
+    thoughts = make_thoughts(4)
+    monkeypatch.setattr(relation_batcher, "_default_complete_many", answer_all)
+    import brainstorming_skill.src.graph_of_thoughts as got
+    monkeypatch.setattr(got, "classify_relations_batched",
+                        lambda ts: [r for r in classify_relations_batched(ts) if r["from"] != "T1"])
+
+    graph = run_graph_of_thoughts(thoughts, use_llm_relations=True)["graph"]
+    assert graph.edges["T2", "T3"]["relation"] == "kombinierbar"
+    assert graph.edges["T1", "T2"]["relation"] == "ergänzt"
+
+
+def test_relation_pass_runs_from_inside_an_event_loop(mock_server, monkeypatch):
+    server = mock_server(latency=0.01)
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    monkeypatch.setattr(llm_module, "_default_client", LLMClient(provider="ollama", ollama_url=server.url,
+                                                                 fallback_chain=""))
+
+    async def classify_from_async_code():
+        return classify_relations_batched(make_thoughts(6))
+
+    assert len(asyncio.run(classify_from_async_code())) == 6 * 5 // 2
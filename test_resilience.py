@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for retries, circuit breakers and the provider fallback chain.
+"""
+import sys
+import os
+import asyncio
+import time
+
+import pytest
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.src.resilience import (
+    CircuitBreaker, CircuitOpenError, RetryPolicy, is_retryable
+)
+from brainstorming_skill.src.llm import LLMClient
+from brainstorming_skill.src.deadline import (
+    DeadlineExceeded, call_timeout, deadline_scope, has_time_for, remaining
+)
+
+
+class FakeHTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def test_retryable_classification():
+    assert is_retryable(FakeHTTPError(503))
+    assert is_retryable(FakeHTTPError(429))
+    assert not is_retryable(FakeHTTPError(400))
+    assert is_retryable(ConnectionError("refused"))
+    assert not is_retryable(ValueError("bad json"))
+
+
+def test_retry_recovers_from_transient_errors():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise FakeHTTPError(503)
+        return "ok"
+
+    assert RetryPolicy(max_retries=2, base_delay=0.001).call(flaky) == "ok"
+    assert len(attempts) == 3
+
+
+def test_breaker_opens_and_half_opens():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=0.05)
+    policy = RetryPolicy(max_retries=0)
+
+    def dead():
+        raise ConnectionError("refused")
+
+    for _ in range(2):
+        try:
+            policy.call(dead, breaker)
+        except ConnectionError:
+            pass
+    assert breaker.state == "open"
+    try:
+        policy.call(lambda: "never called", breaker)
+        assert False, "expected CircuitOpenError"
+    except CircuitOpenError:
+        pass
+
+    time.sleep(0.06)
+    assert policy.call(lambda: "ok", breaker) == "ok"
+    assert breaker.state == "closed"
+
+
+def test_fallback_chain_reroutes_to_next_backend(monkeypatch):
+    monkeypatch.setenv("LLM_MAX_RETRIES", "0")
+    client = LLMClient(provider="ollama", model="llama3.2:latest", ollama_url="http://dead:11434",
+                       fallback_chain="ollama:mistral:7b@http://alive:11434")
+    assert [b.backend_id for b in client.backends] == [
+        "ollama:llama3.2:latest@http://dead:11434",
+        "ollama:mistral:7b@http://alive:11434",
+    ]
+
+    def dispatch(self, messages, temperature):
+        if "dead" in self.ollama_url:
+            raise ConnectionError("refused")
+        return f"antwort von {self.model}"
+
+    monkeypatch.setattr(LLMClient, "_dispatch", dispatch)
+    assert client.complete([{"role": "user", "content": "x"}], use_cache=False) == "antwort von mistral:7b"
+
+
+def test_deadline_scopes_only_shorten_the_budget():
+    assert remaining() is None
+    with deadline_scope(10):
+        with deadline_scope(60):
+            assert remaining() <= 10
+        assert call_timeout(default=300) <= 10
+        assert has_time_for(5)
+        assert not has_time_for(20)
+    assert remaining() is None
+
+
+def test_exhausted_deadline_stops_retries():
+    def slow_failure():
+        time.sleep(0.02)
+        raise ConnectionError("refused")
+
+    with deadline_scope(0.01):
+        try:
+            RetryPolicy(max_retries=5, base_delay=0.001).call(slow_failure)
+            assert False, "expected DeadlineExceeded"
+        except DeadlineExceeded:
+            pass
+        try:
+            call_timeout()
+            assert False, "expected DeadlineExceeded"
+        except DeadlineExceeded:
+            pass
+
+
+def test_half_open_trial_is_released_on_deadline_cancel_and_client_error():
+    breaker = CircuitBreaker("trial", failure_threshold=1, reset_timeout=0.01)
+    policy = RetryPolicy(max_retries=0)
+
+    def fail(error):
+        raise error
+
+    for error in (DeadlineExceeded("Budget erschöpft"), FakeHTTPError(400)):
+        with pytest.raises(ConnectionError):
+            policy.call(lambda: fail(ConnectionError("refused")), breaker)
+        time.sleep(0.02)
+        with pytest.raises(type(error)):
+            policy.call(lambda: fail(error), breaker)
+        # The circuit stays half-open for the next trial instead of closing or wedging
+        assert breaker.state == "half_open" and breaker.allow()
+        breaker.release()
+
+    async def cancelled_trial():
+        task = asyncio.ensure_future(policy.acall(lambda: asyncio.sleep(1), breaker))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancelled_trial())
+    assert breaker.allow()
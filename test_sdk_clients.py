@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared provider SDK clients.
+"""
+import sys
+import os
+import asyncio
+
+import pytest
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.src import sdk_clients
+from brainstorming_skill.src.event_loop import run_sync
+from brainstorming_skill.src.llm import LLMClient
+from brainstorming_skill.src.sdk_clients import aclose_async_sdk_clients, get_async_sdk_client, get_sdk_client
+
+pytest.importorskip("openai")
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    calls = []
+    build = sdk_clients._build_client
+
+    def counting_build(provider, api_key, base_url, use_async):
+        calls.append((provider, use_async))
+        return build(provider, api_key, base_url, use_async)
+
+    monkeypatch.setattr(sdk_clients, "_build_client", counting_build)
+    return calls
+
+
+def test_sync_client_is_built_once(builds):
+    url = "http://127.0.0.1:9/sync/v1"
+    assert get_sdk_client("openai", "key", url) is get_sdk_client("openai", "key", url)
+    assert builds == [("openai", False)]
+
+
+def test_async_client_is_built_once_on_the_shared_loop(mock_server, builds, monkeypatch):
+    server = mock_server(latency=0.01)
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    client = LLMClient(provider="openai", model="qwen2.5-7b-instruct", base_url=f"{server.url}/v1",
+                       fallback_chain="")
+    for i in range(2):
+        assert run_sync(lambda: client.acomplete([{"role": "user", "content": f"Aufgabe {i}"}]))
+    assert builds == [("openai", True)]
+
+
+def test_own_loop_closes_its_async_clients():
+    async def own_loop():
+        client = get_async_sdk_client("openai", "key", "http://127.0.0.1:9/own/v1")
+        await aclose_async_sdk_clients()
+        return client
+
+    assert asyncio.run(own_loop()).is_closed()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental parsing of streamed LLM output.
+"""
+import sys
+import os
+import json
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.src.stream_parser import JSONArrayStreamParser, iter_stream_objects
+
+THOUGHTS = {
+    "thoughts": [
+        {"id": "T1", "title": "PWA", "summary": "Klammern im Text: } ] \" {", "scores": {"UX": 8}},
+        {"id": "T2", "title": "Bot", "summary": "Verschachtelt", "scores": {"UX": 7}, "tags": [{"a": 1}]},
+    ]
+}
+
+
+def test_thoughts_are_emitted_for_any_chunking():
+    text = "```json\n" + json.dumps(THOUGHTS, ensure_ascii=False) + "\n```"
+    for size in (1, 2, 5, 13, len(text)):
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        assert list(iter_stream_objects(chunks, key="thoughts")) == THOUGHTS["thoughts"]
+
+
+def test_object_is_emitted_as_soon_as_it_closes():
+    parser = JSONArrayStreamParser(key="thoughts")
+    first = json.dumps(THOUGHTS["thoughts"][0])
+    assert parser.feed('{"thoughts": [' + first[:-1]) == []
+    assert parser.feed(first[-1] + ', {"id": "T2"') == [THOUGHTS["thoughts"][0]]
+
+
+def test_bare_array_of_relations():
+    relations = [{"from": "T1", "to": "T2", "relation": "ergänzt", "strength": 4}]
+    assert list(iter_stream_objects([json.dumps(relations)])) == relations
+
+
+def test_root_values_are_not_taken_as_keys():
+    parser = JSONArrayStreamParser(key="thoughts")
+    parser.feed('{"thoughts": "folgen", "liste": ')
+    assert parser._current_key == "liste"
+    assert parser.feed('[{"id": "X"}], "thoughts": [{"id": "T1"}]}') == [{"id": "T1"}]
+    # A value that happens to read "thoughts" does not select the following array
+    assert list(iter_stream_objects(['{"notiz": "thoughts" [{"id": "X"}]}'], key="thoughts")) == []
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for structured JSON output requests and the tolerant answer parser.
+"""
+import sys
+import os
+import json
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.src.scoring import WEIGHTS
+from brainstorming_skill.src.llm import LLMClient
+from brainstorming_skill.src.structured import (
+    parse_json_items, response_schema, thoughts_schema, relations_schema
+)
+
+SCORES = {name: 7 for name in WEIGHTS}
+
+
+def thought(i):
+    return {"id": f"T{i}", "title": f"Ansatz {i}", "summary": "Beschreibung", "scores": SCORES}
+
+
+def test_thoughts_schema_requires_every_criterion():
+    scores = thoughts_schema()["properties"]["thoughts"]["items"]["properties"]["scores"]
+    assert scores["required"] == list(WEIGHTS)
+    assert scores["properties"]["ROI"] == {"type": "integer", "minimum": 1, "maximum": 10}
+
+
+def test_parser_repairs_fences_and_trailing_commas():
+    raw = "```json\n" + json.dumps({"thoughts": [thought(1), thought(2)]})[:-2] + ",]}\n```"
+    assert [item["id"] for item in parse_json_items(raw, key="thoughts")] == ["T1", "T2"]
+    assert parse_json_items(json.dumps([thought(1)]), key="thoughts")[0]["id"] == "T1"
+
+
+def test_parser_salvages_truncated_generation():
+    full = json.dumps({"thoughts": [thought(1), thought(2), thought(3)]})
+    truncated = "Hier sind die Ansätze:\n" + full[:full.index('"T3"') + 10]
+    assert [item["id"] for item in parse_json_items(truncated, key="thoughts")] == ["T1", "T2"]
+    assert parse_json_items("keine Ahnung", key="thoughts") == []
+
+
+def test_requested_schema_reaches_ollama_payload_and_cache_key():
+    client = LLMClient(provider="ollama")
+    messages = [{"role": "user", "content": "json bitte"}]
+    plain_key = client._cache_key(messages, 0.3)
+    assert "format" not in client._ollama_payload(messages, 0.3)
+
+    with response_schema("relations", relations_schema()):
+        assert client._ollama_payload(messages, 0.3)["format"] == relations_schema()
+        assert client._cache_key(messages, 0.3) != plain_key
+    assert client._cache_key(messages, 0.3) == plain_key
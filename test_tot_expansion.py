@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for concurrent LLM-driven child expansion in Tree-of-Thoughts.
+"""
+import sys
+import os
+import time
+
+import httpx
+import pytest
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.src import llm as llm_module
+from brainstorming_skill.src.llm import LLMClient
+from brainstorming_skill.src.tree_of_thoughts import (
+    BRANCHING_FACTOR, CHILDREN_PER_THOUGHT, expand_level, generate_initial_thoughts, tree_of_thoughts
+)
+
+
+@pytest.fixture
+def mock_llm(mock_server, monkeypatch):
+    server = mock_server(latency=0.5, max_concurrency=8)
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    monkeypatch.setattr(llm_module, "_default_client", LLMClient(provider="ollama", ollama_url=server.url,
+                                                                 fallback_chain=""))
+    return server
+
+
+def test_level_is_expanded_concurrently_by_the_llm(mock_llm):
+    parents = generate_initial_thoughts("Eine App für Pflanzenpflege", use_mock=True)[:BRANCHING_FACTOR]
+    start = time.monotonic()
+    children = expand_level("Eine App für Pflanzenpflege", parents, level=1, use_llm=True)
+    elapsed = time.monotonic() - start
+
+    assert len(children) == BRANCHING_FACTOR * CHILDREN_PER_THOUGHT
+    assert children[0].id == f"{parents[0].id}-L2-1"
+    assert not children[0].summary.startswith("Weiterentwicklung von")
+    assert elapsed < 2 * 0.5  # one round trip, not one per parent
+    assert mock_llm.stats["peak_in_flight"] == BRANCHING_FACTOR
+
+
+def test_failed_expansion_falls_back_to_synthetic_children(mock_llm):
+    mock_llm.config.error_rate = 1.0
+    parents = generate_initial_thoughts("Eine App", use_mock=True)[:2]
+    children = expand_level("Eine App", parents, level=1, use_llm=True)
+    assert [c.id for c in children[:3]] == [f"{parents[0].id}-L2-{i}" for i in (1, 2, 3)]
+    assert children[0].summary.startswith("Weiterentwicklung von")
+
+
+def test_levels_share_one_http_client(mock_llm, monkeypatch):
+    built = []
+
+    class CountingClient(httpx.AsyncClient):
+        def __init__(self, *args, **kwargs):
+            built.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", CountingClient)
+    parents = generate_initial_thoughts("Eine App", use_mock=True)[:2]
+    children = expand_level("Eine App", parents, level=1, use_llm=True)
+    expand_level("Eine App", children[:2], level=2, use_llm=True)
+    assert mock_llm.stats["requests"] == 4
+    assert len(built) == 1 and not built[0].is_closed
+
+
+def test_distinct_mock_thoughts_all_reach_the_frontier(mock_llm):
+    # Near-duplicate collapsing keeps all initial mock thoughts, so a full frontier is expanded
+    tree_of_thoughts("Eine App für Pflanzenpflege", depth=2, llm_expansion=True, stream=False)
+    assert mock_llm.stats["requests"] == 1 + BRANCHING_FACTOR
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests for per-call and per-run token, latency and cost accounting.
+"""
+import sys
+import os
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.src.llm import LLMClient
+from brainstorming_skill.src.usage import CallUsage, ollama_usage, stage_scope, usage_scope
+
+MESSAGES = [{"role": "user", "content": "Eine App für Pflanzenpflege"}]
+
+
+def test_cost_uses_price_table_and_ignores_local_and_cached_calls():
+    usage = CallUsage("openai", "gpt-4o-mini", "relations", 1_000_000, 1_000_000, 1.0)
+    assert abs(usage.cost - 0.75) < 1e-9
+    assert CallUsage("ollama", "llama3.2", "relations", 1000, 1000, 1.0).cost == 0.0
+    assert CallUsage("openai", "gpt-4o-mini", "relations", 1000, 1000, 0.0, cached=True).cost == 0.0
+
+
+def test_ollama_usage_reads_counts_and_time_to_first_token():
+    stats = ollama_usage({"prompt_eval_count": 42, "eval_count": 7,
+                          "load_duration": 500_000_000, "prompt_eval_duration": 250_000_000})
+    assert stats == {"prompt_tokens": 42, "completion_tokens": 7, "time_to_first_token": 0.75}
+    assert ollama_usage({"message": {"content": "x"}}) == {}
+
+
+def test_client_records_calls_per_stage(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setenv("LLM_CACHE_SAMPLED", "true")
+    client = LLMClient(provider="ollama")
+    client._ollama = lambda messages, temp: ("antwort", {"prompt_tokens": 12, "completion_tokens": 3})
+
+    with usage_scope() as usage:
+        with stage_scope("initial_thoughts"):
+            client.complete(MESSAGES, temperature=0.8)
+            client.complete(MESSAGES, temperature=0.8)  # cache hit
+        client.complete(MESSAGES, temperature=0.3, use_cache=False)
+
+    summary = usage.summary()
+    assert summary["total"]["calls"] == 3
+    assert summary["total"]["cached_calls"] == 1
+    initial = summary["by_stage"]["initial_thoughts"]
+    assert initial["calls"] == 2 and initial["prompt_tokens"] > 12
+    assert summary["by_stage"]["other"]["completion_tokens"] == 3
+    assert summary["total"]["cost_usd"] == 0.0
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Tests for Ollama model warm-up.
+"""
+import sys
+import os
+
+# Add the project root to the path so we can import the skill
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from brainstorming_skill.src.llm import LLMClient
+from brainstorming_skill.src.tree_of_thoughts import _initial_messages
+from brainstorming_skill.src.usage import stage_scope
+from brainstorming_skill.src.warmup import warm_up_model
+
+
+def test_first_call_after_warm_up_does_not_reload_the_model(mock_server, monkeypatch):
+    server = mock_server(latency=0.01)
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    client = LLMClient(provider="ollama", ollama_url=server.url, fallback_chain="")
+
+    assert warm_up_model(server.url, client.model)
+    assert server.stats["model_loads"] == 1
+    for stage in ("initial_thoughts", "expansion", "relations"):
+        with stage_scope(stage):
+            assert client.complete(_initial_messages("Pflanzen"))
+    assert server.stats["model_loads"] == 1